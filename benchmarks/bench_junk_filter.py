@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Junk-line filter throughput as the rule list grows.
+
+Cleans a synthetic paste (lyrics with lyric-site junk mixed in) with the
+default rules plus N extra phrases. "before" is the straightforward filter -
+every line tried against every rule in turn; "after" is JunkFilter, which
+compiles all rules into one regular expression and scans the text once:
+
+    python benchmarks/bench_junk_filter.py
+    python benchmarks/bench_junk_filter.py --size-kb 1024 --rules 0 1000 5000
+"""
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.synthetic_library import make_paste  # noqa: E402
+from lyrics_cleanup import (  # noqa: E402
+    DEFAULT_INLINE_PATTERNS, DEFAULT_JUNK_PATTERNS, DEFAULT_JUNK_PHRASES, JunkFilter,
+)
+
+JUNK_LINES = [
+    "Embed", "You might also like", "68 ContributorsTranslationsSong Lyrics", "Advertisement",
+    "See Artist LiveGet tickets as low as $45", "Lyrics licensed and provided by LyricFind",
+]
+
+
+def make_text(size_kb, seed):
+    rng = random.Random(seed)
+    lines = []
+    total = 0
+    while total < size_kb * 1024:
+        for line in make_paste(rng).split("\n"):
+            lines.append(line)
+            total += len(line) + 1
+            if rng.random() < 0.03:
+                lines.append(rng.choice(JUNK_LINES))
+    return "\n".join(lines)
+
+
+def extra_phrases(count, seed):
+    rng = random.Random(seed)
+    words = ["lyrics", "stream", "official", "video", "tour", "tickets", "merch", "listen", "now", "on", "app", "free"]
+    return [" ".join(rng.choice(words) for _ in range(rng.randint(2, 5))) + f" {number}" for number in range(count)]
+
+
+def naive_clean(text, phrases):
+    """One compiled regex per rule, every line tried against each of them."""
+    rules = [re.compile(r"[^\S\n]*" + re.escape(phrase) + r"[^\S\n]*", re.IGNORECASE) for phrase in phrases]
+    rules += [re.compile(r"[^\S\n]*(?:" + pattern + r")[^\S\n]*") for pattern in DEFAULT_JUNK_PATTERNS]
+    inline = [re.compile(pattern) for pattern in DEFAULT_INLINE_PATTERNS]
+    kept = []
+    for line in text.split("\n"):
+        if any(rule.fullmatch(line) for rule in rules):
+            continue
+        for pattern in inline:
+            line = pattern.sub("", line)
+        kept.append(line)
+    return "\n".join(kept)
+
+
+def timed(function, repeat):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return result, round(best, 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Junk-line filter scaling")
+    parser.add_argument("--size-kb", type=int, default=1024, help="paste size in KiB")
+    parser.add_argument("--rules", type=int, nargs="+", default=[0, 1000, 5000], help="extra phrases to add")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write JSON results to this file")
+    args = parser.parse_args()
+
+    text = make_text(args.size_kb, args.seed)
+    results = []
+    for extra in args.rules:
+        phrases = list(DEFAULT_JUNK_PHRASES) + extra_phrases(extra, args.seed)
+        started = time.perf_counter()
+        junk_filter = JunkFilter(phrases)
+        compile_ms = round((time.perf_counter() - started) * 1000, 1)
+        (cleaned, removed), after_ms = timed(lambda: junk_filter.clean_count(text), args.repeat)
+        _, before_ms = timed(lambda: naive_clean(text, phrases), 1)
+        results.append({
+            "rules": len(junk_filter),
+            "removed": removed,
+            "compile_ms": compile_ms,
+            "before_ms": before_ms,
+            "after_ms": after_ms,
+        })
+
+    document = {"paste_chars": len(text), "paste_lines": text.count("\n") + 1, "results": results}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(document, f, indent=2)
+    json.dump(document, sys.stdout, indent=2)
+    print()
+
+
+if __name__ == "__main__":
+    main()
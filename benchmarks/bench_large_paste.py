@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+How long a very large paste blocks the Transform button's event handler.
+
+Pastes a synthetic transcript (1 MB by default) into the desktop app and
+clicks Transform against the BenchPage stand-in. "before" disables the
+background path (everything runs inside the handler like earlier versions);
+"after" uses the app's defaults, where formatting runs on a worker and the
+preview is rendered in batches:
+
+    python benchmarks/bench_large_paste.py
+    python benchmarks/bench_large_paste.py --size-kb 4096 --runs 3
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+import better_lyrics_flet  # noqa: E402
+from benchmarks.run_benchmarks import BenchPage  # noqa: E402
+from benchmarks.synthetic_library import make_paste  # noqa: E402
+
+
+class Event:
+    def __init__(self, page):
+        self.page = page
+
+
+def make_transcript(size_kb, seed):
+    rng = random.Random(seed)
+    parts = []
+    total = 0
+    while total < size_kb * 1024:
+        part = make_paste(rng, songs=10)
+        parts.append(part)
+        total += len(part) + 2
+    return "\n\n".join(parts)[:size_kb * 1024]
+
+
+def run_once(text, background):
+    app = better_lyrics_flet.BetterLyricsApp()
+    app.library_loaded.set()  # No library needed
+    if not background:
+        app.large_paste_chars = float("inf")
+        app.progressive_render_lines = float("inf")
+
+    page = BenchPage()
+    app.build_ui(page)
+    app.lyrics_input.value = text
+
+    preview_shown = threading.Event()
+    rendered = threading.Event()
+    marks = {}
+    rebuild, render_rest = app._rebuild_ui, app._render_remaining_lyrics
+
+    def tracked_rebuild(page):
+        rebuild(page)
+        if app.is_preview_mode:
+            marks["preview"] = time.perf_counter()
+            preview_shown.set()
+
+    def tracked_render(*args):
+        render_rest(*args)
+        marks["rendered"] = time.perf_counter()
+        rendered.set()
+
+    app._rebuild_ui = tracked_rebuild
+    app._render_remaining_lyrics = tracked_render
+
+    started = time.perf_counter()
+    app.transform_lyrics(Event(page))
+    handler_ms = (time.perf_counter() - started) * 1000
+    preview_shown.wait()
+    if background:
+        rendered.wait()
+    else:
+        marks["rendered"] = marks["preview"]
+    return {
+        "handler_ms": handler_ms,
+        "first_preview_ms": (marks["preview"] - started) * 1000,
+        "fully_rendered_ms": (marks["rendered"] - started) * 1000,
+        "controls": len(app.lyrics_display_container.controls),
+    }
+
+
+def summarize(samples):
+    summary = {}
+    for key in ("handler_ms", "first_preview_ms", "fully_rendered_ms"):
+        values = [sample[key] for sample in samples]
+        summary[key] = {"median": round(statistics.median(values), 1), "max": round(max(values), 1)}
+    summary["controls"] = samples[-1]["controls"]
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Event handler time for a very large paste")
+    parser.add_argument("--size-kb", type=int, default=1024, help="paste size in KiB")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write JSON results to this file")
+    args = parser.parse_args()
+
+    text = make_transcript(args.size_kb, args.seed)
+    with contextlib.redirect_stdout(io.StringIO()):
+        before = [run_once(text, background=False) for _ in range(args.runs)]
+        after = [run_once(text, background=True) for _ in range(args.runs)]
+
+    document = {
+        "paste_chars": len(text),
+        "paste_lines": text.count("\n") + 1,
+        "runs": args.runs,
+        "before": dict(summarize(before), mode="formatted and rendered inside the handler"),
+        "after": dict(summarize(after), mode="worker formatting, progressive rendering"),
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(document, f, indent=2)
+    json.dump(document, sys.stdout, indent=2)
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Play statistics from the play log: scanning the history vs incremental rollups.
+
+Writes a synthetic play_history.jsonl (a year of plays over a library) to a
+temporary folder. "before" builds the stats view by reading and aggregating
+the whole log, as a view without rollups has to; "after" is PlayHistory:
+recording a play updates the rollups, summary() reads them, and a start
+with a snapshot replays only the plays logged after it:
+
+    python benchmarks/bench_play_history.py
+    python benchmarks/bench_play_history.py --plays 1000000 --tail 5000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import date
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.synthetic_library import ARTIST_NAMES  # noqa: E402
+from play_history import PlayHistory  # noqa: E402
+
+
+def make_events(plays, songs, seed):
+    rng = random.Random(seed)
+    artists = {f"song-{number}": rng.choice(ARTIST_NAMES) for number in range(songs)}
+    song_ids = list(artists)
+    weights = [1 / (rank + 1) for rank in range(songs)]  # A few favorites get most plays
+    now = time.time()
+    stamps = sorted(now - rng.random() * 365 * 86400 for _ in range(plays))
+    picks = rng.choices(song_ids, weights, k=plays)
+    return [{"t": round(stamp, 3), "song": song_id, "artist": artists[song_id]} for stamp, song_id in zip(stamps, picks)]
+
+
+def scan_stats(log_file):
+    """The stats view without rollups: read and aggregate every event."""
+    by_song, by_artist, by_day, month = Counter(), Counter(), Counter(), Counter()
+    this_month = date.today().isoformat()[:7]
+    with open(log_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            event = json.loads(line)
+            day = date.fromtimestamp(event["t"]).isoformat()
+            by_song[event["song"]] += 1
+            by_artist[event["artist"]] += 1
+            by_day[day] += 1
+            if day.startswith(this_month):
+                month[event["song"]] += 1
+    return sorted(month.items(), key=lambda item: -item[1])[:10], sorted(by_artist.items(), key=lambda item: -item[1])[:10]
+
+
+def best_ms(function, repeat):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return round(best, 2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play statistics: log scan vs rollups")
+    parser.add_argument("--plays", type=int, default=200000, help="plays in the log")
+    parser.add_argument("--songs", type=int, default=2000)
+    parser.add_argument("--tail", type=int, default=1000, help="plays logged after the snapshot")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write JSON results to this file")
+    args = parser.parse_args()
+
+    events = make_events(args.plays, args.songs, args.seed)
+    head, tail = events[:-args.tail], events[-args.tail:]
+    with tempfile.TemporaryDirectory() as directory:
+        history = PlayHistory(directory)
+        started = time.perf_counter()
+        for event in head:
+            history.record(event["song"], event["artist"], event["t"])
+        record_us = (time.perf_counter() - started) / len(head) * 1e6
+        history.save_snapshot()
+        with open(history.log_file, 'a', encoding='utf-8') as f:
+            f.writelines(json.dumps(event) + "\n" for event in tail)
+
+        scan_ms = best_ms(lambda: scan_stats(history.log_file), args.repeat)
+        history.refresh()
+        summary_ms = best_ms(history.summary, args.repeat * 10)
+        snapshot_load_ms = best_ms(lambda: PlayHistory(directory).load(), args.repeat)
+        os.remove(history.snapshot_file)
+        full_load_ms = best_ms(lambda: PlayHistory(directory).load(), 1)
+        log_mb = os.path.getsize(history.log_file) / 1e6
+
+    document = {
+        "plays": len(events),
+        "log_mb": round(log_mb, 1),
+        "before": {"mode": "scan the whole log", "stats_view_ms": scan_ms},
+        "after": {
+            "mode": "incremental rollups",
+            "stats_view_ms": summary_ms,
+            "record_us_per_play": round(record_us, 2),
+            "startup_with_snapshot_ms": snapshot_load_ms,
+            "startup_full_replay_ms": full_load_ms,
+            "replayed_after_snapshot": len(tail),
+        },
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(document, f, indent=2)
+    json.dump(document, sys.stdout, indent=2)
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Server -> client traffic per viewer during playback for the two scroll sync modes.
+
+Runs the ScrollEngine on a virtual clock (no waiting, no Flet needed) for one
+minute of playback of a synthetic song and counts every message the preview
+sends while it plays: the scroll commands, the reading-line highlight
+(two restyled spans each time the line changes, checked every 0.2 s in frame
+mode and once per keyframe in keyframe mode) and the play / pause button
+updates. Reports messages and bytes per minute for each kind and in total:
+
+    python benchmarks/bench_scroll_traffic.py
+    python benchmarks/bench_scroll_traffic.py --speed 2.5 --output traffic.json
+"""
+import argparse
+import json
+import os
+import random
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.synthetic_library import make_lyrics  # noqa: E402
+from scroll_engine import ScrollEngine  # noqa: E402
+from text_layout import estimate_layout, line_at_offset  # noqa: E402
+
+# Preview defaults of the desktop app
+FONT_SIZE = 24
+LINE_SPACING = 1.2
+BUFFER_LINES = 4
+TEXT_WIDTH = 1386  # 1400 px window minus page padding and the ListView border
+HIGHLIGHT_INTERVAL = 0.2  # frame mode; keyframe mode moves the highlight once per keyframe
+
+
+class VirtualClock:
+    """Clock whose waits advance time instantly."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def wait(self, timeout):
+        self.now += timeout
+        return False
+
+
+def update_message_bytes(props):
+    """Approximate size of the Flet message carrying one page.update() with these control props."""
+    return len(json.dumps({"action": "updateControlProps", "payload": {"props": props}}, ensure_ascii=False))
+
+
+def highlight_message_bytes():
+    """One highlight move: the old line's span loses its style, the new one gets it."""
+    style = json.dumps({"color": "amber400", "bgcolor": "amber400,0.15"})
+    return update_message_bytes([{"i": "_0000", "style": style}, {"i": "_0000", "style": "null"}])
+
+
+def play_pause_message_bytes(message):
+    """toggle_play_pause: the play button's text and icon plus the snack bar, in one page.update()."""
+    button = update_message_bytes([{"i": "_0000", "text": "⏸️ Pause", "icon": "pause"}])
+    snack_bar = len(json.dumps({"action": "addPageControls", "payload": {"controls": [
+        {"t": "snackbar", "i": "_0000", "p": "page", "c": ["_0001"], "open": "true", "duration": "2000"},
+        {"t": "text", "i": "_0001", "p": "_0000", "value": message},
+    ], "trimIDs": []}}, ensure_ascii=False))
+    return button + snack_bar
+
+
+def count_highlight_moves(layout, pixels_per_second, seconds, interval):
+    """Highlight messages sent while playing: one at play and pause, one per checked line change."""
+    moves = 0
+    highlighted = None
+    checks = [0.0] + [step * interval for step in range(1, int(seconds / interval) + 1)] + [seconds]
+    for stamp in checks:
+        line = line_at_offset(layout, min(pixels_per_second * stamp, layout.total_height) + layout.line_offsets[0])
+        if line != highlighted:
+            moves += 1
+            highlighted = line
+    return moves
+
+
+def measure_mode(mode, pixels_per_second, seconds=60.0, layout=None):
+    """Play for `seconds` of virtual time and return traffic and accuracy figures."""
+    clock = VirtualClock()
+    sent = []
+    engine = ScrollEngine(lambda offset, duration: sent.append((clock.now, offset, duration)), mode=mode, clock=clock)
+    if layout is not None:
+        engine.max_offset = layout.total_height
+
+    def wait(timeout):
+        clock.wait(timeout)
+        if clock.now >= seconds:
+            engine.pause()
+        return False
+
+    engine.wait = wait
+    engine.set_speed(pixels_per_second)
+    generation = engine.play(start_thread=False)
+    engine.run(generation)
+
+    # Worst gap between where the client is told to be and where the scroll should be
+    max_error = 0.0
+    for stamp, offset, duration in sent:
+        if duration:
+            expected_end = pixels_per_second * (stamp + duration / 1000)
+            max_error = max(max_error, abs(expected_end - offset))
+
+    per_minute = 60.0 / seconds
+    traffic = {"scroll": (engine.stats["messages"], engine.stats["bytes"])}
+    if layout is not None:
+        interval = ScrollEngine.KEYFRAME_INTERVAL if mode == "keyframe" else HIGHLIGHT_INTERVAL
+        moves = count_highlight_moves(layout, pixels_per_second, seconds, interval)
+        traffic["highlight"] = (moves, moves * highlight_message_bytes())
+        traffic["play_pause"] = (2, play_pause_message_bytes("▶️ Auto-scroll started")
+                                 + play_pause_message_bytes("⏸️ Auto-scroll paused"))
+    messages = sum(count for count, _ in traffic.values())
+    size = sum(size for _, size in traffic.values())
+    return {
+        "mode": mode,
+        "messages_per_minute": round(messages * per_minute, 1),
+        "bytes_per_minute": round(size * per_minute),
+        "by_kind": {kind: {"messages_per_minute": round(count * per_minute, 1), "bytes_per_minute": round(size * per_minute)}
+                    for kind, (count, size) in traffic.items()},
+        "final_offset_px": round(engine.position(), 2),
+        "expected_offset_px": round(pixels_per_second * seconds, 2),
+        "max_keyframe_error_px": round(max_error, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scroll sync traffic per viewer")
+    parser.add_argument("--speed", type=float, default=1.0, help="speed multiplier as shown in the app")
+    parser.add_argument("--seconds", type=float, default=60.0, help="virtual playback time")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write JSON results to this file")
+    args = parser.parse_args()
+
+    pixels_per_second = max(0.5, args.speed * 0.8) / ScrollEngine.FRAME_INTERVAL
+    lyrics = make_lyrics(random.Random(args.seed), verses=16, tagged=True)
+    layout = estimate_layout(lyrics, FONT_SIZE, TEXT_WIDTH, LINE_SPACING, BUFFER_LINES)
+    before = measure_mode("frame", pixels_per_second, args.seconds, layout)
+    after = measure_mode("keyframe", pixels_per_second, args.seconds, layout)
+    document = {
+        "speed": args.speed,
+        "pixels_per_second": pixels_per_second,
+        "keyframe_interval_s": ScrollEngine.KEYFRAME_INTERVAL,
+        "before": before,
+        "after": after,
+        "message_reduction": round(before["messages_per_minute"] / max(after["messages_per_minute"], 1), 1),
+    }
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(document, f, indent=2)
+    json.dump(document, sys.stdout, indent=2)
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Smart playlists: recomputed on every library render vs maintained incrementally.
+
+Builds a synthetic library with the default smart playlists (most played,
+recently added, never played) plus one artist playlist. "before" filters
+and sorts the whole library for each of them, as a library view without
+materialized playlists has to on every render; "after" attaches them to the
+SongIndex, then measures what they add to index.update() on a play and
+the cost of reading every playlist:
+
+    python benchmarks/bench_smart_playlists.py
+    python benchmarks/bench_smart_playlists.py --songs 100000 --plays 20000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.synthetic_library import make_song  # noqa: E402
+from smart_playlists import DEFAULT_SMART_PLAYLISTS, smart_playlist_from_dict  # noqa: E402
+from song_library import Song, SongIndex, collation_group, collation_key  # noqa: E402
+
+
+def recompute(songs, artist, limit=25, days=30):
+    """Every smart playlist filtered and sorted from scratch."""
+    cutoff = time.time() - days * 86400
+    group = collation_group(collation_key(artist))
+    played = [song for song in songs if song.play_count]
+    return [
+        sorted(played, key=lambda song: (song.play_count, song.last_played or 0.0), reverse=True)[:limit],
+        sorted((song for song in songs if (song.created_at or 0) >= cutoff), key=lambda song: song.created_at, reverse=True),
+        sorted((song for song in songs if not song.play_count), key=lambda song: song.created_at or 0, reverse=True),
+        sorted((song for song in songs if collation_group(song.sort_artist) == group), key=lambda song: (song.sort_title, song.id)),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Smart playlist maintenance cost")
+    parser.add_argument("--songs", type=int, default=20000)
+    parser.add_argument("--plays", type=int, default=10000, help="plays applied through the index")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write JSON results to this file")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    songs = [Song.from_dict(make_song(rng)) for _ in range(args.songs)]
+    now = time.time()
+    for song in songs:
+        song.created_at = now - rng.random() * 365 * 86400
+    artist = songs[0].artist
+
+    before_ms = None
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        recompute(songs, artist)
+        elapsed = (time.perf_counter() - started) * 1000
+        before_ms = elapsed if before_ms is None else min(before_ms, elapsed)
+
+    index = SongIndex(songs)
+    played = [rng.choice(songs) for _ in range(args.plays)]
+
+    def play_all():
+        started = time.perf_counter()
+        for song in played:
+            song.play_count += 1
+            song.last_played = time.time()
+            index.update(song)
+        return (time.perf_counter() - started) / len(played) * 1e6
+
+    plain_us = play_all()  # The index's own orderings only
+    started = time.perf_counter()
+    views = [smart_playlist_from_dict(data) for data in DEFAULT_SMART_PLAYLISTS]
+    views.append(smart_playlist_from_dict({"name": "artist", "rule": "artist", "artist": artist}))
+    for view in views:
+        index.add_view(view)
+    attach_ms = (time.perf_counter() - started) * 1000
+
+    update_us = play_all()
+
+    read_ms = None
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        contents = [index.view_songs(view.name) for view in views]
+        elapsed = (time.perf_counter() - started) * 1000
+        read_ms = elapsed if read_ms is None else min(read_ms, elapsed)
+
+    # Same playlists as a full recompute after all those plays
+    expected = recompute(songs, artist)
+    matches = all([song.id for song in got] == [song.id for song in want] for got, want in zip(contents, expected))
+
+    document = {
+        "songs": len(songs),
+        "playlists": {view.name: len(view) for view in views},
+        "before": {"mode": "filter + sort per render", "render_ms": round(before_ms, 2)},
+        "after": {
+            "mode": "materialized views",
+            "render_ms": round(read_ms, 2),
+            "attach_ms": round(attach_ms, 1),
+            "update_us_per_play": round(update_us, 2),
+            "update_us_per_play_without_views": round(plain_us, 2),
+        },
+        "matches_recompute": matches,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(document, f, indent=2)
+    json.dump(document, sys.stdout, indent=2)
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Resident memory of a loaded song library: plain dicts (before) vs Song records (after).
+
+Writes a synthetic songs_library.json to memory, then loads it both ways under
+tracemalloc and reports total and per-song bytes. The difference is the
+per-song record overhead plus the repeated stanzas Song keeps only once. It
+also reports how many preview lines the "Collapse Repeats" view saves:
+
+    python benchmarks/bench_song_memory.py
+    python benchmarks/bench_song_memory.py --songs 20000 --output memory.json
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.synthetic_library import make_song  # noqa: E402
+from lyrics_stanzas import collapse_repeats  # noqa: E402
+from song_library import Song  # noqa: E402
+
+
+def _measure(load):
+    """Run load() under tracemalloc; return (result, retained bytes, seconds)."""
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = load()
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, retained, elapsed
+
+
+def measure(songs, seed=42):
+    rng = random.Random(seed)
+    text = json.dumps([make_song(rng) for _ in range(songs)], ensure_ascii=False)
+
+    dicts, dict_bytes, dict_seconds = _measure(lambda: json.loads(text))
+    del dicts
+    records, record_bytes, record_seconds = _measure(lambda: [Song.from_dict(entry) for entry in json.loads(text)])
+
+    # Round-trip check: the on-disk format is unchanged
+    round_trip_ok = records[0].to_dict() == json.loads(text)[0]
+
+    save_started = time.perf_counter()
+    json.dumps([song.to_dict() for song in records], ensure_ascii=False)
+    save_seconds = time.perf_counter() - save_started
+
+    sample = records[:1000]
+    full_lines = sum(song.lyrics.count("\n") + 1 for song in sample)
+    collapsed_lines = sum(collapse_repeats(song.lyrics).text.count("\n") + 1 for song in sample)
+
+    return {
+        "songs": songs,
+        "before": {
+            "format": "dict",
+            "total_mb": round(dict_bytes / 1e6, 2),
+            "bytes_per_song": round(dict_bytes / songs),
+            "load_s": round(dict_seconds, 3),
+        },
+        "after": {
+            "format": "Song (__slots__, packed stanzas)",
+            "total_mb": round(record_bytes / 1e6, 2),
+            "bytes_per_song": round(record_bytes / songs),
+            "load_s": round(record_seconds, 3),
+            "serialize_s": round(save_seconds, 3),
+        },
+        "saved_bytes_per_song": round((dict_bytes - record_bytes) / songs),
+        "round_trip_ok": round_trip_ok,
+        "preview_lines_per_song": {
+            "full": round(full_lines / len(sample), 1),
+            "collapsed_repeats": round(collapsed_lines / len(sample), 1),
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-song memory of the loaded library")
+    parser.add_argument("--songs", type=int, default=100000, help="number of synthetic songs")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write JSON results to this file")
+    args = parser.parse_args()
+
+    document = measure(args.songs, args.seed)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(document, f, indent=2)
+    json.dump(document, sys.stdout, indent=2)
+    print()
+
+
+if __name__ == "__main__":
+    main()
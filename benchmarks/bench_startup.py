@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Cold-start time of the desktop app: time to first frame and time until the
+library is ready.
+
+Every run is a fresh Python process (so imports are really cold) working on a
+synthetic library in a temporary directory. "first frame" is the moment
+build_ui() has produced the edit screen against the BenchPage stand-in; the
+"eager" variant loads the library before build_ui like earlier versions:
+
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --songs 5000 --runs 7 --output startup.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.run_benchmarks import write_library  # noqa: E402
+from benchmarks.synthetic_library import make_library  # noqa: E402
+
+# Runs inside the child process, with the temporary library as working directory
+CHILD = r"""
+import contextlib, io, json, sys, time
+started = time.perf_counter()
+sys.path.insert(0, {repo!r})
+sys.path.insert(0, {benchmarks!r})
+with contextlib.redirect_stdout(io.StringIO()):
+    import better_lyrics_flet
+    from run_benchmarks import BenchPage
+    imported = time.perf_counter()
+    app = better_lyrics_flet.BetterLyricsApp()
+    page = BenchPage()
+    if {eager!r}:
+        app.load_library()
+    app.build_ui(page)
+    first_frame = time.perf_counter()
+    if not {eager!r}:
+        app.start_library_load(page)
+    app.library_loaded.wait()
+    ready = time.perf_counter()
+print(json.dumps({{
+    "import_ms": (imported - started) * 1000,
+    "first_frame_ms": (first_frame - started) * 1000,
+    "library_ready_ms": (ready - started) * 1000,
+    "pyperclip_imported": "pyperclip" in sys.modules,
+}}))
+"""
+
+
+def run_child(workdir, eager):
+    code = CHILD.format(repo=REPO_ROOT, benchmarks=os.path.join(REPO_ROOT, "benchmarks"), eager=eager)
+    result = subprocess.run([sys.executable, "-c", code], cwd=workdir, capture_output=True, text=True, timeout=300)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip() or "startup child failed")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def summarize(samples):
+    summary = {}
+    for key in ("import_ms", "first_frame_ms", "library_ready_ms"):
+        values = [sample[key] for sample in samples]
+        summary[key] = {"median": round(statistics.median(values), 1), "min": round(min(values), 1)}
+    summary["pyperclip_imported"] = samples[-1]["pyperclip_imported"]
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Desktop app time-to-first-frame")
+    parser.add_argument("--songs", type=int, default=2000, help="number of synthetic songs")
+    parser.add_argument("--playlists", type=int, default=20)
+    parser.add_argument("--runs", type=int, default=5, help="cold starts per variant")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write JSON results to this file")
+    args = parser.parse_args()
+
+    library, playlists = make_library(args.songs, args.playlists, args.seed)
+    with tempfile.TemporaryDirectory(prefix="better_lyrics_startup_") as workdir:
+        write_library(workdir, library, playlists)
+        eager = [run_child(workdir, eager=True) for _ in range(args.runs)]
+        deferred = [run_child(workdir, eager=False) for _ in range(args.runs)]
+
+    document = {
+        "songs": args.songs,
+        "runs": args.runs,
+        "before": dict(summarize(eager), mode="library loaded before build_ui"),
+        "after": dict(summarize(deferred), mode="library loaded in the background"),
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(document, f, indent=2)
+    json.dump(document, sys.stdout, indent=2)
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Leader -> follower drift for the broadcast teleprompter.
+
+Runs one leader ScrollEngine and several followers on a virtual clock, each
+with its own layout of the same lyrics (screen width and font size of a
+laptop, phones, a tablet...). Every leader state is delivered to each
+follower after a random latency and applied with apply_state(); followers
+then scroll on their own until the next one arrives. Drift is measured in
+each follower's own layout: the gap between where it actually scrolls and
+where the leader's current line sits on that device.
+
+"before" broadcasts raw pixel ScrollStates, as the first version of the
+broadcast did; "after" broadcasts LineStates (line index + fraction) and
+re-sends them every LINE_SYNC_INTERVAL while playing, as the app does:
+
+    python benchmarks/bench_teleprompter_sync.py
+    python benchmarks/bench_teleprompter_sync.py --followers 8 --latency-ms 20 150
+"""
+import argparse
+import heapq
+import json
+import os
+import random
+import statistics
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.synthetic_library import make_lyrics  # noqa: E402
+from scroll_engine import LINE_SYNC_INTERVAL, ScrollEngine, from_line_state, to_line_state  # noqa: E402
+from text_layout import DEFAULT_LINE_HEIGHT, estimate_layout, line_position, offset_of_line  # noqa: E402
+
+SAMPLE_INTERVAL = 0.01
+
+# (name, screen width, font size); the first one leads
+DEVICES = [
+    ("laptop", 1000, 24),
+    ("phone", 360, 16),
+    ("large phone", 412, 20),
+    ("tablet", 768, 22),
+    ("tv", 1920, 40),
+]
+
+# (time in seconds, action, argument) - a song with speed changes, a seek back and a pause;
+# speeds and seeks are in the leader's pixels
+SCRIPT = [
+    (0.0, "speed", 32.0),
+    (0.5, "play", None),
+    (15.0, "speed", 48.0),
+    (30.0, "seek", -250.0),
+    (45.0, "pause", None),
+    (50.0, "play", None),
+    (70.0, "speed", 20.0),
+    (90.0, "seek", 400.0),
+    (110.0, "pause", None),
+]
+DURATION = 120.0
+
+
+class VirtualClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def device_layout(lyrics, width, font_size):
+    """Layout of the mobile preview: one Text in a 20 px padded container."""
+    return estimate_layout(lyrics, font_size, width, DEFAULT_LINE_HEIGHT, 0, True, 1_000_000, 0, 20)
+
+
+def percentiles(values):
+    values = sorted(values)
+    return {
+        "p50": round(values[len(values) // 2], 3),
+        "p99": round(values[int(len(values) * 0.99)], 3),
+        "max": round(values[-1], 3),
+    }
+
+
+def run(mode, followers=4, latency_ms=(5.0, 60.0), seed=3):
+    rng = random.Random(seed)
+    lyrics = make_lyrics(rng, verses=16, tagged=True)
+    clock = VirtualClock()
+    devices = [DEVICES[0]] + [DEVICES[1 + index % (len(DEVICES) - 1)] for index in range(followers)]
+    layouts = [device_layout(lyrics, width, font_size) for _, width, font_size in devices]
+    engines = [ScrollEngine(lambda offset, duration: None, clock=clock) for _ in devices]
+    for engine, layout in zip(engines, layouts):
+        engine.max_offset = layout.total_height
+    leader, leader_layout = engines[0], layouts[0]
+
+    deliveries = []  # heap of (due time, order, follower index, message)
+    latencies = []
+    order = 0
+
+    def broadcast(state):
+        nonlocal order
+        message = state if mode == "before" else to_line_state(state, leader_layout)
+        for index in range(1, len(engines)):
+            latency = rng.uniform(*latency_ms) / 1000
+            latencies.append(latency * 1000)
+            order += 1
+            heapq.heappush(deliveries, (clock.now + latency, order, index, message))
+
+    leader.on_state = broadcast
+
+    script = list(SCRIPT)
+    drift_px, drift_lines = [], []
+    settled_px, settled_lines = [], []
+    last_event = -1.0
+    next_heartbeat = LINE_SYNC_INTERVAL
+    settle = latency_ms[1] / 1000
+    while clock.now <= DURATION:
+        while script and script[0][0] <= clock.now:
+            _, action, argument = script.pop(0)
+            last_event = clock.now
+            if action == "play":
+                leader.play(start_thread=False)
+            elif action == "pause":
+                leader.pause()
+            elif action == "speed":
+                leader.set_speed(argument)
+            elif action == "seek":
+                leader.seek(leader.position() + argument)
+        if mode == "after" and clock.now >= next_heartbeat:
+            next_heartbeat += LINE_SYNC_INTERVAL
+            if leader.playing:
+                broadcast(leader.state())
+        while deliveries and deliveries[0][0] <= clock.now:
+            _, _, index, message = heapq.heappop(deliveries)
+            state = message if mode == "before" else from_line_state(message, layouts[index])
+            engines[index].apply_state(state, start_thread=False)
+
+        line, fraction = line_position(leader_layout, leader.position())
+        for engine, layout in zip(engines[1:], layouts[1:]):
+            # Where this device should be: the leader's line, in this device's layout
+            error_px = abs(engine.position() - offset_of_line(layout, line, fraction))
+            followed_line, followed_fraction = line_position(layout, engine.position())
+            error_lines = abs((followed_line + followed_fraction) - (line + fraction))
+            drift_px.append(error_px)
+            drift_lines.append(error_lines)
+            if clock.now - last_event > settle:
+                settled_px.append(error_px)
+                settled_lines.append(error_lines)
+        clock.now = round(clock.now + SAMPLE_INTERVAL, 6)
+
+    return {
+        "mode": "pixel ScrollState" if mode == "before" else "LineState + heartbeat",
+        "state_messages": len(latencies),
+        "drift_px": percentiles(drift_px),
+        "drift_lines": percentiles(drift_lines),
+        # Once a state change has had time to arrive
+        "settled_drift_px": percentiles(settled_px),
+        "settled_drift_lines": percentiles(settled_lines),
+    }, latencies, devices
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Broadcast teleprompter follower drift")
+    parser.add_argument("--followers", type=int, default=4)
+    parser.add_argument("--latency-ms", type=float, nargs=2, default=(5.0, 60.0), metavar=("MIN", "MAX"))
+    parser.add_argument("--seed", type=int, default=3)
+    parser.add_argument("--output", help="write JSON results to this file")
+    args = parser.parse_args()
+
+    before, _, _ = run("before", args.followers, tuple(args.latency_ms), args.seed)
+    after, latencies, devices = run("after", args.followers, tuple(args.latency_ms), args.seed)
+    document = {
+        "leader": f"{devices[0][0]} ({devices[0][1]} px, font {devices[0][2]})",
+        "followers": [f"{name} ({width} px, font {font_size})" for name, width, font_size in devices[1:]],
+        "latency_ms": {"min": args.latency_ms[0], "max": args.latency_ms[1], "mean": round(statistics.mean(latencies), 1)},
+        "before": before,
+        "after": after,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(document, f, indent=2)
+    json.dump(document, sys.stdout, indent=2)
+    print()
+
+
+if __name__ == "__main__":
+    main()
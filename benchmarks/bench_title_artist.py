@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Speed and accuracy of title/artist detection on pasted header lines.
+
+Builds a library of synthetic songs, then detects title and artist on header
+lines in mixed formats ("Artist - Title", "Title - Artist", "Title by
+Artist", featured artists) whose artists are in the library. "before" is the
+previous stopword heuristic (patterns compiled on every call); "after" is
+parse_title_artist() with the library's ArtistDirectory:
+
+    python benchmarks/bench_title_artist.py
+    python benchmarks/bench_title_artist.py --artists 5000 --lines 20000
+"""
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.synthetic_library import ARTIST_NAMES, WORDS  # noqa: E402
+from song_library import Song, SongIndex  # noqa: E402
+from title_artist import parse_title_artist  # noqa: E402
+
+NAME_PARTS = ("Nova", "Black", "Silver", "Echo", "Lana", "Marcus", "Iris", "Kai", "Velvet", "Rivers",
+              "Atlas", "Juno", "Orion", "Sable", "Milo", "Wren", "Cole", "Skye", "Ember", "Reign")
+
+
+def legacy_parse(text):
+    """The detection used before known-artist lookup, kept for comparison."""
+    first_line = text.strip().split('\n', 1)[0].strip()
+    patterns = [r'^(.+?)\s*-\s*(.+?)$', r'^(.+?)\s*by\s+(.+?)$', r'^(.+?)\s*\|\s*(.+?)$', r'^\[(.+?)\]\s*(.+?)$']
+    for pattern in patterns:
+        match = re.match(pattern, first_line, re.IGNORECASE)
+        if match:
+            part1, part2 = match.groups()
+            if ' by ' in first_line.lower():
+                return part1.strip(), part2.strip()
+            elif any(indicator in part1.lower() for indicator in ['feat', 'ft.', 'featuring', '&', 'and']):
+                return part2.strip(), part1.strip()
+            elif any(indicator in part2.lower() for indicator in ['feat', 'ft.', 'featuring']):
+                return part1.strip(), part2.strip()
+            else:
+                title_indicators = ['love', 'you', 'me', 'my', 'the', 'a', 'an', 'is', 'are', 'was', 'were']
+                part1_has = any(word in title_indicators for word in part1.lower().split())
+                part2_has = any(word in title_indicators for word in part2.lower().split())
+                if part1_has and not part2_has:
+                    return part1.strip(), part2.strip()
+                return part2.strip(), part1.strip()
+    return first_line, ""
+
+
+def make_artists(count, rng):
+    names = dict.fromkeys(ARTIST_NAMES)
+    while len(names) < count:
+        words = rng.sample(NAME_PARTS, rng.randint(1, 4))
+        if rng.random() < 0.2:
+            words.insert(0, "The")
+        names[" ".join(words)] = None
+    return list(names)[:count]
+
+
+def make_headers(artists, count, rng):
+    """(header line, expected title, expected artist) in a mix of formats."""
+    headers = []
+    for _ in range(count):
+        artist = rng.choice(artists)
+        title = " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 4))).title()
+        form = rng.randrange(4)
+        if form == 0:
+            headers.append((f"{artist} - {title}", title, artist))
+        elif form == 1:
+            headers.append((f"{title} - {artist}", title, artist))
+        elif form == 2:
+            headers.append((f"{title} by {artist}", title, artist))
+        else:
+            featured = f"{artist} feat. {rng.choice(artists)}"
+            headers.append((f"{featured} - {title}", title, featured))
+    return headers
+
+
+def measure(parse, headers, repeat):
+    best = None
+    correct = 0
+    for _ in range(repeat):
+        correct = 0
+        started = time.perf_counter()
+        for line, title, artist in headers:
+            if parse(line) == (title, artist):
+                correct += 1
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return {
+        "us_per_line": round(best / len(headers) * 1e6, 2),
+        "accuracy": round(correct / len(headers), 4),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Title/artist detection speed and accuracy")
+    parser.add_argument("--artists", type=int, default=1000, help="artists in the library")
+    parser.add_argument("--lines", type=int, default=10000, help="header lines to parse")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write JSON results to this file")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    artists = make_artists(args.artists, rng)
+    started = time.perf_counter()
+    index = SongIndex(Song(f"Song {number}", artist, "") for number, artist in enumerate(artists))
+    index_ms = (time.perf_counter() - started) * 1000
+    headers = make_headers(artists, args.lines, rng)
+
+    document = {
+        "artists": len(index.artists),
+        "lines": len(headers),
+        "index_build_ms": round(index_ms, 1),
+        "before": dict(measure(legacy_parse, headers, args.repeat), mode="stopword heuristic"),
+        "after": dict(measure(lambda line: parse_title_artist(line, (index.artists,)), headers, args.repeat),
+                      mode="known-artist trie + heuristic"),
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(document, f, indent=2)
+    json.dump(document, sys.stdout, indent=2)
+    print()
+
+
+if __name__ == "__main__":
+    main()
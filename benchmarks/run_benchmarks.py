@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Headless benchmark suite for Better Lyrics.
+
+Times library load/save, the three format_lyrics variants, title/artist
+parsing and view construction against a stand-in ft.Page, using a synthetic
+library generated in a temporary directory. Results are written as JSON so
+runs from different commits can be compared:
+
+    python benchmarks/run_benchmarks.py --songs 2000 --output before.json
+    python benchmarks/run_benchmarks.py --songs 2000 --compare before.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.synthetic_library import make_library, make_paste  # noqa: E402
+from lyrics_sections import parse_sections  # noqa: E402
+
+
+class BenchPage:
+    """
+    Minimal stand-in for ft.Page. Holds added controls and overlays and
+    counts update() round-trips instead of talking to a Flet client.
+    """
+
+    def __init__(self, width=1400, height=900):
+        self.controls = []
+        self.overlay = []
+        self.width = width
+        self.height = height
+        self.window = type("Window", (), {})()
+        self.snack_bar = None
+        self.update_count = 0
+
+    def add(self, *controls):
+        self.controls.extend(controls)
+
+    def clean(self):
+        self.controls.clear()
+
+    def update(self, *controls):
+        self.update_count += 1
+
+
+def count_controls(control):
+    """Count a control and all of its descendants."""
+    if control is None:
+        return 0
+    total = 1
+    for attribute in ("controls", "tabs", "actions"):
+        children = getattr(control, attribute, None)
+        if isinstance(children, (list, tuple)):
+            total += sum(count_controls(child) for child in children)
+    for attribute in ("content", "title", "leading", "subtitle"):
+        child = getattr(control, attribute, None)
+        if child is not None and hasattr(child, "_get_control_name"):
+            total += count_controls(child)
+    return total
+
+
+def measure(function, repeat=5, warmup=1):
+    """Run `function` repeatedly and return timing statistics in milliseconds."""
+    samples = []
+    result = None
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(warmup):
+            result = function()
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = function()
+            samples.append((time.perf_counter() - started) * 1000)
+    return {
+        "min_ms": round(min(samples), 4),
+        "median_ms": round(statistics.median(samples), 4),
+        "mean_ms": round(statistics.fmean(samples), 4),
+        "runs": repeat,
+    }, result
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+            capture_output=True, text=True, timeout=5
+        ).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def write_library(directory, songs, playlists):
+    """Write a synthetic library into <directory>/saved_songs."""
+    songs_directory = os.path.join(directory, "saved_songs")
+    os.makedirs(songs_directory, exist_ok=True)
+    with open(os.path.join(songs_directory, "songs_library.json"), "w", encoding="utf-8") as f:
+        json.dump(songs, f, indent=2, ensure_ascii=False)
+    with open(os.path.join(songs_directory, "playlists.json"), "w", encoding="utf-8") as f:
+        json.dump(playlists, f, indent=2, ensure_ascii=False)
+
+
+def run(songs=1000, playlists=20, repeat=5, seed=42):
+    """Run every benchmark and return the results document."""
+    library, playlist_map = make_library(songs, playlists, seed)
+    rng = random.Random(seed)
+    pastes = [make_paste(rng) for _ in range(50)]
+    long_paste = make_paste(rng, songs=20)  # a live-transcript sized paste
+    first_lines = [paste.split("\n", 1)[0] for paste in pastes]
+
+    results = {}
+    original_cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="better_lyrics_bench_") as workdir:
+        write_library(workdir, library, playlist_map)
+        os.chdir(workdir)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                import better_lyrics_flet
+                import better_lyrics_mobile
+                app = better_lyrics_flet.BetterLyricsApp()
+                app.load_library()  # Normally started in the background after the first frame
+                mobile_app = better_lyrics_mobile.BetterLyricsMobile()
+            page = BenchPage()
+
+            results["load_song_library"], _ = measure(app._load_song_library, repeat)
+            results["save_song_library"], _ = measure(app._save_song_library, repeat)
+
+            results["format_lyrics_desktop"], _ = measure(
+                lambda: [app.format_lyrics(text) for text in pastes], repeat)
+            results["format_lyrics_mobile"], _ = measure(
+                lambda: [mobile_app.format_lyrics(text) for text in pastes], repeat)
+            try:
+                with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+                    import better_lyrics
+                kivy_format = better_lyrics.BetterLyricsApp.format_lyrics
+                results["format_lyrics_kivy"], _ = measure(
+                    lambda: [kivy_format(None, text) for text in pastes], repeat)
+            except ImportError as ex:
+                results["format_lyrics_kivy"] = {"skipped": f"kivy not available ({ex})"}
+            results["format_lyrics_desktop_long"], _ = measure(lambda: app.format_lyrics(long_paste), repeat)
+
+            results["parse_title_artist"], _ = measure(
+                lambda: [app._parse_title_artist_from_text(line) for line in first_lines], repeat)
+            # Uncached parse of every song (what the per-song cache saves on later loads)
+            results["parse_sections_library"], _ = measure(
+                lambda: [parse_sections.__wrapped__(song["lyrics"]) for song in app.song_library], repeat)
+
+            results["build_library_ui"], view = measure(app._build_library_ui, repeat)
+            results["build_library_ui"]["controls"] = count_controls(view)
+
+            app.original_lyrics = long_paste
+            app.formatted_lyrics = app.format_lyrics(long_paste)
+            app.is_preview_mode = True
+            results["build_preview_mode_ui"], view = measure(app._build_preview_mode_ui, repeat)
+            results["build_preview_mode_ui"]["controls"] = count_controls(view)
+            results["build_preview_mode_ui"]["lines"] = app.formatted_lyrics.count("\n") + 1
+            sections = parse_sections(app.formatted_lyrics)
+            results["jump_to_section"], _ = measure(
+                lambda: [app.jump_to_line(section.start) for section in sections], repeat)
+            results["jump_to_section"]["sections"] = len(sections)
+            app.chunked_rendering = False
+            results["build_preview_mode_ui_per_line"], view = measure(app._build_preview_mode_ui, repeat)
+            results["build_preview_mode_ui_per_line"]["controls"] = count_controls(view)
+            app.chunked_rendering = True
+
+            app.show_library = True
+            page.update_count = 0
+            results["rebuild_ui_library"], _ = measure(lambda: app._rebuild_ui(page), repeat)
+            results["rebuild_ui_library"]["page_updates"] = page.update_count
+        finally:
+            os.chdir(original_cwd)
+
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "songs": songs,
+            "playlists": playlists,
+            "repeat": repeat,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def compare(current, baseline):
+    """Print median timing changes against a previous results file."""
+    print(f"{'benchmark':32} {'baseline ms':>12} {'current ms':>12} {'change':>9}")
+    for name, result in current["results"].items():
+        previous = baseline.get("results", {}).get(name)
+        if "median_ms" not in result or not previous or "median_ms" not in previous:
+            continue
+        before, after = previous["median_ms"], result["median_ms"]
+        change = (after - before) / before * 100 if before else 0.0
+        print(f"{name:32} {before:12.3f} {after:12.3f} {change:+8.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Better Lyrics headless benchmarks")
+    parser.add_argument("--songs", type=int, default=1000, help="number of synthetic songs")
+    parser.add_argument("--playlists", type=int, default=20, help="number of custom playlists")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per benchmark")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write JSON results to this file instead of stdout")
+    parser.add_argument("--compare", help="previous JSON results to compare against")
+    args = parser.parse_args()
+
+    document = run(args.songs, args.playlists, args.repeat, args.seed)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(document, f, indent=2)
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            compare(document, json.load(f))
+    elif not args.output:
+        json.dump(document, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Synthetic song library generator for the Better Lyrics benchmarks.
+Produces songs and playlists in the same shape the desktop app writes to
+saved_songs/, with realistic lyric lengths (verses, repeated choruses and
+section tags).
+"""
+import random
+import uuid
+from datetime import datetime, timedelta
+
+from song_library import apply_sort_keys
+
+WORDS = (
+    "love heart night light fire rain dance dream baby tonight forever never "
+    "hold me you my the a in on we are was were falling running home road "
+    "stars sky ocean river golden broken alive wild young free gone again "
+    "whisper shadow city summer winter morning midnight echo"
+).split()
+
+ARTIST_NAMES = [
+    "The Midnight Echo", "Beyoncé", "Beyonce", "Sigur Rós", "Björk", "The Weeknd",
+    "Taylor Swift", "Ed Sheeran", "Daft Punk", "Ａｄｅｌｅ", "Mötley Crüe",
+    "Florence + the Machine", "Kendrick Lamar", "ABBA", "Rosalía", "Queen",
+]
+
+
+def _line(rng):
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 10))).capitalize()
+
+
+def _stanza(rng, lines):
+    return [_line(rng) for _ in range(lines)]
+
+
+def make_lyrics(rng, verses=None, tagged=None):
+    """Build one song's lyrics: verses alternating with a repeated chorus."""
+    verses = verses if verses is not None else rng.randint(2, 5)
+    tagged = tagged if tagged is not None else rng.random() < 0.5
+    chorus = _stanza(rng, rng.randint(4, 6))
+    blocks = []
+    for number in range(1, verses + 1):
+        verse = _stanza(rng, rng.randint(4, 8))
+        blocks.append(([f"[Verse {number}]"] if tagged else []) + verse)
+        blocks.append((["[Chorus]"] if tagged else []) + chorus)
+    if rng.random() < 0.4:
+        blocks.append((["[Bridge]"] if tagged else []) + _stanza(rng, rng.randint(2, 4)))
+        blocks.append((["[Chorus]"] if tagged else []) + chorus)
+    return "\n\n".join("\n".join(block) for block in blocks)
+
+
+def make_song(rng, now=None):
+    """Create one song entry in the desktop library format."""
+    now = now or datetime.now()
+    lyrics = make_lyrics(rng)
+    title = " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 4))).title()
+    artist = rng.choice(ARTIST_NAMES)
+    created = now - timedelta(days=rng.randint(0, 720), seconds=rng.randint(0, 86400))
+    played = rng.random() < 0.7
+    return apply_sort_keys({
+        "id": str(uuid.UUID(int=rng.getrandbits(128))),
+        "title": title,
+        "artist": artist,
+        "lyrics": lyrics,
+        "original_lyrics": f"{title} - {artist}\n{lyrics}",
+        "created_at": created.isoformat(),
+        "last_played": (created + timedelta(days=rng.randint(0, 30))).isoformat() if played else None,
+        "play_count": rng.randint(1, 80) if played else 0,
+        "is_favorite": rng.random() < 0.1,
+    })
+
+
+def make_library(songs=1000, playlists=20, seed=42):
+    """
+    Generate a library of `songs` songs and `playlists` custom playlists
+    (plus Favorites). Returns (song_library, playlists) ready to be dumped
+    to songs_library.json / playlists.json.
+    """
+    rng = random.Random(seed)
+    now = datetime(2025, 9, 7, 12, 0, 0)
+    library = [make_song(rng, now) for _ in range(songs)]
+    song_ids = [song["id"] for song in library]
+
+    playlist_map = {"Favorites": [song["id"] for song in library if song["is_favorite"]]}
+    for number in range(1, playlists + 1):
+        size = min(len(song_ids), rng.randint(5, 60))
+        playlist_map[f"Playlist {number}"] = rng.sample(song_ids, size)
+    return library, playlist_map
+
+
+def make_paste(rng=None, songs=1):
+    """Build clipboard-style text (header line + lyrics) for one or more songs."""
+    rng = rng or random.Random(7)
+    parts = []
+    for _ in range(songs):
+        song = make_song(rng)
+        parts.append(song["original_lyrics"])
+    return "\n\n".join(parts)
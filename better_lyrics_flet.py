@@ -1,13 +1,34 @@
 import flet as ft
-import pyperclip as pyclip # type: ignore
+import atexit
+import itertools
 import json
 import os
 import re
 import threading
 import time
 import traceback
+from collections import namedtuple
 from datetime import datetime
-import uuid
+
+from clipboard import Clipboard, describe_error
+from instrumentation import profiler
+from library_store import LibraryStore, apply_ops, apply_playlist_ops
+from lyrics_cleanup import get_junk_filter
+from lyrics_sections import parse_sections
+from lyrics_stanzas import collapse_repeats
+from play_history import PlayHistory
+from scroll_engine import ScrollEngine
+from smart_playlists import load_smart_playlists, save_smart_playlists, smart_playlist_from_dict
+from text_layout import estimate_layout, line_at_offset
+from song_library import PlaylistIndex, Song, SongIndex, apply_sort_keys, collation_group
+from title_artist import get_user_artists, parse_title_artist
+
+# Display settings saved per song (song["display"]) and applied when it is loaded
+DISPLAY_PROFILE_FIELDS = ("font_size", "line_spacing", "text_alignment", "buffer_lines",
+                          "scroll_speed", "song_length_seconds", "use_song_length_mode")
+
+# The display profile settings lyric controls and layouts are built with
+LyricStyle = namedtuple("LyricStyle", ["font_size", "line_spacing", "text_alignment", "buffer_lines"])
 
 
 class BetterLyricsApp:
@@ -36,28 +57,121 @@ class BetterLyricsApp:
         
         self.songs_file = os.path.join(self.songs_directory, "songs_library.json")
         self.playlists_file = os.path.join(self.songs_directory, "playlists.json")
-        self.song_library = self._load_song_library()
-        self.playlists = self._load_playlists()
+        # Journal + file lock so this app and the mobile server can write the same folder
+        self.library_store = LibraryStore(self.songs_directory)
+        # Append-only play log with in-memory rollups for the Stats tab
+        self.play_history = PlayHistory(self.songs_directory)
+        self._stored_playlists = None  # Playlists read together with the songs
+        # Loaded in the background after the first frame (start_library_load); until
+        # library_loaded is set these are empty and the Library button shows a loading state
+        self.song_library = []
+        self.song_index = SongIndex()  # Pre-sorted orderings for library views
+        self.playlists = PlaylistIndex({"Favorites": []})
+        self.library_loaded = threading.Event()
+        # Clipboard calls run off the UI thread and give up after a timeout
+        self.clipboard = Clipboard(on_timing=profiler.record)
         self.current_playlist = None
         self.show_library = False  # Toggle between main app and library view
 
+        # --- Batched Persistence ---
+        # Frequent small changes (scroll positions, ...) mark the files dirty and are
+        # written together after a short delay instead of on every change
+        self.save_delay_seconds = 2.0
+        self._pending_saves = set()  # {"library", "playlists", "history"}
+        self._dirty_song_ids = set()  # songs changed since the last sync (None: diff every song)
+        self._save_timer = None
+        self._save_lock = threading.Lock()
+        # Guards song_library, song_index (with its smart playlist views) and playlists:
+        # the batched sync merges other windows' changes into them on a timer thread
+        self.library_lock = threading.RLock()
+        # atexit runs in reverse order: flush pending changes, snapshot the play stats,
+        # then fold the journal into the JSON files
+        atexit.register(self.library_store.compact)
+        atexit.register(self._save_play_stats)
+        atexit.register(self._flush_pending_saves)
+
         # --- Auto-scroll Properties ---
         self.is_playing = False
         self.scroll_speed = 1.0  # Speed multiplier
         self.buffer_lines = 4  # Buffer lines at top before lyrics start
         self.song_length_seconds = 180  # Default 3 minutes
         self.use_song_length_mode = False  # False = speed mode, True = song length mode
+        self.song_length_pixels_per_second = None  # Exact rate computed in song length mode
         self.song_length_display_text = None  # For displaying time in the UI
+        # "keyframe" sends a long linear scroll_to every few seconds and lets the client animate;
+        # "frame" sends scroll_to every frame (40 per second) like earlier versions
+        self.scroll_sync_mode = "keyframe"
+        self.scroll_engine = ScrollEngine(self._send_scroll, mode=self.scroll_sync_mode)
+        self.scroll_engine.on_state = self._on_scroll_state
 
         # --- Customization Properties ---
         self.text_alignment = ft.TextAlign.CENTER
         self.line_spacing = 1.2
         self.font_size = 24
+        # Adjusting these while a song is loaded saves them as that song's display profile;
+        # songs without a profile keep whatever is currently set
+
+        # --- Lyric Rendering ---
+        # Chunked mode packs each stanza into one ft.Text with a span per line instead of
+        # one control per line, which keeps long songs and live transcripts light to send.
+        self.chunked_rendering = True
+        self.max_lines_per_block = 24  # Split stanzas without blank lines (e.g. transcripts)
+        self.lyric_line_spans = []  # line index -> (block Text, TextSpan) in chunked mode
+        self.highlight_interval = 0.2  # Seconds between moves of the reading-line highlight in frame mode
+        self._highlight_lock = threading.Lock()  # Serializes _highlight_line between the engine callback and the follow loop
+        self._highlight_stop = threading.Event()  # Set to stop the current highlight loop
+        self.highlighted_line = None
+        # Very large pastes (e.g. whole transcripts) are formatted on a worker thread, and
+        # long previews show the first blocks at once and append the rest in batches
+        self.large_paste_chars = 100_000
+        self.progressive_render_lines = 2000
+        self.progressive_batch_blocks = 25
+
+        # --- Preview Layout ---
+        # Declared heights of everything around the lyrics in preview mode; the lyrics viewport
+        # (song-length rate, resume points) is the page height minus their sum
+        self.page_padding = 5
+        self.logo_clearance = 100  # Logo overlay (80 px) + 20 px buffer
+        self.column_spacing = 10  # Flet's default Column spacing (page content column)
+        self.button_row_height = 40  # Material ElevatedButton height (nav and action rows)
+        self.preview_header_height = 80  # Song info and pro tip box
+        self.section_bar_height = 30
+        self.preview_controls_height = 100  # Alignment / sliders / speed / collapse row
+        self.preview_spacing = 15
+        self.lyrics_border_width = 2
+        self._transform_generation = 0  # Bumped to abandon a background transform
+        self._render_generation = 0  # Bumped to abandon a progressive render
+        self._pending_lyric_controls = None  # (remaining controls, generation) not yet displayed
+        # Show each repeat of a chorus as one "↻ first line …" reference instead of in full
+        self.collapse_repeats = False
+
+        # --- Setlist Mode ---
+        self.setlist = None  # {"playlist": name, "song_ids": [...], "position": index}
+        self._prefetched_songs = {}  # song_id -> (display settings, controls, line spans)
 
         # --- UI Control References ---
+        self.page = None
         self.lyrics_input = None
         self.theme_button = None
+        self.library_button = None
+        self.import_picker = None
         self.lyrics_display_container = None
+        self.song_title_text = None
+        self.song_favorite_icon = None
+        self.song_stats_text = None
+        self.setlist_status_text = None
+        self.favorite_button = None
+        self.play_button = None
+        self.section_bar = None  # Jump-to-section buttons above the lyrics
+        self.scroll_mode_column = None  # Speed / song length switch and slider
+        self.scroll_value_text = None  # "1.2x" or "3m 20s" above the scroll slider
+        self.alignment_buttons = []
+        self.font_size_slider = None
+        self.buffer_lines_slider = None
+
+        # --- Debug Overlay (only with BETTER_LYRICS_PROFILE=1) ---
+        self.debug_overlay_text = None
+        self._debug_overlay_thread = None
         
         # Portal box for drag and drop - removed (not reliable)
         # self.portal_overlay = None
@@ -69,6 +183,7 @@ class BetterLyricsApp:
         page.snack_bar.open = True
         page.update()
 
+    @profiler.timed("ui.rebuild")
     def _rebuild_ui(self, page):
         """Clears and rebuilds the entire UI based on the current app state."""
         try:
@@ -76,6 +191,9 @@ class BetterLyricsApp:
             page.clean()
             self.build_ui(page)
             page.update()
+            # The rebuilt lyrics ListView starts at the top; put it back where the scroll is
+            if self.is_preview_mode and not self.show_library and self.scroll_engine.position() > 0:
+                self.scroll_engine.resync()
             print("✅ UI rebuild completed successfully")
         except Exception as e:
             print(f"❌ Error during UI rebuild: {e}")
@@ -89,14 +207,58 @@ class BetterLyricsApp:
 
     # --- Song Library Management ---
 
+    def load_library(self):
+        """Read songs and playlists and build the indexes (blocking)."""
+        with profiler.timer("library.load_all"):
+            songs = self._load_song_library()
+            index = SongIndex(songs)
+            # Smart playlists are filled once here, then kept current by the index
+            for view in load_smart_playlists(self.songs_directory):
+                index.add_view(view)
+            playlists = self._load_playlists()
+            try:
+                self.play_history.load()
+            except Exception as e:
+                print(f"❌ Error loading play history: {e}")
+        with self.library_lock:
+            self.song_library, self.song_index, self.playlists = songs, index, playlists
+        self.library_loaded.set()
+
+    def start_library_load(self, page):
+        """Load the library on a background thread, then enable the Library button."""
+        def worker():
+            try:
+                self.load_library()
+            except Exception as e:
+                print(f"❌ Error loading library: {e}")
+                self.library_loaded.set()  # Continue with an empty library
+            self._refresh_library_button()
+            try:
+                page.update()
+            except Exception as e:
+                print(f"❌ Error updating page after library load: {e}")
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _library_button_text(self):
+        if not self.library_loaded.is_set():
+            return "⏳ Loading library..."
+        return f"🎵 Library ({len(self.song_library)})" if self.song_library else "🎵 Library"
+
+    def _refresh_library_button(self):
+        if self.library_button is not None:
+            self.library_button.text = self._library_button_text()
+            self.library_button.disabled = not self.library_loaded.is_set()
+
+    @profiler.timed("library.load")
     def _load_song_library(self):
-        """Load song library from JSON file."""
-        if os.path.exists(self.songs_file):
+        """Load song library from the JSON checkpoint plus the change journal."""
+        if os.path.exists(self.songs_file) or os.path.exists(self.library_store.journal_file):
             try:
-                with open(self.songs_file, 'r', encoding='utf-8') as f:
-                    library = json.load(f)
-                    print(f"✅ Loaded {len(library)} songs from {self.songs_file}")
-                    return library
+                # Songs saved by older versions get their sort keys computed here
+                library, self._stored_playlists = self.library_store.load()
+                print(f"✅ Loaded {len(library)} songs from {self.songs_file} (version {self.library_store.version})")
+                return library
             except Exception as e:
                 print(f"❌ Error loading song library: {e}")
                 # Create backup of corrupted file
@@ -111,24 +273,140 @@ class BetterLyricsApp:
         print(f"📁 Creating new song library at {self.songs_file}")
         return []
 
-    def _save_song_library(self):
-        """Save song library to JSON file."""
+    @profiler.timed("library.save")
+    def _save_song_library(self, *song_ids):
+        """Save song library changes (appended to the shared journal); song_ids are the changed songs, none means any."""
+        with self._save_lock:
+            self._mark_songs_dirty(song_ids or None)
+        self._sync_library()
+
+    def _sync_library(self):
+        """Write local changes to the journal and merge changes made by other windows/sessions."""
+        self.library_loaded.wait()  # Never diff against a library that is still loading
+        with self._save_lock:
+            dirty, self._dirty_song_ids = self._dirty_song_ids, set()
         try:
-            # Ensure directory exists
-            os.makedirs(os.path.dirname(self.songs_file), exist_ok=True)
-            
-            with open(self.songs_file, 'w', encoding='utf-8') as f:
-                json.dump(self.song_library, f, indent=2, ensure_ascii=False)
-            print(f"✅ Saved {len(self.song_library)} songs to {self.songs_file}")
+            with self.library_lock:
+                if dirty is None:
+                    songs, dirty_songs = list(self.song_library), None
+                else:
+                    # Only the songs marked dirty are diffed (and their lyrics unpacked)
+                    songs, dirty_songs = (), {song_id: self.song_index.get(song_id) for song_id in dirty}
+                playlists = self.playlists.to_dict()
+            # Journal I/O happens outside the lock so the UI is never blocked on it
+            remote_ops = self.library_store.commit(songs, playlists, dirty_songs)
+            if remote_ops:
+                with self.library_lock:
+                    self._apply_remote_changes(remote_ops)
+            print(f"✅ Synced {len(self.song_library)} songs (version {self.library_store.version})")
         except Exception as e:
+            with self._save_lock:
+                self._mark_songs_dirty(dirty)  # Retried by the next sync
             print(f"❌ Error saving song library: {e}")
 
+    def _mark_songs_dirty(self, song_ids):
+        """Add songs to the next sync's diff (None: diff every song). Call with _save_lock held."""
+        if song_ids is None:
+            self._dirty_song_ids = None
+        elif self._dirty_song_ids is not None:
+            self._dirty_song_ids.update(song_ids)
+
+    def _poll_library(self):
+        """Pick up changes other windows/sessions wrote since the last sync."""
+        with self._save_lock:
+            unsaved = bool(self._pending_saves & {"library", "playlists"}) or self._dirty_song_ids is None or bool(self._dirty_song_ids)
+        if unsaved:
+            # Local edits still waiting for the save timer: syncing them merges the
+            # other windows' changes through commit(), which keeps ours on conflicts
+            self._flush_pending_saves()
+            return
+        try:
+            remote_ops = self.library_store.poll()
+            if remote_ops:
+                with self.library_lock:
+                    self._apply_remote_changes(remote_ops)
+        except Exception as e:
+            print(f"❌ Error reading library changes: {e}")
+
+    def _apply_remote_changes(self, ops):
+        """Merge another writer's journal ops into the library, index and playlists (call with library_lock held)."""
+        with self._save_lock:
+            dirty = self._dirty_song_ids
+        if dirty:
+            # Songs changed here since the last sync keep their values; the next sync writes them over theirs
+            ops = [self._drop_remote_fields(op) if op["op"] == "update" and op["id"] in dirty and op.get("set") else op
+                   for op in ops]
+        songs = {song["id"]: song for song in self.song_library}
+        changed, playlist_ops = apply_ops(ops, songs)
+        for song_id, song in changed.items():
+            if song is None:
+                self.song_index.remove(song_id)
+                self.playlists.remove_song(song_id)
+            else:
+                self.song_index.add(song)
+        if len(songs) != len(self.song_library) or any(song_id not in songs for song_id in changed):
+            self.song_library = list(songs.values())
+        apply_playlist_ops(self.playlists, playlist_ops)
+        print(f"🔄 Merged {len(ops)} library changes from another window")
+
+    @staticmethod
+    def _drop_remote_fields(op):
+        """An update op without the fields it sets (its play count increments still apply)."""
+        print(f"⚠️ Concurrent edit of song {op['id']} ({', '.join(sorted(op['set']))}) - keeping this one")
+        return dict(op, set={})
+
+    def _schedule_save(self, library=True, playlists=False, history=False, song_ids=None):
+        """
+        Mark the library, playlists and/or play log dirty and write them once after
+        save_delay_seconds. song_ids names the changed songs (None: any song may have changed).
+        """
+        with self._save_lock:
+            if library:
+                self._pending_saves.add("library")
+                self._mark_songs_dirty(song_ids)
+            if playlists:
+                self._pending_saves.add("playlists")
+            if history:
+                self._pending_saves.add("history")
+            if self._save_timer is None:
+                self._save_timer = threading.Timer(self.save_delay_seconds, self._flush_pending_saves)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+
+    def _flush_pending_saves(self):
+        """Write every pending batched change now."""
+        with self._save_lock:
+            pending = self._pending_saves
+            self._pending_saves = set()
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+        if "history" in pending:
+            try:
+                # Appends our plays and picks up the ones other windows/sessions logged
+                self.play_history.refresh()
+            except Exception as e:
+                print(f"❌ Error writing play history: {e}")
+        if pending & {"library", "playlists"}:
+            # One journal sync covers songs and playlists
+            self._sync_library()
+
+    def _save_play_stats(self):
+        """Snapshot the play statistics so the next start replays only newer plays."""
+        try:
+            self.play_history.save_snapshot()
+        except Exception as e:
+            print(f"❌ Error saving play stats: {e}")
+
+    @profiler.timed("playlists.load")
     def _load_playlists(self):
-        """Load playlists from JSON file."""
+        """Load playlists (read together with the song library)."""
+        if self._stored_playlists is not None:
+            return PlaylistIndex(self._stored_playlists)
         if os.path.exists(self.playlists_file):
             try:
                 with open(self.playlists_file, 'r', encoding='utf-8') as f:
-                    playlists = json.load(f)
+                    playlists = PlaylistIndex(json.load(f))
                     print(f"✅ Loaded playlists from {self.playlists_file}")
                     return playlists
             except Exception as e:
@@ -143,19 +421,12 @@ class BetterLyricsApp:
                     pass
         
         print(f"📁 Creating new playlists file at {self.playlists_file}")
-        return {"Favorites": []}
+        return PlaylistIndex({"Favorites": []})
 
+    @profiler.timed("playlists.save")
     def _save_playlists(self):
-        """Save playlists to JSON file."""
-        try:
-            # Ensure directory exists
-            os.makedirs(os.path.dirname(self.playlists_file), exist_ok=True)
-            
-            with open(self.playlists_file, 'w', encoding='utf-8') as f:
-                json.dump(self.playlists, f, indent=2, ensure_ascii=False)
-            print(f"✅ Saved playlists to {self.playlists_file}")
-        except Exception as e:
-            print(f"❌ Error saving playlists: {e}")
+        """Save playlist changes (appended to the shared journal)."""
+        self._sync_library()
 
     def _delete_playlist_dialog(self, playlist_name, page):
         """Show confirmation dialog for deleting a playlist."""
@@ -166,8 +437,9 @@ class BetterLyricsApp:
         song_count = len(self.playlists.get(playlist_name, []))
         
         def confirm_delete(e):
-            if playlist_name in self.playlists:
-                del self.playlists[playlist_name]
+            with self.library_lock:
+                deleted = self.playlists.delete(playlist_name)
+            if deleted:
                 self._save_playlists()
                 self._show_message(page, f"🗑️ Deleted playlist: {playlist_name}")
                 self._rebuild_ui(page)
@@ -193,42 +465,99 @@ class BetterLyricsApp:
 
     def _create_song_entry(self, title, artist, lyrics, original_lyrics=None):
         """Create a new song entry for the library."""
-        return {
-            "id": str(uuid.uuid4()),
-            "title": title.strip(),
-            "artist": artist.strip(),
-            "lyrics": lyrics,
-            "original_lyrics": original_lyrics or lyrics,
-            "created_at": datetime.now().isoformat(),
-            "last_played": None,
-            "play_count": 0,
-            "is_favorite": False
-        }
+        return Song(title.strip(), artist.strip(), lyrics, original_lyrics)
 
     def _add_song_to_library(self, title, artist, lyrics, original_lyrics=None):
         """Add a new song to the library."""
+        self.library_loaded.wait()
         song = self._create_song_entry(title, artist, lyrics, original_lyrics)
-        self.song_library.append(song)
-        self._save_song_library()
+        with self.library_lock:
+            self.song_library.append(song)
+            self.song_index.add(song)
+        self._save_song_library(song["id"])
         self._save_playlists()
         
         return song
 
+    def import_lyrics_files(self, paths):
+        """Import .txt lyric files as new songs with a single save; returns (songs, failed paths)."""
+        junk_filter = get_junk_filter(self.songs_directory)
+        artists = (self.song_index.artists, get_user_artists(self.songs_directory))
+        songs = []
+        failed = []
+        with profiler.timer("library.import_files"):
+            for path in paths:
+                try:
+                    with open(path, "r", encoding="utf-8", errors="replace") as f:
+                        original = f.read()
+                    lyrics = self.format_lyrics(junk_filter.clean(original))
+                    if not lyrics:
+                        failed.append(path)
+                        continue
+                    # "Artist - Title.txt" names work like a pasted header line
+                    title, artist = parse_title_artist(os.path.splitext(os.path.basename(path))[0], artists)
+                    songs.append(self._create_song_entry(title or "Untitled", artist or "Unknown Artist", lyrics, original))
+                except Exception as ex:
+                    print(f"❌ Error importing {path}: {ex}")
+                    failed.append(path)
+
+            if songs:
+                self.library_loaded.wait()
+                with self.library_lock:
+                    self.song_library.extend(songs)
+                    for song in songs:
+                        self.song_index.add(song)
+                self._save_song_library(*(song["id"] for song in songs))
+        print(f"📥 Imported {len(songs)} songs ({len(failed)} skipped)")
+        return songs, failed
+
+    def _import_files_dialog(self, e):
+        """Pick .txt files to import into the library."""
+        if self.import_picker is None:
+            self.import_picker = ft.FilePicker(on_result=self._on_import_files_picked)
+            e.page.overlay.append(self.import_picker)
+            e.page.update()
+        self.import_picker.pick_files(
+            dialog_title="Import lyrics (.txt)",
+            allowed_extensions=["txt"],
+            allow_multiple=True,
+        )
+
+    def _on_import_files_picked(self, e):
+        """Imports the picked files on a worker thread, then refreshes the library view."""
+        paths = [f.path for f in (e.files or []) if f.path]
+        if not paths:
+            return
+        page = e.page
+        self._show_message(page, f"⏳ Importing {len(paths)} files...")
+
+        def worker():
+            songs, failed = self.import_lyrics_files(paths)
+            if self.show_library:
+                self._rebuild_ui(page)
+            message = f"📥 Imported {len(songs)} songs"
+            if failed:
+                message += f" ({len(failed)} empty or unreadable)"
+            self._show_message(page, message)
+
+        threading.Thread(target=worker, daemon=True).start()
+
     def _get_song_by_id(self, song_id):
         """Get a song by its ID."""
-        for song in self.song_library:
-            if song["id"] == song_id:
-                return song
-        return None
+        return self.song_index.get(song_id)
 
     def _update_song_played(self, song_id):
         """Update song play statistics."""
         song = self._get_song_by_id(song_id)
         if song:
-            song["last_played"] = datetime.now().isoformat()
-            song["play_count"] += 1
-            self._save_song_library()
-            self._save_playlists()
+            with self.library_lock:
+                song["last_played"] = time.time()
+                song["play_count"] += 1
+                self.song_index.update(song)
+            # One event in the play log; its rollups (Stats tab) update right away
+            self.play_history.record(song_id, song["artist"], song["last_played"])
+            # Statistics are not urgent: batch them instead of two full writes per load
+            self._schedule_save(history=True, song_ids=(song_id,))
 
     def _create_new_playlist(self, e):
         """Create a new playlist."""
@@ -265,7 +594,8 @@ class BetterLyricsApp:
                     return
                 
                 # Create the playlist
-                self.playlists[playlist_name] = []
+                with self.library_lock:
+                    self.playlists.create(playlist_name)
                 self._save_playlists()
                 print(f"✅ Playlist '{playlist_name}' created successfully")
                 
@@ -336,113 +666,384 @@ class BetterLyricsApp:
             print(f"✅ Dialog opened successfully")
         except Exception as ex:
             print(f" Error opening dialog: {ex}")
-            import traceback
             traceback.print_exc()
 
+    def _save_smart_playlists(self):
+        """Save the smart playlist rules (members are always derived from the library)."""
+        save_smart_playlists(list(self.song_index.views.values()), self.songs_directory)
+
+    def _create_smart_playlist(self, e):
+        """Create a rule-based playlist that keeps itself up to date."""
+        page = e.page
+        rule_hints = {
+            "most_played": ("How many songs", "25"),
+            "recently_added": ("Added in the last N days", "30"),
+            "artist": ("Artist name", ""),
+            "never_played": ("No options", ""),
+        }
+
+        def close_dialog(e=None):
+            try:
+                if dialog in page.overlay:
+                    dialog.open = False
+                    page.overlay.remove(dialog)
+                page.update()
+            except Exception as ex:
+                print(f"Error closing dialog: {ex}")
+
+        def on_rule_change(e):
+            option_field.label, option_field.value = rule_hints[rule_dropdown.value]
+            option_field.disabled = rule_dropdown.value == "never_played"
+            option_field.update()
+
+        def create(e=None):
+            try:
+                name = name_field.value.strip()
+                rule = rule_dropdown.value
+                option = (option_field.value or "").strip()
+                if not name:
+                    self._show_message(page, "Please enter a playlist name!")
+                    return
+                if name in self.playlists or name in self.song_index.views:
+                    self._show_message(page, f"Playlist '{name}' already exists!")
+                    return
+                definition = {"name": name, "rule": rule}
+                if rule == "artist":
+                    if not option:
+                        self._show_message(page, "Please enter an artist!")
+                        return
+                    definition["artist"] = option
+                elif rule in ("most_played", "recently_added"):
+                    if not option.isdigit() or int(option) < 1:
+                        self._show_message(page, "Please enter a whole number!")
+                        return
+                    definition["limit" if rule == "most_played" else "days"] = int(option)
+                view = smart_playlist_from_dict(definition)
+                with self.library_lock:
+                    self.song_index.add_view(view)
+                self._save_smart_playlists()
+                close_dialog()
+                self._show_message(page, f"✨ Smart playlist '{name}' created ({len(view)} songs)")
+                if self.show_library:
+                    self._rebuild_ui(page)
+            except Exception as ex:
+                print(f"❌ Error creating smart playlist: {ex}")
+                self._show_message(page, f"Error: {ex}")
+
+        name_field = ft.TextField(label="Playlist Name", autofocus=True, on_submit=create)
+        rule_dropdown = ft.Dropdown(
+            label="Rule",
+            value="most_played",
+            options=[
+                ft.dropdown.Option("most_played", "🔥 Most played"),
+                ft.dropdown.Option("recently_added", "🆕 Recently added"),
+                ft.dropdown.Option("artist", "🎤 Artist is..."),
+                ft.dropdown.Option("never_played", "💤 Never played"),
+            ],
+            on_change=on_rule_change,
+        )
+        option_field = ft.TextField(label=rule_hints["most_played"][0], value=rule_hints["most_played"][1], on_submit=create)
+
+        dialog = ft.AlertDialog(
+            modal=True,
+            title=ft.Text("✨ Create Smart Playlist"),
+            content=ft.Container(
+                content=ft.Column([name_field, rule_dropdown, option_field], tight=True, spacing=10),
+                width=300,
+                padding=ft.padding.all(20)
+            ),
+            actions=[
+                ft.ElevatedButton("✨ Create", on_click=create),
+                ft.TextButton("Cancel", on_click=close_dialog),
+            ],
+            actions_alignment=ft.MainAxisAlignment.CENTER,
+        )
+        page.overlay.append(dialog)
+        dialog.open = True
+        page.update()
+
+    def _delete_smart_playlist(self, name, page):
+        """Delete a smart playlist (its songs stay in the library)."""
+        with self.library_lock:
+            removed = self.song_index.remove_view(name)
+        if removed is not None:
+            self._save_smart_playlists()
+            self._show_message(page, f"🗑️ Deleted smart playlist '{name}'")
+            self._rebuild_ui(page)
+
     def _toggle_favorite(self, song_id):
         """Toggle favorite status of a song."""
         song = self._get_song_by_id(song_id)
         if song:
-            song["is_favorite"] = not song["is_favorite"]
-            self._save_song_library()
-            
-            # Ensure Favorites playlist exists
-            if "Favorites" not in self.playlists:
-                self.playlists["Favorites"] = []
-            
-            # Update favorites playlist
-            favorites_list = self.playlists["Favorites"]
-            if song["is_favorite"] and song_id not in favorites_list:
-                favorites_list.append(song_id)
-            elif not song["is_favorite"] and song_id in favorites_list:
-                favorites_list.remove(song_id)
-            
-            self._save_playlists()
+            with self.library_lock:
+                song["is_favorite"] = not song["is_favorite"]
+                # Update favorites playlist (created on first use)
+                if song["is_favorite"]:
+                    self.playlists.add("Favorites", song_id)
+                else:
+                    self.playlists.create("Favorites")
+                    self.playlists.remove("Favorites", song_id)
+            # One sync covers the song and the playlist
+            self._save_song_library(song_id)
 
     def _delete_song(self, song_id):
         """Delete a song from the library."""
-        self.song_library = [s for s in self.song_library if s["id"] != song_id]
-        self._save_song_library()
-        
-        # Remove from all playlists
-        for playlist_name in self.playlists:
-            if song_id in self.playlists[playlist_name]:
-                self.playlists[playlist_name].remove(song_id)
-        self._save_playlists()
+        with self.library_lock:
+            self.song_library = [s for s in self.song_library if s["id"] != song_id]
+            self.song_index.remove(song_id)
+            # Remove from the playlists holding it (via the reverse index)
+            self.playlists.remove_song(song_id)
+        # One sync covers the song and its playlists
+        self._save_song_library(song_id)
 
     def _load_song(self, song_id, page):
         """Load a song from the library into the app."""
         song = self._get_song_by_id(song_id)
         if song:
+            # Remember where the previous song was left
+            self._remember_scroll_position()
+            
+            # Loading a song outside the running setlist ends it
+            if self.setlist:
+                if song_id in self.setlist["song_ids"]:
+                    self.setlist["position"] = self.setlist["song_ids"].index(song_id)
+                else:
+                    self.end_setlist()
+            
             self.current_song = song
             self.original_lyrics = song["original_lyrics"]
             self.formatted_lyrics = song["lyrics"]
             self.is_preview_mode = True
             self.show_library = False
+            self._apply_display_profile(song)
+            resumed = self._restore_scroll_position(song)
             
             # Update play statistics
             self._update_song_played(song_id)
             
             self._rebuild_ui(page)
-            self._show_message(page, f"🎵 Loaded: {song['title']} - {song['artist']}")
+            message = f"🎵 Loaded: {song['title']} - {song['artist']}"
+            if resumed:
+                message += f" (resuming at line {song['resume_line'] + 1})"
+            self._show_message(page, message)
+
+    def _remember_scroll_position(self):
+        """Stores the current scroll position of the loaded song as a line index (batched save)."""
+        if not self.current_song or not self.is_preview_mode:
+            return
+        offset = self.scroll_engine.position()
+        layout = self._lyrics_layout()
+        if not layout.line_offsets or offset < layout.line_offsets[0]:
+            line, fraction = 0, 0.0
+        else:
+            line = line_at_offset(layout, offset)
+            height = layout.line_heights[line] or 1
+            fraction = min(1.0, (offset - layout.line_offsets[line]) / height)
+        collapsed = self._collapsed_view()
+        if collapsed:
+            # Resume points are lines of the full lyrics
+            line = collapsed.to_source[min(line, len(collapsed.to_source) - 1)]
+        elapsed = round(self.scroll_engine.elapsed(), 1)
+
+        song = self.current_song
+        position = (line, round(fraction, 3), elapsed)
+        if position != (song.get("resume_line", 0), song.get("resume_fraction", 0.0), song.get("resume_elapsed", 0.0)):
+            song["resume_line"], song["resume_fraction"], song["resume_elapsed"] = position
+            self._schedule_save(song_ids=(song["id"],))
+
+    def _restore_scroll_position(self, song):
+        """Seeks the scroll engine to a song's saved line under the current font size and width."""
+        line = song.get("resume_line", 0)
+        fraction = song.get("resume_fraction", 0.0)
+        layout = self._lyrics_layout()
+        collapsed = self._collapsed_view()
+        if collapsed and line:
+            line = collapsed.to_display[min(line, len(collapsed.to_display) - 1)]
+        if (line or fraction) and layout.line_offsets:
+            line = min(line, len(layout.line_offsets) - 1)
+            self.scroll_engine.seek(layout.line_offsets[line] + fraction * layout.line_heights[line])
+            self.scroll_engine.set_elapsed(song.get("resume_elapsed", 0.0))
+            return True
+        self.scroll_engine.seek(0)
+        self.scroll_engine.set_elapsed(0.0)
+        return False
+
+    def restart_scroll(self, e):
+        """Scrolls back to the top of the current song and forgets its resume point."""
+        self.scroll_engine.seek(0)
+        self.scroll_engine.set_elapsed(0.0)
+        if self.current_song and (self.current_song.get("resume_line") or self.current_song.get("resume_fraction")):
+            self.current_song["resume_line"] = 0
+            self.current_song["resume_fraction"] = 0.0
+            self.current_song["resume_elapsed"] = 0.0
+            self._schedule_save(song_ids=(self.current_song["id"],))
+        self._show_message(e.page, "⏮️ Back to the top")
+
+    # --- Setlist Mode ---
+
+    def start_setlist(self, playlist_name, page):
+        """Plays a playlist in order as a setlist, preparing the next song in the background."""
+        song_ids = [song_id for song_id in self.playlists.get(playlist_name, {}) if self._get_song_by_id(song_id)]
+        if not song_ids:
+            self._show_message(page, f"'{playlist_name}' has no songs to play!")
+            return
+        
+        self.setlist = {"playlist": playlist_name, "song_ids": song_ids, "position": 0}
+        self._prefetched_songs = {}
+        self._load_song(song_ids[0], page)
+        self._prefetch_setlist_song(1)
+
+    def end_setlist(self, e=None):
+        """Leaves setlist mode."""
+        self.setlist = None
+        self._prefetched_songs = {}
+        if e is not None:
+            self._rebuild_ui(e.page)
+            self._show_message(e.page, "📋 Setlist ended")
+
+    def _setlist_status(self):
+        """Setlist progress text for the song header."""
+        if not self.setlist:
+            return ""
+        return f"📋 Setlist: {self.setlist['playlist']} ({self.setlist['position'] + 1}/{len(self.setlist['song_ids'])})"
+
+    def _display_settings_key(self, style=None):
+        """Everything prebuilt lyric controls depend on (prefetched controls are only reused if unchanged)."""
+        return tuple(style or self._lyric_style()) + (self.is_dark_mode, self.chunked_rendering,
+                                                      self.max_lines_per_block, self.collapse_repeats)
+
+    def _prefetch_setlist_song(self, position):
+        """Prepares a setlist song's lines, controls and layout in a background thread."""
+        if not self.setlist or not 0 <= position < len(self.setlist["song_ids"]):
+            return
+        song_id = self.setlist["song_ids"][position]
+        
+        def prefetch():
+            song = self._get_song_by_id(song_id)
+            if not song:
+                return
+            try:
+                with profiler.timer("setlist.prefetch"):
+                    # Built with the song's own display profile, which _step_setlist applies before reusing them
+                    style = self._lyric_style(song)
+                    settings_key = self._display_settings_key(style)
+                    displayed = self._displayed_lyrics(song["lyrics"])
+                    lyrics_lines = displayed.split('\n') if displayed else [""]
+                    controls, line_spans = self._create_lyric_controls(lyrics_lines, style)
+                    # Warm the layout and section caches used for resume, jumps and song-length speed
+                    self._lyrics_layout(song["lyrics"], style)
+                    song.sections()
+                self._prefetched_songs[song_id] = (settings_key, controls, line_spans)
+            except Exception as ex:
+                print(f"❌ Error prefetching setlist song: {ex}")
+        
+        threading.Thread(target=prefetch, daemon=True).start()
+
+    def next_setlist_song(self, e):
+        """Moves to the next song of the setlist."""
+        self._step_setlist(e.page, 1)
+
+    def previous_setlist_song(self, e):
+        """Moves to the previous song of the setlist."""
+        self._step_setlist(e.page, -1)
+
+    def _step_setlist(self, page, step):
+        """Switches setlist songs in place: swaps prefetched controls, no rebuild and no disk I/O."""
+        if not self.setlist:
+            return
+        position = self.setlist["position"] + step
+        if not 0 <= position < len(self.setlist["song_ids"]):
+            self._show_message(page, "🎉 End of the setlist!" if step > 0 else "Already at the first song")
+            return
+        song = self._get_song_by_id(self.setlist["song_ids"][position])
+        if not song:
+            self._show_message(page, "This song is no longer in the library")
+            return
+        
+        with profiler.timer("setlist.transition"):
+            self._remember_scroll_position()
+            self.setlist["position"] = position
+            self.current_song = song
+            self.original_lyrics = song["original_lyrics"]
+            self.formatted_lyrics = song["lyrics"]
+            with self._highlight_lock:
+                self.highlighted_line = None
+            self._apply_display_profile(song)
+            
+            prefetched = self._prefetched_songs.pop(song["id"], None)
+            if prefetched and prefetched[0] == self._display_settings_key():
+                controls, self.lyric_line_spans = prefetched[1], prefetched[2]
+            else:
+                displayed = self._displayed_lyrics()
+                lyrics_lines = displayed.split('\n') if displayed else [""]
+                controls = self._build_lyric_controls(lyrics_lines)
+            
+            # Play statistics only mark the library dirty; the write happens later
+            self._update_song_played(song["id"])
+            
+            container = self.lyrics_display_container
+            if container and container.page and not self.show_library:
+                container.controls = controls
+                self._start_progressive_render()
+                self._refresh_song_header()
+                page.update()
+                self._restore_scroll_position(song)
+            else:
+                self._restore_scroll_position(song)
+                self._rebuild_ui(page)
+        
+        self._prefetch_setlist_song(position + 1)
+
+    def _refresh_song_header(self):
+        """Updates the preview header and favorite button for the current song without a rebuild."""
+        song = self.current_song
+        is_favorite = bool(song and song.get("is_favorite"))
+        if self.song_title_text:
+            self.song_title_text.value = f"🎵 {song['title']} - {song['artist']}" if song else ""
+        if self.song_favorite_icon:
+            self.song_favorite_icon.visible = is_favorite
+        if self.song_stats_text:
+            self.song_stats_text.value = f"♪ Played {song.get('play_count', 0)} times" if song else ""
+        if self.setlist_status_text:
+            self.setlist_status_text.value = self._setlist_status()
+            self.setlist_status_text.visible = bool(self.setlist)
+        if self.favorite_button:
+            self.favorite_button.text = "⭐ Unfavorite" if is_favorite else "⭐ Favorite"
+            self.favorite_button.icon = ft.Icons.FAVORITE if is_favorite else ft.Icons.FAVORITE_BORDER
+            self.favorite_button.style = ft.ButtonStyle(bgcolor=ft.Colors.RED_100 if is_favorite else None)
+        if self.section_bar:
+            self.section_bar.controls = self._build_section_buttons()
+            self.section_bar.visible = bool(self.section_bar.controls)
+        self._refresh_display_controls()
+
+    def _refresh_display_controls(self):
+        """Shows the current display settings in the preview controls (the song's profile may have changed them)."""
+        for button in self.alignment_buttons:
+            button.selected = button.data == self.text_alignment
+        if self.font_size_slider:
+            self.font_size_slider.value = self.font_size
+        if self.buffer_lines_slider:
+            self.buffer_lines_slider.value = self.buffer_lines
+        if self.scroll_mode_column:
+            # Rebuilt so the switch, the slider and the readout match the speed / song length mode
+            self.scroll_mode_column.controls = self._create_scroll_mode_controls()
 
     def toggle_library_view(self, e):
         """Toggle between main app and library view."""
+        if not self.library_loaded.is_set():
+            self._show_message(e.page, "⏳ Library is still loading...")
+            return
+        if not self.show_library:
+            self._remember_scroll_position()
+            self._poll_library()
+            # Other windows' plays are read by the next background flush, not here
+            self._schedule_save(library=False, history=True)
         self.show_library = not self.show_library
         self._rebuild_ui(e.page)
 
     def _parse_title_artist_from_text(self, text):
-        """Try to extract title and artist from pasted text."""
-        lines = text.strip().split('\n')
-        first_line = lines[0].strip()
-        
-        # Common patterns to look for
-        patterns = [
-            r'^(.+?)\s*-\s*(.+?)$',  # "Artist - Title" or "Title - Artist"
-            r'^(.+?)\s*by\s+(.+?)$',  # "Title by Artist"
-            r'^(.+?)\s*\|\s*(.+?)$',  # "Title | Artist"
-            r'^\[(.+?)\]\s*(.+?)$',   # "[Artist] Title"
-        ]
-        
-        import re
-        for pattern in patterns:
-            match = re.match(pattern, first_line, re.IGNORECASE)
-            if match:
-                part1, part2 = match.groups()
-                
-                # Improved logic for determining title vs artist
-                # Check for common separators and formats
-                if ' by ' in first_line.lower():
-                    # "Title by Artist" format
-                    return part1.strip(), part2.strip()  # title, artist
-                elif any(indicator in part1.lower() for indicator in ['feat', 'ft.', 'featuring', '&', 'and']):
-                    # First part looks like it has featured artists
-                    return part2.strip(), part1.strip()  # title, artist
-                elif any(indicator in part2.lower() for indicator in ['feat', 'ft.', 'featuring']):
-                    # Second part has featured info, so first is likely title
-                    return part1.strip(), part2.strip()  # title, artist
-                else:
-                    # Default: assume "Artist - Title" format (most common)
-                    # But check if first part looks more like a title (longer, has common title words)
-                    title_indicators = ['love', 'you', 'me', 'my', 'the', 'a', 'an', 'is', 'are', 'was', 'were']
-                    part1_words = part1.lower().split()
-                    part2_words = part2.lower().split()
-                    
-                    part1_has_title_words = any(word in title_indicators for word in part1_words)
-                    part2_has_title_words = any(word in title_indicators for word in part2_words)
-                    
-                    if part1_has_title_words and not part2_has_title_words:
-                        # First part looks more like a title
-                        return part1.strip(), part2.strip()  # title, artist
-                    elif part2_has_title_words and not part1_has_title_words:
-                        # Second part looks more like a title
-                        return part2.strip(), part1.strip()  # title, artist
-                    else:
-                        # Default to "Artist - Title" format
-                        return part2.strip(), part1.strip()  # title, artist
-        
-        # If no pattern matches, return first line as title, empty artist
-        return first_line, ""
+        """Try to extract title and artist from pasted text (artists in the library settle "A - B")."""
+        return parse_title_artist(text, (self.song_index.artists, get_user_artists(self.songs_directory)))
 
     def _toggle_current_favorite(self, e):
         """Toggle favorite status of current song."""
@@ -473,8 +1074,9 @@ class BetterLyricsApp:
             return
         
         def add_to_playlist(playlist_name):
-            if song_id not in self.playlists[playlist_name]:
-                self.playlists[playlist_name].append(song_id)
+            with self.library_lock:
+                added = self.playlists.add(playlist_name, song_id)
+            if added:
                 self._save_playlists()
                 self._show_message(page, f"🎵 Added '{song['title']}' to '{playlist_name}'!")
             else:
@@ -491,14 +1093,17 @@ class BetterLyricsApp:
                 page.overlay.remove(dialog)
             page.update()
         
-        # Create playlist buttons
+        # Create playlist buttons, marking playlists that already contain the song
+        member_of = self.playlists.playlists_for(song_id)
         playlist_buttons = []
         for playlist_name in available_playlists:
             song_count = len(self.playlists[playlist_name])
+            already_added = playlist_name in member_of
             playlist_buttons.append(
                 ft.ElevatedButton(
-                    f"🎵 {playlist_name} ({song_count})",
+                    f"{'✅' if already_added else '🎵'} {playlist_name} ({song_count})",
                     on_click=lambda e, pname=playlist_name: add_to_playlist(pname),
+                    tooltip="Already in this playlist" if already_added else None,
                     width=250
                 )
             )
@@ -532,8 +1137,9 @@ class BetterLyricsApp:
             return
         
         def confirm_remove(e):
-            if song_id in self.playlists[current_playlist]:
-                self.playlists[current_playlist].remove(song_id)
+            with self.library_lock:
+                removed = self.playlists.remove(current_playlist, song_id)
+            if removed:
                 self._save_playlists()
                 self._show_message(page, f"🗑️ Removed '{song['title']}' from '{current_playlist}'!")
             # Properly remove dialog from overlay
@@ -711,23 +1317,33 @@ class BetterLyricsApp:
     def change_alignment(self, e):
         """Changes the text alignment of the lyrics display."""
         self.text_alignment = e.control.data
-        self._rebuild_ui(e.page)
+        for button in self.alignment_buttons:
+            button.selected = button.data == self.text_alignment
+        self._save_display_profile()
+        self._restyle_lyrics(e.page)
 
     def change_line_spacing(self, e):
         """Changes the line spacing based on the slider."""
         self.line_spacing = e.control.value
-        self._rebuild_ui(e.page)
+        if self.use_song_length_mode:
+            self._calculate_optimal_scroll_speed()
+        self._save_display_profile()
+        self._restyle_lyrics(e.page)
 
     def change_font_size(self, e):
         """Changes the font size based on the slider."""
         self.font_size = e.control.value
-        self._rebuild_ui(e.page)
+        if self.use_song_length_mode:
+            self._calculate_optimal_scroll_speed()
+        self._save_display_profile()
+        self._restyle_lyrics(e.page)
 
     def change_scroll_speed(self, e):
         """Changes the auto-scroll speed based on the slider."""
         self.scroll_speed = e.control.value
-        # Rebuild UI to update the display text above slider
-        self._rebuild_ui(e.page)
+        self.scroll_engine.set_speed(self._scroll_pixels_per_second())
+        self._save_display_profile()
+        self._update_scroll_value_text()
 
     def change_song_length(self, e):
         """Updates song length and calculates optimal scroll speed."""
@@ -736,40 +1352,252 @@ class BetterLyricsApp:
         e.control.label = self._format_time_compact(self.song_length_seconds)
         # Auto-calculate optimal scroll speed based on content and song length
         self._calculate_optimal_scroll_speed()
-        # Rebuild UI to update the display text above slider
-        self._rebuild_ui(e.page)
+        self._save_display_profile()
+        self._update_scroll_value_text()
 
     def toggle_scroll_mode(self, e):
         """Toggles between manual speed control and song length mode."""
         self.use_song_length_mode = not self.use_song_length_mode
-        # Rebuild the UI to show the correct slider
-        self._rebuild_ui(e.page)
+        self._apply_scroll_mode()
+        self._save_display_profile()
+        # Swap the slider in place
+        if self.scroll_mode_column and self.scroll_mode_column.page:
+            self.scroll_mode_column.controls = self._create_scroll_mode_controls()
+            self.scroll_mode_column.update()
+
+    def _apply_scroll_mode(self):
+        """Sets the scroll engine rate for the current speed / song length settings."""
+        if self.use_song_length_mode:
+            self._calculate_optimal_scroll_speed()
+        else:
+            # Manual speed: no exact rate and no end clamp
+            self.song_length_pixels_per_second = None
+            self.scroll_engine.max_offset = None
+            self.scroll_engine.set_speed(self._scroll_pixels_per_second())
+
+    def _restyle_lyrics(self, page):
+        """Re-renders only the lyric controls after a display setting changed (no full UI rebuild)."""
+        if not self.is_preview_mode or not self.lyrics_display_container or not self.lyrics_display_container.page:
+            return
+        self._refresh_preview_display(page)
+        self._update_scroll_value_text(update=False)
+        page.update()
+        if self.scroll_engine.position() > 0:
+            self.scroll_engine.resync()
+
+    def _update_scroll_value_text(self, update=True):
+        """Refreshes the speed / song length readout above the scroll slider."""
+        if not self.scroll_value_text:
+            return
+        if self.use_song_length_mode:
+            self.scroll_value_text.value = self._format_time_compact(self.song_length_seconds)
+        else:
+            self.scroll_value_text.value = f"{self.scroll_speed:.1f}x"
+        if update and self.scroll_value_text.page:
+            self.scroll_value_text.update()
+
+    # --- Per-song Display Profiles ---
+
+    def _display_profile(self):
+        """The current display settings in the form saved on a song."""
+        profile = {field: getattr(self, field) for field in DISPLAY_PROFILE_FIELDS}
+        profile["text_alignment"] = self.text_alignment.value
+        return profile
+
+    def _save_display_profile(self):
+        """Stores the current display settings as the loaded song's profile (batched save)."""
+        song = self.current_song
+        if not song:
+            return
+        saved = song.get("display") or {}
+        profile = self._display_profile()
+        if "song_length_rate" in saved:
+            profile["song_length_rate"] = saved["song_length_rate"]
+        if profile != saved:
+            # Replaced as a whole so the library store sees the change
+            song["display"] = profile
+            self._schedule_save(song_ids=(song["id"],))
+
+    def _apply_display_profile(self, song):
+        """Applies a song's display settings in one pass before its lyrics are built."""
+        profile = song.get("display")
+        if profile:
+            for field in DISPLAY_PROFILE_FIELDS:
+                if field in profile:
+                    setattr(self, field, profile[field])
+            self.text_alignment = self._profile_alignment(profile)
+        self._apply_scroll_mode()
+
+    @staticmethod
+    def _profile_alignment(profile):
+        """The text alignment saved in a display profile (centered when missing or unknown)."""
+        try:
+            return ft.TextAlign(profile.get("text_alignment", ft.TextAlign.CENTER.value))
+        except ValueError:
+            return ft.TextAlign.CENTER
+
+    def _lyric_style(self, song=None):
+        """The current lyric style, or the one a song's display profile will apply when it is loaded."""
+        style = LyricStyle(self.font_size, self.line_spacing, self.text_alignment, self.buffer_lines)
+        profile = song.get("display") if song else None
+        if not profile:
+            return style
+        fields = {field: profile[field] for field in ("font_size", "line_spacing", "buffer_lines") if field in profile}
+        return style._replace(text_alignment=self._profile_alignment(profile), **fields)
+
+    def _song_length_rate_key(self):
+        """Everything the song-length scroll rate depends on, in a JSON-friendly form."""
+        return [self.song_length_seconds, self.font_size, self.line_spacing, self.buffer_lines,
+                self.chunked_rendering, self.max_lines_per_block, self.collapse_repeats,
+                round(self._lyrics_text_width()), round(self._lyrics_viewport_height()),
+                len(self.formatted_lyrics or "")]
+
+    def _lyrics_text_width(self):
+        """Width of the lyrics ListView (page width minus page padding and container border)."""
+        page_width = (self.page.width if self.page and self.page.width else None) or 1400
+        return page_width - 2 * self.page_padding - 2 * self.lyrics_border_width
+
+    def _lyrics_viewport_height(self):
+        """Visible height of the lyrics ListView in preview mode."""
+        page_height = (self.page.height if self.page and self.page.height else None) or 900
+        # Page: padding, logo clearance, nav row and the spacing around the content
+        chrome = 2 * self.page_padding + self.logo_clearance + self.button_row_height + 2 * self.column_spacing
+        # Preview column: header, controls row and action row, each followed or preceded by spacing
+        chrome += (self.preview_header_height + self.preview_controls_height + self.button_row_height
+                   + 3 * self.preview_spacing + 2 * self.lyrics_border_width)
+        if self._current_sections():
+            chrome += self.section_bar_height + self.preview_spacing
+        return max(100, page_height - chrome)
+
+    def _collapsed_view(self, lyrics=None):
+        """Collapsed-repeats view of the current (or given) lyrics, or None when repeats are shown in full."""
+        if not self.collapse_repeats:
+            return None
+        return collapse_repeats((self.formatted_lyrics if lyrics is None else lyrics) or "")
+
+    def _displayed_lyrics(self, lyrics=None):
+        """The text the preview shows for the current (or given) lyrics."""
+        collapsed = self._collapsed_view(lyrics)
+        if collapsed:
+            return collapsed.text
+        return (self.formatted_lyrics if lyrics is None else lyrics) or ""
+
+    def _lyrics_layout(self, lyrics=None, style=None):
+        """Predicted layout of the displayed current (or given) lyrics, memoized per lyrics, font size and width."""
+        style = style or self._lyric_style()
+        return estimate_layout(
+            self._displayed_lyrics(lyrics),
+            style.font_size,
+            self._lyrics_text_width(),
+            style.line_spacing,
+            style.buffer_lines,
+            self.chunked_rendering,
+            self.max_lines_per_block,
+        )
+
+    def _current_sections(self):
+        """Tagged sections of the displayed lyrics (cached on the song, or by lyrics text)."""
+        if self.collapse_repeats:
+            return parse_sections(self._displayed_lyrics())
+        song = self.current_song
+        if song is not None and song["lyrics"] is self.formatted_lyrics:
+            return song.sections()
+        return parse_sections(self.formatted_lyrics or "")
+
+    def _build_section_buttons(self):
+        """One jump button per tagged section of the displayed lyrics."""
+        colors = {"chorus": ft.Colors.AMBER_400, "verse": ft.Colors.BLUE_300, "bridge": ft.Colors.PURPLE_300}
+        return [
+            ft.OutlinedButton(
+                section.label if section.occurrence == 1 else f"{section.label} ({section.occurrence})",
+                on_click=lambda e, line=section.start: self.jump_to_line(line),
+                style=ft.ButtonStyle(color=colors.get(section.kind), padding=ft.padding.symmetric(horizontal=10)),
+                height=30,
+            )
+            for section in self._current_sections()
+        ]
+
+    def jump_to_line(self, line_index):
+        """Scrolls straight to a lyric line: one lookup in the memoized layout, no search."""
+        layout = self._lyrics_layout()
+        if not layout.line_offsets:
+            return
+        line_index = min(max(0, line_index), len(layout.line_offsets) - 1)
+        self.scroll_engine.seek(layout.line_offsets[line_index])
+
+    def toggle_collapse_repeats(self, e):
+        """Shows repeated stanzas in full or as one-line references, keeping the current place in the song."""
+        layout = self._lyrics_layout()
+        offset = self.scroll_engine.position()
+        line = line_at_offset(layout, offset) if layout.line_offsets and offset >= layout.line_offsets[0] else 0
+        collapsed = self._collapsed_view()
+        if collapsed:
+            line = collapsed.to_source[min(line, len(collapsed.to_source) - 1)]
+
+        self.collapse_repeats = not self.collapse_repeats
+        collapsed = self._collapsed_view()
+        if collapsed:
+            line = collapsed.to_display[min(line, len(collapsed.to_display) - 1)]
+        if self.use_song_length_mode:
+            self._calculate_optimal_scroll_speed()
+        self._refresh_preview_display(e.page)
+        self._refresh_song_header()
+        e.page.update()
+        if line:
+            self.jump_to_line(line)
+        if collapsed:
+            self._show_message(e.page, f"↻ Collapsed {collapsed.collapsed} repeated stanzas")
 
     def _calculate_optimal_scroll_speed(self):
-        """Calculates perfect scroll speed based on song length and lyrics content."""
+        """Calculates perfect scroll speed based on song length and the measured lyrics layout."""
         if not self.formatted_lyrics:
             return
         
-        # Estimate total scroll distance needed
-        total_lines = len(self.formatted_lyrics.split('\n')) + self.buffer_lines
-        estimated_scroll_height = total_lines * (self.font_size + 5)  # Rough estimate
-        
-        # Calculate pixels per second needed to finish in song_length_seconds
-        pixels_per_second = estimated_scroll_height / self.song_length_seconds
-        
-        # Convert to our scroll speed multiplier with better scaling
-        # Base is ~0.8 pixels per frame at 40fps = 32 pixels/second at 1x speed
-        base_pixels_per_second = 32  # 0.8 * 40 fps
-        calculated_speed = pixels_per_second / base_pixels_per_second
-        
-        # Apply more aggressive scaling for extreme values
-        if self.song_length_seconds <= 60:  # 1 minute or less - SUPER FAST
-            calculated_speed *= 2.0  # Double the speed for short songs
-        elif self.song_length_seconds >= 600:  # 10+ minutes - SLOWER
-            calculated_speed *= 0.6  # Slower for long songs
-        
-        # Clamp between reasonable bounds but allow more extreme values
-        self.scroll_speed = max(0.05, min(5.0, calculated_speed))
+        # The rate is saved with the song's display profile, so loading a song with
+        # unchanged settings skips the layout estimate
+        song = self.current_song
+        profile = song.get("display") if song else None
+        rate_key = self._song_length_rate_key()
+        cached = profile.get("song_length_rate") if profile else None
+        if cached and cached.get("key") == rate_key:
+            scroll_distance = cached["max_offset"]
+        else:
+            # Total scroll distance: predicted content height (wrapped lines, line spacing and
+            # buffer lines included) minus what is already visible
+            layout = self._lyrics_layout()
+            scroll_distance = max(0.0, layout.total_height - self._lyrics_viewport_height())
+            if profile:
+                # Only songs that already have a profile cache it; the rest keep following
+                # the current settings
+                song["display"] = dict(profile, song_length_rate={"key": rate_key, "max_offset": scroll_distance})
+                self._schedule_save(song_ids=(song["id"],))
+        
+        # Pixels per second needed to reach the end exactly at song_length_seconds
+        self.song_length_pixels_per_second = scroll_distance / self.song_length_seconds
+        self.scroll_engine.max_offset = scroll_distance
+        
+        # Speed multiplier shown in the UI (1x = 0.8 pixels per frame at 40fps = 32 pixels/second)
+        base_pixels_per_second = 32
+        self.scroll_speed = max(0.05, min(5.0, self.song_length_pixels_per_second / base_pixels_per_second))
+        self.scroll_engine.set_speed(self._scroll_pixels_per_second())
+
+    def _create_scroll_mode_controls(self):
+        """Mode switch, slider and disclaimer of the speed / song length column."""
+        return [
+            ft.Row([
+                ft.Text("Speed" if not self.use_song_length_mode else "Song Length", size=12),
+                ft.Switch(value=self.use_song_length_mode, on_change=self.toggle_scroll_mode, scale=0.8)
+            ], spacing=5, alignment=ft.MainAxisAlignment.CENTER),
+            self._create_scroll_slider(),
+            # Disclaimer for song length mode
+            ft.Text(
+                "*Song length scroll is a concept feature" if self.use_song_length_mode else "",
+                size=8,
+                color=ft.Colors.ORANGE_300,
+                text_align="center",
+                italic=True
+            ) if self.use_song_length_mode else ft.Container()
+        ]
 
     def _create_scroll_slider(self):
         """Creates the appropriate slider based on current mode."""
@@ -777,8 +1605,9 @@ class BetterLyricsApp:
             # Create a column with slider and time display
             current_time_text = self._format_time_compact(self.song_length_seconds)
             
+            self.scroll_value_text = ft.Text(current_time_text, size=10, text_align="center", color=ft.Colors.BLUE_400)
             return ft.Column([
-                ft.Text(current_time_text, size=10, text_align="center", color=ft.Colors.BLUE_400),
+                self.scroll_value_text,
                 ft.Slider(
                     min=15,
                     max=1200,  # 20 minutes = 1200 seconds
@@ -790,8 +1619,9 @@ class BetterLyricsApp:
                 )
             ], spacing=2, horizontal_alignment="center")
         else:
+            self.scroll_value_text = ft.Text(f"{self.scroll_speed:.1f}x", size=10, text_align="center", color=ft.Colors.GREEN_400)
             return ft.Column([
-                ft.Text(f"{self.scroll_speed:.1f}x", size=10, text_align="center", color=ft.Colors.GREEN_400),
+                self.scroll_value_text,
                 ft.Slider(
                     min=0.1,
                     max=5.0,  # Increased max to allow super fast speeds
@@ -840,6 +1670,9 @@ class BetterLyricsApp:
     def change_buffer_lines(self, e):
         """Updates the buffer lines and refreshes the lyrics display."""
         self.buffer_lines = int(e.control.value)
+        if self.use_song_length_mode:
+            self._calculate_optimal_scroll_speed()
+        self._save_display_profile()
         # Refresh the preview to show the new buffer
         self._refresh_preview_display(e.page)
         e.page.update()
@@ -848,62 +1681,224 @@ class BetterLyricsApp:
         """Refreshes the lyrics display with current buffer lines."""
         if self.is_preview_mode and self.lyrics_display_container:
             # Rebuild the lyrics with new buffer
-            lyrics_lines = self.formatted_lyrics.split('\n') if self.formatted_lyrics else [""]
-            buffer_lines = [" "] * self.buffer_lines
-            all_lines = buffer_lines + lyrics_lines
+            displayed = self._displayed_lyrics()
+            lyrics_lines = displayed.split('\n') if displayed else [""]
             
             # Update the ListView controls
-            self.lyrics_display_container.controls = [
-                ft.Text(
-                    line if line.strip() else " ",
-                    size=self.font_size,
+            self.lyrics_display_container.controls = self._build_lyric_controls(lyrics_lines)
+            self._start_progressive_render()
+
+    def _lyric_text_color(self):
+        """Returns the lyric text color for the current theme."""
+        return ft.Colors.WHITE if self.is_dark_mode else ft.Colors.BLACK
+
+    def _build_lyric_controls(self, lyrics_lines):
+        """Builds the lyric display controls (buffer lines + lyrics) for the preview ListView."""
+        self._render_generation += 1
+        line_spans = []
+        self.lyric_line_spans = line_spans
+        controls = self._iter_lyric_controls(lyrics_lines, line_spans)
+        if len(lyrics_lines) <= self.progressive_render_lines:
+            self._pending_lyric_controls = None
+            return list(controls)
+
+        # Show the first blocks now; _start_progressive_render appends the rest once they are displayed
+        self._pending_lyric_controls = (controls, self._render_generation)
+        return list(itertools.islice(controls, self.progressive_batch_blocks))
+
+    def _start_progressive_render(self):
+        """Starts appending the rest of a long preview, after the first blocks were put in the ListView."""
+        pending, self._pending_lyric_controls = self._pending_lyric_controls, None
+        if pending:
+            threading.Thread(target=self._render_remaining_lyrics, args=pending, daemon=True).start()
+
+    def _render_remaining_lyrics(self, remaining, generation):
+        """Appends the remaining lyric controls in batches, updating the ListView after each one."""
+        try:
+            with profiler.timer("preview.progressive_render"):
+                while generation == self._render_generation:
+                    batch = list(itertools.islice(remaining, self.progressive_batch_blocks))
+                    if not batch:
+                        break
+                    container = self.lyrics_display_container
+                    if container is None or generation != self._render_generation:
+                        break
+                    # ListView copies the list it is given, so append to its own one
+                    container.controls.extend(batch)
+                    if container.page:
+                        container.update()
+                    time.sleep(0.01)  # Let pending UI events through between batches
+            if generation == self._render_generation and self.scroll_engine.position() > 0:
+                # Offsets past the first batch were clamped; scroll back to where playback is
+                self.scroll_engine.resync()
+        except Exception as ex:
+            print(f"❌ Error rendering lyrics: {ex}")
+
+    def _create_lyric_controls(self, lyrics_lines, style=None):
+        """Creates lyric controls without touching the displayed song; returns (controls, line spans)."""
+        line_spans = []
+        return list(self._iter_lyric_controls(lyrics_lines, line_spans, style)), line_spans
+
+    def _iter_lyric_controls(self, lyrics_lines, line_spans, style=None):
+        """Yields the lyric controls in display order (in the current or given style), filling line_spans as blocks are built."""
+        style = style or self._lyric_style()
+        if not self.chunked_rendering:
+            # One bold, selectable Text per line
+            for line in itertools.chain([" "] * style.buffer_lines, lyrics_lines):
+                yield ft.Text(
+                    line if line.strip() else " ",  # Empty lines show as space
+                    size=style.font_size,
                     weight=ft.FontWeight.BOLD,
-                    color=ft.Colors.WHITE if self.is_dark_mode else ft.Colors.BLACK,
-                    text_align=self.text_alignment,
+                    color=self._lyric_text_color(),
+                    text_align=style.text_alignment,
                     selectable=True,
-                ) for line in all_lines
-            ]
+                )
+            return
+
+        if style.buffer_lines:
+            # All buffer lines in a single block of the same height
+            yield self._build_lyric_block([" "] * style.buffer_lines, line_spans, style, first_line=None)
+
+        for start, block_lines in self._split_lyric_blocks(lyrics_lines):
+            yield self._build_lyric_block(block_lines, line_spans, style, first_line=start)
+
+    def _split_lyric_blocks(self, lyrics_lines):
+        """Groups lines into stanza-sized blocks, yielding (first line index, lines)."""
+        block = []
+        start = 0
+        for index, line in enumerate(lyrics_lines):
+            if not block:
+                start = index
+            block.append(line)
+            # A blank line closes the stanza; long runs without blank lines are split too
+            if not line.strip() or len(block) >= self.max_lines_per_block:
+                yield start, block
+                block = []
+        if block:
+            yield start, block
+
+    def _build_lyric_block(self, block_lines, line_spans, style, first_line=None):
+        """Builds one Text control holding a block of lines, one span per line."""
+        text = ft.Text(
+            size=style.font_size,
+            weight=ft.FontWeight.BOLD,
+            color=self._lyric_text_color(),
+            text_align=style.text_alignment,
+            selectable=True,
+            style=ft.TextStyle(height=style.line_spacing),
+        )
+        spans = []
+        last = len(block_lines) - 1
+        for offset, line in enumerate(block_lines):
+            span = ft.TextSpan(
+                (line if line.strip() else " ") + ("\n" if offset < last else ""),
+                style=self._lyric_span_style(first_line is not None and first_line + offset == self.highlighted_line),
+            )
+            spans.append(span)
+            if first_line is not None:
+                line_spans.append((text, span))
+        text.spans = spans
+        return text
+
+    def _lyric_span_style(self, highlighted):
+        """Span style for a lyric line (highlighted lines get a marker color)."""
+        if highlighted:
+            return ft.TextStyle(color=ft.Colors.AMBER_400, bgcolor=ft.Colors.with_opacity(0.15, ft.Colors.AMBER_400))
+        return None
+
+    def _highlight_line(self, line_index):
+        """Highlights one lyric line, sending only the two spans whose style changed."""
+        with self._highlight_lock:
+            if not self.chunked_rendering or line_index == self.highlighted_line:
+                return
+            for index, highlighted in ((self.highlighted_line, False), (line_index, True)):
+                if index is not None and 0 <= index < len(self.lyric_line_spans):
+                    block, span = self.lyric_line_spans[index]
+                    span.style = self._lyric_span_style(highlighted)
+                    if block.page:
+                        span.update()
+            self.highlighted_line = line_index
+
+    def _on_scroll_state(self, state):
+        """ScrollEngine.on_state hook: moves the highlight on play / pause / seek and follows the scroll while playing."""
+        self._highlight_at_offset(state.offset)
+        self._highlight_stop.set()
+        if state.playing:
+            self._highlight_stop = threading.Event()
+            threading.Thread(target=self._follow_scroll_highlight, args=(self._highlight_stop,), daemon=True).start()
+
+    def _follow_scroll_highlight(self, stop):
+        """
+        Keeps the highlight on the line being read until the scroll pauses or
+        its state changes. In keyframe mode it moves once per keyframe, so
+        highlighting adds at most one small message per scroll message.
+        """
+        try:
+            while True:
+                interval = ScrollEngine.KEYFRAME_INTERVAL if self.scroll_engine.mode == "keyframe" else self.highlight_interval
+                if stop.wait(interval) or not self.scroll_engine.playing:
+                    return
+                self._highlight_at_offset(self.scroll_engine.position())
+        except Exception as ex:
+            print(f"❌ Error highlighting lyrics: {ex}")
+
+    def _highlight_at_offset(self, offset):
+        """Highlights the line being read at a scroll offset (only blocks whose highlight changed are sent)."""
+        if not self.chunked_rendering or not self.is_preview_mode:
+            return
+        layout = self._lyrics_layout()
+        if not layout.line_offsets:
+            return
+        # The reading line sits where the first lyric line starts, just below the buffer lines
+        self._highlight_line(line_at_offset(layout, offset + layout.line_offsets[0]))
+
+    def _scroll_pixels_per_second(self):
+        """Converts the speed multiplier to pixels per second."""
+        if self.use_song_length_mode and self.song_length_pixels_per_second is not None:
+            return self.song_length_pixels_per_second
+        # Slower, smoother scrolling: max(0.5, speed * 0.8) pixels per frame at 40 fps
+        return max(0.5, self.scroll_speed * 0.8) / ScrollEngine.FRAME_INTERVAL
+
+    def _send_scroll(self, offset, duration_ms):
+        """Sends one scroll command from the scroll engine to the lyrics ListView."""
+        container = self.lyrics_display_container
+        if not container or not container.page:
+            return
+        with profiler.timer("scroll.frame"):
+            if duration_ms:
+                container.scroll_to(offset=offset, duration=duration_ms, curve=ft.AnimationCurve.LINEAR)
+            else:
+                container.scroll_to(offset=offset, duration=0)
 
     def toggle_play_pause(self, e):
         """Toggles the auto-scroll play/pause state."""
-        import threading
-        import time
-        
         self.is_playing = not self.is_playing
         
         if self.is_playing:
-            # Start auto-scroll at fixed speed
-            def scroll_lyrics():
-                scroll_position = 0
-                while self.is_playing and self.lyrics_display_container:
-                    try:
-                        # Slower, smoother scrolling: even smaller increments
-                        scroll_increment = max(0.5, self.scroll_speed * 0.8)  # Much slower base speed
-                        scroll_position += scroll_increment
-                        
-                        # Update the scroll position of the ListView with no duration for instant updates
-                        self.lyrics_display_container.scroll_to(offset=scroll_position, duration=0)
-                        e.page.update()
-                        
-                        # Keep smooth 40 fps timing
-                        sleep_time = 0.025  # 40 fps base rate
-                        time.sleep(sleep_time)
-                    except Exception as ex:
-                        print(f"Scroll error: {ex}")
-                        break
-            
-            # Start scrolling in background thread
-            scroll_thread = threading.Thread(target=scroll_lyrics, daemon=True)
-            scroll_thread.start()
-            
-            self._show_message(e.page, "▶️ Auto-scroll started")
+            # Start auto-scroll from the current position in a background thread
+            self.scroll_engine.mode = self.scroll_sync_mode
+            self.scroll_engine.set_speed(self._scroll_pixels_per_second())
+            self.scroll_engine.play()
         else:
-            self._show_message(e.page, "⏸️ Auto-scroll paused")
+            self.scroll_engine.pause()
+            self._remember_scroll_position()
         
-        self._rebuild_ui(e.page)
+        # Only the button changes; the snack bar's page.update() sends it along
+        self._refresh_play_button()
+        self._show_message(e.page, "▶️ Auto-scroll started" if self.is_playing else "⏸️ Auto-scroll paused")
+
+    def _refresh_play_button(self):
+        """Shows Play or Pause on the play button for the current state."""
+        if self.play_button:
+            self.play_button.text = "⏸️ Pause" if self.is_playing else "▶️ Play"
+            self.play_button.icon = ft.Icons.PAUSE if self.is_playing else ft.Icons.PLAY_ARROW
 
     # --- Core Logic Methods ---
 
+    def clean_lyrics(self, text: str) -> str:
+        """Removes lines lyric sites add around the lyrics (see lyrics_cleanup.py)."""
+        return get_junk_filter(self.songs_directory).clean(text)
+
     def format_lyrics(self, text: str) -> str:
         """Cleans up lyrics text by trimming whitespace and normalizing line breaks."""
         if not text.strip():
@@ -928,26 +1923,28 @@ class BetterLyricsApp:
             self.page.update()
         
         def paste_and_parse(e):
-            try:
-                clipboard_text = pyclip.paste()
-                if clipboard_text.strip():
-                    self.lyrics_input.value = clipboard_text
-                    self.lyrics_input.update()
-                    
-                    # Try to parse title and artist
-                    title, artist = self._parse_title_artist_from_text(clipboard_text)
-                    message = f"🌟 Portal paste successful!"
-                    if title:
-                        message += f" Detected: '{title}'"
-                        if artist:
-                            message += f" by {artist}"
-                    
-                    self._show_message(self.page, message)
-                    close_portal(e)
-                else:
-                    self._show_message(self.page, "❌ Clipboard is empty - copy some text first!")
-            except Exception as ex:
-                self._show_message(self.page, f"❌ Error: {str(ex)}")
+            def apply(clipboard_text):
+                try:
+                    if clipboard_text.strip():
+                        self.lyrics_input.value = clipboard_text
+                        self.lyrics_input.update()
+                        
+                        # Try to parse title and artist
+                        title, artist = self._parse_title_artist_from_text(clipboard_text)
+                        message = f"🌟 Portal paste successful!"
+                        if title:
+                            message += f" Detected: '{title}'"
+                            if artist:
+                                message += f" by {artist}"
+                        
+                        self._show_message(self.page, message)
+                        close_portal(e)
+                    else:
+                        self._show_message(self.page, "❌ Clipboard is empty - copy some text first!")
+                except Exception as ex:
+                    self._show_message(self.page, f"❌ Error: {str(ex)}")
+            
+            self._paste_from_clipboard(self.page, apply)
         
         self.portal_dialog = ft.AlertDialog(
             modal=True,
@@ -1027,55 +2024,64 @@ class BetterLyricsApp:
         self.page.overlay.append(self.portal_dialog)
         self.page.update()
 
+    def _paste_from_clipboard(self, page, on_text):
+        """Read the clipboard without blocking the UI; on_text(text) runs when it arrives."""
+        def done(result):
+            on_text(result.text)
+            if result.truncated:
+                self._show_message(page, f"✂️ Paste cut to {len(result.text):,} of {result.original_length:,} characters")
+
+        self.clipboard.paste(done, lambda error: self._show_message(page, describe_error(error)))
+
     def smart_paste_lyrics(self, e):
         """Smart paste that also attempts to parse title/artist."""
-        try:
-            # Get clipboard content
-            clipboard_text = pyclip.paste()
-            if clipboard_text.strip():
-                # Set the lyrics
-                self.lyrics_input.value = clipboard_text
-                self.lyrics_input.update()
-                
-                # Try to parse title and artist
-                title, artist = self._parse_title_artist_from_text(clipboard_text)
-                message = f"📋 Lyrics pasted!"
-                if title:
-                    message += f" Detected: '{title}'"
-                    if artist:
-                        message += f" by {artist}"
-                    message += " - Use save button to store!"
+        def apply(clipboard_text):
+            try:
+                if clipboard_text.strip():
+                    # Set the lyrics
+                    self.lyrics_input.value = clipboard_text
+                    self.lyrics_input.update()
                     
-                self._show_message(e.page, message)
-                self.page.update()
-            else:
-                self._show_message(e.page, "❌ Clipboard is empty - copy some text first!")
-        except Exception as ex:
-            self._show_message(e.page, f"❌ Error pasting: {str(ex)}")
+                    # Try to parse title and artist
+                    title, artist = self._parse_title_artist_from_text(clipboard_text)
+                    message = f"📋 Lyrics pasted!"
+                    if title:
+                        message += f" Detected: '{title}'"
+                        if artist:
+                            message += f" by {artist}"
+                        message += " - Use save button to store!"
+                        
+                    self._show_message(e.page, message)
+                    self.page.update()
+                else:
+                    self._show_message(e.page, "❌ Clipboard is empty - copy some text first!")
+            except Exception as ex:
+                self._show_message(e.page, f"❌ Error pasting: {str(ex)}")
+
+        self._paste_from_clipboard(e.page, apply)
 
     def paste_lyrics(self, e):
         """Pastes lyrics from the system clipboard into the input field."""
-        try:
-            clipboard_content = pyclip.paste()
+        def apply(clipboard_content):
             if clipboard_content and self.lyrics_input:
                 self.lyrics_input.value = clipboard_content
                 self.lyrics_input.update()
                 self._show_message(e.page, "✨ Lyrics pasted successfully!")
             else:
                 self._show_message(e.page, "Clipboard is empty or input field is not available.")
-        except Exception:
-            self._show_message(e.page, "Could not paste lyrics. Please try Ctrl+V.")
+
+        self._paste_from_clipboard(e.page, apply)
 
     def copy_lyrics(self, e):
         """Copies the currently displayed lyrics to the system clipboard."""
         lyrics_to_copy = self.formatted_lyrics if self.is_preview_mode else (self.lyrics_input.value if self.lyrics_input else "")
         
         if lyrics_to_copy.strip():
-            try:
-                pyclip.copy(lyrics_to_copy)
-                self._show_message(e.page, "✨ Lyrics copied to clipboard!")
-            except Exception:
-                self._show_message(e.page, "Could not copy to clipboard.")
+            self.clipboard.copy(
+                lyrics_to_copy,
+                on_done=lambda _: self._show_message(e.page, "✨ Lyrics copied to clipboard!"),
+                on_error=lambda error: self._show_message(e.page, describe_error(error)),
+            )
         else:
             self._show_message(e.page, "There are no lyrics to copy.")
 
@@ -1085,9 +2091,15 @@ class BetterLyricsApp:
             self._show_message(e.page, "Please enter some lyrics first!")
             return
         
+        if len(self.lyrics_input.value) >= self.large_paste_chars:
+            self._transform_in_background(e.page, self.lyrics_input.value)
+            return
+        
+        self._transform_generation += 1
         self.original_lyrics = self.lyrics_input.value
-        self.formatted_lyrics = self.format_lyrics(self.original_lyrics)
+        self.formatted_lyrics = self.format_lyrics(self.clean_lyrics(self.original_lyrics))
         self.is_preview_mode = True
+        self.scroll_engine.seek(0)
         
         # If in song length mode, calculate optimal scroll speed
         if self.use_song_length_mode:
@@ -1096,6 +2108,32 @@ class BetterLyricsApp:
         self._rebuild_ui(e.page)
         self._show_message(e.page, "✨ Better Lyrics Enhanced View Activated!")
 
+    def _transform_in_background(self, page, text):
+        """Formats a very large paste on a worker thread, then switches to the preview."""
+        self._transform_generation += 1
+        generation = self._transform_generation
+        self._show_message(page, f"⏳ Formatting {len(text):,} characters...")
+
+        def worker():
+            try:
+                with profiler.timer("lyrics.format_large"):
+                    formatted = self.format_lyrics(self.clean_lyrics(text))
+                if generation != self._transform_generation:
+                    return  # Started over or transformed something else meanwhile
+                self.original_lyrics = text
+                self.formatted_lyrics = formatted
+                self.is_preview_mode = True
+                self.scroll_engine.seek(0)
+                if self.use_song_length_mode:
+                    self._calculate_optimal_scroll_speed()
+                self._rebuild_ui(page)
+                self._show_message(page, "✨ Better Lyrics Enhanced View Activated!")
+            except Exception as ex:
+                print(f"❌ Error formatting large paste: {ex}")
+                self._show_message(page, f"❌ Error formatting lyrics: {str(ex)}")
+
+        threading.Thread(target=worker, daemon=True).start()
+
     def _show_save_song_dialog(self, page):
         """Show dialog to save the current song to library."""
         print(f"🐛 DEBUG: is_preview_mode = {self.is_preview_mode}")
@@ -1138,11 +2176,14 @@ class BetterLyricsApp:
             if title_field.value and artist_field.value:
                 if self.current_song:
                     # Update existing song
-                    self.current_song["title"] = title_field.value
-                    self.current_song["artist"] = artist_field.value
-                    self.current_song["lyrics"] = self.formatted_lyrics
-                    self.current_song["original_lyrics"] = self.original_lyrics
-                    self._save_song_library()
+                    with self.library_lock:
+                        self.current_song["title"] = title_field.value
+                        self.current_song["artist"] = artist_field.value
+                        self.current_song["lyrics"] = self.formatted_lyrics
+                        self.current_song["original_lyrics"] = self.original_lyrics
+                        apply_sort_keys(self.current_song)
+                        self.song_index.update(self.current_song)
+                    self._save_song_library(self.current_song["id"])
                     self._show_message(page, f"💾 Updated: {self.current_song['title']} - {self.current_song['artist']}")
                 else:
                     # Save new song
@@ -1285,17 +2326,23 @@ class BetterLyricsApp:
         
         # Set the lyrics data for saving
         self.original_lyrics = self.lyrics_input.value
-        self.formatted_lyrics = self.format_lyrics(self.original_lyrics)
+        self.formatted_lyrics = self.format_lyrics(self.clean_lyrics(self.original_lyrics))
         
         # Show the save dialog
         self._show_save_song_dialog(page)
 
     def start_new_transformation(self, e):
         """Switches back to the edit mode, clearing the previous input."""
+        # Save where the song was left before the preview state is cleared
+        self._remember_scroll_position()
+        self._transform_generation += 1
         self.is_preview_mode = False
         self.original_lyrics = ""
         self.formatted_lyrics = ""
+        self.end_setlist()
         self.current_song = None  # Clear current song
+        self.scroll_engine.seek(0)
+        self.scroll_engine.set_elapsed(0.0)
         if self.lyrics_input:
             self.lyrics_input.value = ""
         self._rebuild_ui(e.page)
@@ -1324,7 +2371,7 @@ class BetterLyricsApp:
         playlist_tabs.append(
             ft.Tab(
                 text=f"📚 All Songs ({len(self.song_library)})",
-                content=self._build_song_list_view(self.song_library, sort_by="title", current_playlist="All Songs")
+                content=self._build_song_list_view(self.song_index.ordered("title"), current_playlist="All Songs")
             )
         )
         
@@ -1337,6 +2384,16 @@ class BetterLyricsApp:
             )
         )
         
+        # Smart playlist tabs (materialized views kept current by the song index)
+        for view in list(self.song_index.views.values()):
+            songs = self.song_index.view_songs(view.name)
+            playlist_tabs.append(
+                ft.Tab(
+                    text=f"{view.name} ({len(songs)})",
+                    content=self._build_smart_playlist_view(view, songs)
+                )
+            )
+        
         # Custom playlist tabs
         for playlist_name, song_ids in self.playlists.items():
             if playlist_name != "Favorites":  # Skip favorites as it's already added
@@ -1355,6 +2412,14 @@ class BetterLyricsApp:
             )
         )
         
+        # Stats tab
+        playlist_tabs.append(
+            ft.Tab(
+                text="📊 Stats",
+                content=self._build_stats_view()
+            )
+        )
+        
         tabs = ft.Tabs(
             selected_index=0,
             animation_duration=200,
@@ -1373,6 +2438,16 @@ class BetterLyricsApp:
                 icon=ft.Icons.PLAYLIST_ADD,
                 on_click=self._create_new_playlist
             ),
+            ft.ElevatedButton(
+                "✨ Smart Playlist",
+                icon=ft.Icons.AUTO_AWESOME,
+                on_click=self._create_smart_playlist
+            ),
+            ft.ElevatedButton(
+                "📥 Import .txt",
+                icon=ft.Icons.UPLOAD_FILE,
+                on_click=self._import_files_dialog
+            ),
             ft.ElevatedButton(
                 f"Clear All ({len(self.song_library)})",
                 icon=ft.Icons.DELETE_SWEEP,
@@ -1400,8 +2475,22 @@ class BetterLyricsApp:
             )
         ], expand=True, spacing=15)
 
-    def _build_song_list_view(self, songs, sort_by="recent", current_playlist=None):
-        """Build a scrollable list of songs."""
+    def _build_smart_playlist_view(self, view, songs):
+        """Build a smart playlist tab: its rule and the songs it currently holds."""
+        return ft.Column([
+            ft.Row([
+                ft.Text(f"✨ {view.describe()}", size=13, color=ft.Colors.GREY_500),
+                ft.TextButton(
+                    "🗑️ Delete",
+                    on_click=lambda e, name=view.name: self._delete_smart_playlist(name, e.page),
+                    style=ft.ButtonStyle(color=ft.Colors.RED_400)
+                ),
+            ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
+            self._build_song_list_view(songs),
+        ], expand=True, spacing=5)
+
+    def _build_song_list_view(self, songs, current_playlist=None):
+        """Build a scrollable list of songs (already ordered by the song index)."""
         if not songs:
             return ft.Container(
                 content=ft.Column([
@@ -1413,19 +2502,83 @@ class BetterLyricsApp:
             )
 
         song_items = []
-        # Sort songs based on sort_by parameter
-        if sort_by == "title":
-            sorted_songs = sorted(songs, key=lambda x: x.get("title", "").lower())
-        elif sort_by == "artist":
-            sorted_songs = sorted(songs, key=lambda x: x.get("artist", "").lower())
-        else:  # recent
-            sorted_songs = sorted(songs, key=lambda x: x.get("last_played", ""), reverse=True)
-        
-        for song in sorted_songs:
+        for song in songs:
             song_items.append(self._create_song_item(song, show_artist=True, current_playlist=current_playlist))
 
         return ft.ListView(controls=song_items, expand=True, spacing=5)
 
+    def _build_stats_view(self):
+        """Build the play statistics view from the play log's rollups (no file access on the UI thread)."""
+        summary = self.play_history.summary()
+        if not summary["total"]:
+            return ft.Container(
+                content=ft.Column([
+                    ft.Text("📭 No plays yet!", size=20, text_align="center"),
+                    ft.Text("Load songs from the library to build your play history", text_align="center", color=ft.Colors.GREY_500)
+                ], horizontal_alignment="center"),
+                alignment=ft.alignment.center,
+                expand=True
+            )
+
+        def count_rows(entries, label):
+            return [
+                ft.Row([
+                    ft.Text(f"{rank}. {label(key)}", size=14, expand=True),
+                    ft.Text(f"{plays} plays", size=12, color=ft.Colors.GREY_500)
+                ])
+                for rank, (key, plays) in enumerate(entries, 1)
+            ] or [ft.Text("No plays yet", size=12, color=ft.Colors.GREY_500)]
+
+        def song_label(song_id):
+            song = self._get_song_by_id(song_id)
+            return f"{song['title']} - {song['artist']}" if song else "(deleted song)"
+
+        def heading(text):
+            return ft.Text(text, size=16, weight=ft.FontWeight.BOLD, color=ft.Colors.BLUE_400)
+
+        # Plays per day for the last two weeks as a small bar chart
+        peak = max(plays for _, plays in summary["recent_days"]) or 1
+        day_bars = ft.Row(
+            [
+                ft.Column([
+                    ft.Container(
+                        width=22,
+                        height=4 + 76 * plays / peak,
+                        bgcolor=ft.Colors.BLUE_400 if plays else ft.Colors.GREY_400,
+                        border_radius=3,
+                        tooltip=f"{day:%a %b %d}: {plays} plays",
+                    ),
+                    ft.Text(day.strftime("%d"), size=9, color=ft.Colors.GREY_500),
+                ], spacing=2, alignment=ft.MainAxisAlignment.END, horizontal_alignment="center")
+                for day, plays in summary["recent_days"]
+            ],
+            spacing=6,
+            alignment=ft.MainAxisAlignment.CENTER,
+            vertical_alignment=ft.CrossAxisAlignment.END,
+        )
+
+        return ft.ListView(
+            controls=[
+                ft.Row([
+                    ft.Text(f"▶️ {summary['total']} plays", size=14),
+                    ft.Text(f"🎵 {summary['songs_played']} songs played", size=14),
+                    ft.Text(f"🔥 {summary['current_streak']}-day streak", size=14),
+                    ft.Text(f"🏆 Longest streak: {summary['longest_streak']} days", size=14),
+                ], spacing=20, alignment=ft.MainAxisAlignment.CENTER),
+                heading("📅 Last 14 days"),
+                day_bars,
+                heading("🗓️ Most played this month"),
+                *count_rows(summary["month"], song_label),
+                heading("🎤 Top artists"),
+                *count_rows(summary["artists"], lambda artist: artist),
+                heading("⭐ Most played all time"),
+                *count_rows(summary["all_time"], song_label),
+            ],
+            expand=True,
+            spacing=8,
+            padding=10,
+        )
+
     def _build_artist_grouped_view(self):
         """Build a view grouped by artist."""
         if not self.song_library:
@@ -1438,22 +2591,19 @@ class BetterLyricsApp:
                 expand=True
             )
 
-        # Group songs by artist
+        # Group songs by artist - the artist order is already sorted by (artist, title),
+        # so each artist's songs form one consecutive run. Grouping on the collation key
+        # merges spelling variants ("Beyoncé"/"beyonce", "The Weeknd"/"Weeknd").
         artists = {}
-        for song in self.song_library:
-            artist = song.get("artist", "Unknown Artist").strip()
-            if not artist:
-                artist = "Unknown Artist"
-            if artist not in artists:
-                artists[artist] = []
-            artists[artist].append(song)
-
-        # Sort artists alphabetically
-        sorted_artists = sorted(artists.keys(), key=str.lower)
+        for song in self.song_index.ordered("artist"):
+            group_key = collation_group(song["sort_artist"])
+            if group_key not in artists:
+                artist = song.get("artist", "").strip() or "Unknown Artist"
+                artists[group_key] = (artist, [])
+            artists[group_key][1].append(song)
 
         artist_groups = []
-        for artist in sorted_artists:
-            songs = sorted(artists[artist], key=lambda x: x.get("title", "").lower())
+        for artist, songs in artists.values():
             
             # Create artist header
             artist_groups.append(
@@ -1478,10 +2628,10 @@ class BetterLyricsApp:
     def _build_playlist_view(self, playlist_name):
         """Build a playlist view."""
         song_ids = self.playlists.get(playlist_name, [])
-        songs = [self._get_song_by_id(sid) for sid in song_ids if self._get_song_by_id(sid)]
+        songs = self.song_index.ordered("title", song_ids)
         
         # Create song list
-        song_list = self._build_song_list_view(songs, sort_by="title", current_playlist=playlist_name)
+        song_list = self._build_song_list_view(songs, current_playlist=playlist_name)
         
         # Add playlist management header (except for special playlists)
         if playlist_name not in ["Favorites", "All Songs", "By Artist"]:
@@ -1490,6 +2640,12 @@ class BetterLyricsApp:
                     ft.Text(f"🎵 {playlist_name}", size=18, weight=ft.FontWeight.BOLD),
                     ft.Row([
                         ft.Text(f"{len(songs)} songs", size=12, color=ft.Colors.GREY_500),
+                        ft.IconButton(
+                            icon=ft.Icons.PLAYLIST_PLAY,
+                            icon_color=ft.Colors.GREEN_400,
+                            tooltip=f"Play '{playlist_name}' as a setlist",
+                            on_click=lambda e: self.start_setlist(playlist_name, e.page)
+                        ),
                         ft.IconButton(
                             icon=ft.Icons.DELETE_OUTLINE,
                             icon_color=ft.Colors.RED_400,
@@ -1519,7 +2675,7 @@ class BetterLyricsApp:
         date_text = ""
         if last_played:
             try:
-                date_obj = datetime.fromisoformat(last_played.replace('Z', '+00:00'))
+                date_obj = datetime.fromtimestamp(last_played)
                 date_text = date_obj.strftime("%m/%d %H:%M")
             except:
                 date_text = "Recently"
@@ -1646,10 +2802,11 @@ class BetterLyricsApp:
         
         def confirm_clear(e):
             # Clear data
-            self.song_library = []
-            self.playlists = {"Favorites": []}
+            with self.library_lock:
+                self.song_library = []
+                self.song_index.rebuild([])
+                self.playlists = PlaylistIndex({"Favorites": []})
             self._save_song_library()
-            self._save_playlists()
             
             # Close dialog first  
             dialog.open = False
@@ -1683,7 +2840,7 @@ class BetterLyricsApp:
         """Builds and displays the UI based on the current mode."""
         page.title = "Better Lyrics"
         page.theme_mode = ft.ThemeMode.DARK if self.is_dark_mode else ft.ThemeMode.LIGHT
-        page.padding = 5  # Much smaller padding so content reaches edges
+        page.padding = self.page_padding  # Much smaller padding so content reaches edges
         page.vertical_alignment = ft.MainAxisAlignment.START
         page.horizontal_alignment = ft.CrossAxisAlignment.STRETCH # Stretch content horizontally
         
@@ -1692,7 +2849,9 @@ class BetterLyricsApp:
 
         # Choose which UI to show
         if self.show_library:
-            main_content = self._build_library_ui()
+            # The background sync may be merging other windows' changes meanwhile
+            with self.library_lock:
+                main_content = self._build_library_ui()
         elif self.is_preview_mode:
             main_content = self._build_preview_mode_ui()
         else:
@@ -1701,16 +2860,15 @@ class BetterLyricsApp:
         # Navigation buttons
         nav_buttons = []
         
-        # Library button (always visible)
-        library_text = f"🎵 Library ({len(self.song_library)})" if self.song_library else "🎵 Library"
-        nav_buttons.append(
-            ft.ElevatedButton(
-                library_text,
-                icon=ft.Icons.LIBRARY_MUSIC,
-                on_click=self.toggle_library_view,
-                style=ft.ButtonStyle(bgcolor=ft.Colors.BLUE_100 if self.show_library else None)
-            )
+        # Library button (always visible, disabled while the library loads)
+        self.library_button = ft.ElevatedButton(
+            self._library_button_text(),
+            icon=ft.Icons.LIBRARY_MUSIC,
+            on_click=self.toggle_library_view,
+            disabled=not self.library_loaded.is_set(),
+            style=ft.ButtonStyle(bgcolor=ft.Colors.BLUE_100 if self.show_library else None)
         )
+        nav_buttons.append(self.library_button)
         
         # Theme button
         self.theme_button = ft.ElevatedButton(
@@ -1762,10 +2920,10 @@ class BetterLyricsApp:
             ft.Container(
                 content=main_content,
                 expand=True,
-                padding=ft.padding.only(top=100)  # Increased to clear logo overlay (80px height + 20px buffer)
+                padding=ft.padding.only(top=self.logo_clearance)  # Clears the logo overlay
             ),
-            ft.Row(nav_buttons, alignment=ft.MainAxisAlignment.CENTER, spacing=20)
-        ], expand=True)
+            ft.Row(nav_buttons, alignment=ft.MainAxisAlignment.CENTER, spacing=20, height=self.button_row_height)
+        ], expand=True, spacing=self.column_spacing)
 
         # Create logo overlay (snug to top-left)
         logo_overlay = ft.Container(
@@ -1779,12 +2937,56 @@ class BetterLyricsApp:
             top=10,    # Slightly more space from top edge
         )
 
+        stack_controls = [
+            main_ui_content,  # Main content underneath
+            logo_overlay,     # Logo overlay on top
+        ]
+        if profiler.enabled:
+            stack_controls.append(self._build_debug_overlay())
+
         # Use Stack to overlay logo on top of main content
-        page.add(
-            ft.Stack([
-                main_ui_content,  # Main content underneath
-                logo_overlay,     # Logo overlay on top
-            ], expand=True)
+        page.add(ft.Stack(stack_controls, expand=True))
+
+    def _build_debug_overlay(self):
+        """Builds the timing overlay (frame time, updates/s, save latency) and starts its refresh thread."""
+        self.debug_overlay_text = ft.Text(
+            profiler.overlay_text(),
+            size=10,
+            color=ft.Colors.GREEN_300,
+            font_family="monospace"
+        )
+
+        if self._debug_overlay_thread is None:
+            def refresh_overlay():
+                while True:
+                    time.sleep(1.0)
+                    try:
+                        text = self.debug_overlay_text
+                        if text is not None and text.page:
+                            text.value = profiler.overlay_text()
+                            # Don't count the overlay's own refresh in the updates/s it shows
+                            with profiler.untracked():
+                                text.update()
+                    except Exception as ex:
+                        print(f"Debug overlay error: {ex}")
+
+            self._debug_overlay_thread = threading.Thread(target=refresh_overlay, daemon=True)
+            self._debug_overlay_thread.start()
+
+        def dump_profile(e):
+            path = profiler.dump()
+            self._show_message(e.page, f"📊 Session profile saved to {path}")
+
+        return ft.Container(
+            content=ft.Row([
+                self.debug_overlay_text,
+                ft.IconButton(icon=ft.Icons.SAVE_ALT, icon_size=14, tooltip="Dump session profile", on_click=dump_profile)
+            ], spacing=4, tight=True),
+            right=10,
+            bottom=50,
+            bgcolor=ft.Colors.with_opacity(0.7, ft.Colors.BLACK),
+            border_radius=6,
+            padding=ft.padding.symmetric(horizontal=8, vertical=2),
         )
 
     def _build_edit_mode_ui(self) -> ft.Column:
@@ -1827,37 +3029,86 @@ class BetterLyricsApp:
     def _build_preview_mode_ui(self) -> ft.Column:
         """Builds the UI for displaying and customizing the formatted lyrics."""
         
-        # Split lyrics into lines for ListView
-        lyrics_lines = self.formatted_lyrics.split('\n') if self.formatted_lyrics else [""]
+        # Split lyrics into lines for ListView (repeats as references when collapsed)
+        displayed = self._displayed_lyrics()
+        lyrics_lines = displayed.split('\n') if displayed else [""]
         
-        # Add buffer lines at the top (empty lines for smooth start)
-        buffer_lines = [" "] * self.buffer_lines
-        all_lines = buffer_lines + lyrics_lines
-        
-        # Create ListView with buffer + lyrics
+        # Create ListView with buffer lines at the top (empty lines for smooth start) + lyrics
         self.lyrics_display_container = ft.ListView(
-            controls=[
-                ft.Text(
-                    line if line.strip() else " ",  # Empty lines show as space
-                    size=self.font_size,
-                    weight=ft.FontWeight.BOLD,
-                    color=ft.Colors.WHITE if self.is_dark_mode else ft.Colors.BLACK,
-                    text_align=self.text_alignment,
-                    selectable=True,
-                ) for line in all_lines
-            ],
+            controls=self._build_lyric_controls(lyrics_lines),
             expand=1,
             spacing=5,
             padding=ft.padding.all(15),
             auto_scroll=False,
         )
-        
+        self._start_progressive_render()
+        
+        # Song header controls (kept so setlist transitions can update them in place)
+        is_favorite = bool(self.current_song and self.current_song.get("is_favorite"))
+        self.song_title_text = ft.Text(
+            f"🎵 {self.current_song['title']} - {self.current_song['artist']}" if self.current_song else "",
+            size=18,
+            weight=ft.FontWeight.BOLD,
+            color=ft.Colors.BLUE_400 if self.current_song else ft.Colors.ORANGE_400,
+            text_align=ft.TextAlign.CENTER
+        )
+        self.song_favorite_icon = ft.Icon(ft.Icons.FAVORITE, color=ft.Colors.RED_400, size=16, visible=is_favorite)
+        self.song_stats_text = ft.Text(f"♪ Played {self.current_song.get('play_count', 0)} times" if self.current_song else "", size=12, color=ft.Colors.GREY_500)
+        self.setlist_status_text = ft.Text(self._setlist_status(), size=12, color=ft.Colors.PURPLE_300, visible=bool(self.setlist))
+        self.favorite_button = ft.ElevatedButton(
+            "⭐ Unfavorite" if is_favorite else "⭐ Favorite",
+            icon=ft.Icons.FAVORITE if is_favorite else ft.Icons.FAVORITE_BORDER,
+            on_click=self._toggle_current_favorite,
+            style=ft.ButtonStyle(bgcolor=ft.Colors.RED_100 if is_favorite else None)
+        )
+
+        self.play_button = ft.ElevatedButton(
+            on_click=self.toggle_play_pause,
+            style=ft.ButtonStyle(bgcolor=ft.Colors.GREEN_100 if not self.is_dark_mode else ft.Colors.GREEN_900)
+        )
+        self._refresh_play_button()
+
+        # Setlist navigation (only while a setlist is running)
+        setlist_buttons = [
+            ft.ElevatedButton("⏮️ Prev Song", icon=ft.Icons.SKIP_PREVIOUS, on_click=self.previous_setlist_song),
+            ft.ElevatedButton("Next Song ⏭️", icon=ft.Icons.SKIP_NEXT, on_click=self.next_setlist_song,
+                              style=ft.ButtonStyle(bgcolor=ft.Colors.PURPLE_100 if not self.is_dark_mode else ft.Colors.PURPLE_900)),
+            ft.TextButton("✖ End Setlist", on_click=self.end_setlist),
+        ] if self.setlist else []
+
+        # Speed / song length controls (swapped in place when the mode changes)
+        self.scroll_mode_column = ft.Column(self._create_scroll_mode_controls(), horizontal_alignment="center", spacing=5)
+
+        # Display setting controls (kept so setlist transitions can show the next song's profile)
+        self.alignment_buttons = [
+            ft.IconButton(icon=icon, tooltip=tooltip, on_click=self.change_alignment, data=alignment, icon_size=18,
+                          selected=alignment == self.text_alignment, selected_icon_color=ft.Colors.BLUE_400)
+            for icon, tooltip, alignment in (
+                (ft.Icons.FORMAT_ALIGN_LEFT, "Left", ft.TextAlign.LEFT),
+                (ft.Icons.FORMAT_ALIGN_CENTER, "Center", ft.TextAlign.CENTER),
+                (ft.Icons.FORMAT_ALIGN_RIGHT, "Right", ft.TextAlign.RIGHT),
+            )
+        ]
+        self.font_size_slider = ft.Slider(min=14, max=60, value=self.font_size, divisions=46, on_change=self.change_font_size, width=120, height=30)
+        self.buffer_lines_slider = ft.Slider(min=4, max=48, value=self.buffer_lines, divisions=44, on_change=self.change_buffer_lines, width=120, height=30)
+
+        # Jump bar: one button per [Verse 1] / [Chorus] tag (hidden for untagged lyrics)
+        section_buttons = self._build_section_buttons()
+        self.section_bar = ft.Row(
+            section_buttons,
+            height=self.section_bar_height,
+            spacing=6,
+            scroll=ft.ScrollMode.AUTO,
+            alignment=ft.MainAxisAlignment.CENTER,
+            visible=bool(section_buttons),
+        )
+
         # Container to hold the ListView
         lyrics_container = ft.Container(
             content=self.lyrics_display_container,
             bgcolor=ft.Colors.BLACK if self.is_dark_mode else ft.Colors.WHITE,
             border_radius=10,
-            border=ft.border.all(2, ft.Colors.WHITE30 if self.is_dark_mode else ft.Colors.BLACK38),
+            border=ft.border.all(self.lyrics_border_width, ft.Colors.WHITE30 if self.is_dark_mode else ft.Colors.BLACK38),
             expand=True,
             margin=ft.margin.all(0),
         )
@@ -1873,18 +3124,13 @@ class BetterLyricsApp:
                         ft.Container(
                             content=ft.Column([
                                 # Current song info
-                                ft.Text(
-                                    f"🎵 {self.current_song['title']} - {self.current_song['artist']}" if self.current_song else "",
-                                    size=18,
-                                    weight=ft.FontWeight.BOLD,
-                                    color=ft.Colors.BLUE_400 if self.current_song else ft.Colors.ORANGE_400,
-                                    text_align=ft.TextAlign.CENTER
-                                ),
+                                self.song_title_text,
                                 # Favorite indicator - centered
                                 ft.Row([
-                                    ft.Icon(ft.Icons.FAVORITE, color=ft.Colors.RED_400, size=16) if self.current_song and self.current_song.get("is_favorite") else ft.Container(),
-                                    ft.Text(f"♪ Played {self.current_song.get('play_count', 0)} times" if self.current_song else "", size=12, color=ft.Colors.GREY_500)
-                                ], spacing=5, alignment=ft.MainAxisAlignment.CENTER) if self.current_song else ft.Container()
+                                    self.song_favorite_icon,
+                                    self.song_stats_text
+                                ], spacing=5, alignment=ft.MainAxisAlignment.CENTER) if self.current_song else ft.Container(),
+                                self.setlist_status_text
                             ], spacing=5, horizontal_alignment=ft.CrossAxisAlignment.CENTER),
                             expand=True
                         ),
@@ -1896,7 +3142,7 @@ class BetterLyricsApp:
                                     ft.Text(
                                         "Ask AI (ChatGPT/Gemini) to organize your lyrics:\n"
                                         "[Verse 1] / [Chorus] / [Verse 2]\n"
-                                        "Much better viewing experience!",
+                                        "Tags become jump buttons above the lyrics!",
                                         size=9,
                                         color=ft.Colors.GREY_600,
                                         text_align="left"
@@ -1913,8 +3159,10 @@ class BetterLyricsApp:
                         )
                     ],
                     alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
-                    vertical_alignment=ft.CrossAxisAlignment.START
+                    vertical_alignment=ft.CrossAxisAlignment.START,
+                    height=self.preview_header_height
                 ),
+                self.section_bar,
                 lyrics_container,
                 # Single row controls - Viva Video style
                 ft.Row(
@@ -1922,72 +3170,53 @@ class BetterLyricsApp:
                         # Alignment controls
                         ft.Column([
                             ft.Text("Alignment", size=12, text_align="center"),
-                            ft.Row([
-                                ft.IconButton(icon=ft.Icons.FORMAT_ALIGN_LEFT, tooltip="Left", on_click=self.change_alignment, data=ft.TextAlign.LEFT, icon_size=18),
-                                ft.IconButton(icon=ft.Icons.FORMAT_ALIGN_CENTER, tooltip="Center", on_click=self.change_alignment, data=ft.TextAlign.CENTER, icon_size=18),
-                                ft.IconButton(icon=ft.Icons.FORMAT_ALIGN_RIGHT, tooltip="Right", on_click=self.change_alignment, data=ft.TextAlign.RIGHT, icon_size=18),
-                            ], spacing=2)
+                            ft.Row(self.alignment_buttons, spacing=2)
                         ], horizontal_alignment="center", spacing=5),
                         
                         # Font Size
                         ft.Column([
                             ft.Text("Font Size", size=12, text_align="center"),
-                            ft.Slider(min=14, max=60, value=self.font_size, divisions=46, on_change=self.change_font_size, width=120, height=30)
+                            self.font_size_slider
                         ], horizontal_alignment="center", spacing=5),
                         
                         # Buffer Lines
                         ft.Column([
                             ft.Text("Buffer Lines", size=12, text_align="center"),
-                            ft.Slider(min=4, max=48, value=self.buffer_lines, divisions=44, on_change=self.change_buffer_lines, width=120, height=30)
+                            self.buffer_lines_slider
                         ], horizontal_alignment="center", spacing=5),
                         
                         # Speed/Song Length Toggle
+                        self.scroll_mode_column,
+
+                        # Collapsed chorus preview
                         ft.Column([
-                            ft.Row([
-                                ft.Text("Speed" if not self.use_song_length_mode else "Song Length", size=12),
-                                ft.Switch(value=self.use_song_length_mode, on_change=self.toggle_scroll_mode, scale=0.8)
-                            ], spacing=5, alignment=ft.MainAxisAlignment.CENTER),
-                            self._create_scroll_slider(),
-                            # Disclaimer for song length mode
-                            ft.Text(
-                                "*Song length scroll is a concept feature" if self.use_song_length_mode else "",
-                                size=8,
-                                color=ft.Colors.ORANGE_300,
-                                text_align="center",
-                                italic=True
-                            ) if self.use_song_length_mode else ft.Container()
+                            ft.Text("Collapse Repeats", size=12, text_align="center"),
+                            ft.Switch(value=self.collapse_repeats, on_change=self.toggle_collapse_repeats, scale=0.8)
                         ], horizontal_alignment="center", spacing=5),
                     ],
                     alignment=ft.MainAxisAlignment.SPACE_EVENLY,
+                    vertical_alignment=ft.CrossAxisAlignment.START,
                     spacing=20,
                     wrap=False,
+                    height=self.preview_controls_height,
                 ),
                 # Action buttons row
                 ft.Row(
                     [
                         ft.ElevatedButton("📄 Start New", icon=ft.Icons.REFRESH, on_click=self.start_new_transformation),
                         ft.ElevatedButton("📋 Copy Lyrics", icon=ft.Icons.COPY, on_click=self.copy_lyrics),
+                        ft.ElevatedButton("⏮️ Restart", icon=ft.Icons.SKIP_PREVIOUS, on_click=self.restart_scroll),
                         # Favorite button (always available)
-                        ft.ElevatedButton(
-                            "⭐ Unfavorite" if self.current_song and self.current_song.get("is_favorite") else "⭐ Favorite",
-                            icon=ft.Icons.FAVORITE if self.current_song and self.current_song.get("is_favorite") else ft.Icons.FAVORITE_BORDER,
-                            on_click=self._toggle_current_favorite,
-                            style=ft.ButtonStyle(bgcolor=ft.Colors.RED_100 if self.current_song and self.current_song.get("is_favorite") else None)
-                        ),
-                        ft.ElevatedButton(
-                            "▶️ Play" if not self.is_playing else "⏸️ Pause",
-                            icon=ft.Icons.PLAY_ARROW if not self.is_playing else ft.Icons.PAUSE,
-                            on_click=self.toggle_play_pause,
-                            style=ft.ButtonStyle(bgcolor=ft.Colors.GREEN_100 if not self.is_dark_mode else ft.Colors.GREEN_900)
-                        ),
-                    ],
+                        self.favorite_button,
+                        self.play_button,
+                    ] + setlist_buttons,
                     alignment=ft.MainAxisAlignment.CENTER,
                     spacing=15,
                     wrap=True
                 ),
             ],
             expand=True,
-            spacing=15,
+            spacing=self.preview_spacing,
             horizontal_alignment=ft.CrossAxisAlignment.CENTER
         )
 
@@ -2004,8 +3233,13 @@ def main(page: ft.Page):
     page.window.resizable = True
     page.window.maximizable = True
     
+    # Time every page.update() round-trip when profiling is enabled
+    profiler.instrument_page(page)
+    
     app = BetterLyricsApp()
+    # Draw the edit screen first, read the library behind it
     app.build_ui(page)
+    app.start_library_load(page)
 
 
 if __name__ == "__main__":
@@ -1,13 +1,21 @@
 import flet as ft
-import pyperclip as pyclip # type: ignore
-import json
 import os
 import re
 import threading
 import time
 import traceback
-from datetime import datetime
 import uuid
+from collections import deque
+
+from clipboard import Clipboard, describe_error
+from library_service import LIBRARY_TOPIC, get_library_service
+from lyrics_cleanup import get_junk_filter
+from scroll_engine import LINE_SYNC_INTERVAL, ScrollEngine, from_line_state, to_line_state
+from song_library import Song
+from text_layout import DEFAULT_LINE_HEIGHT, estimate_layout, line_position
+
+# Topic the broadcast teleprompter uses between sessions (page.pubsub)
+TELEPROMPTER_TOPIC = "teleprompter"
 
 
 class BetterLyricsMobile:
@@ -22,18 +30,19 @@ class BetterLyricsMobile:
         self.original_lyrics = ""
         self.formatted_lyrics = ""
         self.current_song = None
+        self.clipboard = Clipboard()  # Off-thread, with a timeout
 
         # --- Song Library Management ---
+        # Shared by every session in the process: the files are parsed once, not per browser tab
         self.songs_directory = "saved_songs"
-        if not os.path.exists(self.songs_directory):
-            os.makedirs(self.songs_directory)
-        
-        self.songs_file = os.path.join(self.songs_directory, "songs_library.json")
-        self.playlists_file = os.path.join(self.songs_directory, "playlists.json")
-        self.song_library = self._load_song_library()
-        self.playlists = self._load_playlists()
+        self.library = get_library_service(self.songs_directory)
         self.current_playlist = None
-        self.show_library = False
+        self.is_library_view = False  # Not "show_library": that name is the button handler
+
+        # --- Live Library Updates (server mode) ---
+        self.library_list = None     # ListView of the open library view
+        self._song_tiles = {}        # song id -> ListTile in library_list
+        self._library_version = 0    # snapshot version the library view shows
 
         # --- Auto-scroll Properties (Mobile optimized) ---
         self.is_playing = False
@@ -41,6 +50,20 @@ class BetterLyricsMobile:
         self.buffer_lines = 2  # Reduced for mobile
         self.song_length_seconds = 180
         self.use_song_length_mode = False
+        self.scroll_engine = ScrollEngine(self._send_scroll)
+        self.scroll_engine.on_state = self._broadcast_scroll_state
+
+        # --- Broadcast Teleprompter (server mode) ---
+        # One session leads (play/pause/speed/seek), followers extrapolate its timeline. States
+        # travel as lyric lines (LineState), since every device wraps the lyrics differently
+        self.session_id = uuid.uuid4().hex[:8]
+        self.broadcast_role = None      # None, "leader" or "follower"
+        self.following = None           # session id of the leader being followed
+        self._broadcast_seq = 0
+        self._last_state_seq = 0
+        self._heartbeat_generation = 0  # Bumped to stop the leader's re-broadcast loop
+        self.follow_latency_ms = deque(maxlen=50)  # state message delivery times seen as a follower
+        self.follow_drift_lines = deque(maxlen=50)  # follower position vs the leader's, in lines
 
         # --- Mobile-specific Properties ---
         self.is_portrait = True
@@ -53,48 +76,21 @@ class BetterLyricsMobile:
         self.main_container = None
         self.lyrics_display = None
         self.lyrics_input = None
-
-    def _load_song_library(self):
-        """Load the song library from JSON file"""
-        try:
-            if os.path.exists(self.songs_file):
-                with open(self.songs_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            return {}
-        except Exception as e:
-            print(f"❌ Error loading song library: {e}")
-            return {}
-
-    def _load_playlists(self):
-        """Load playlists from JSON file"""
-        try:
-            if os.path.exists(self.playlists_file):
-                with open(self.playlists_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            return {}
-        except Exception as e:
-            print(f"❌ Error loading playlists: {e}")
-            return {}
-
-    def _save_song_library(self):
-        """Save the song library to JSON file"""
-        try:
-            with open(self.songs_file, 'w', encoding='utf-8') as f:
-                json.dump(self.song_library, f, indent=2, ensure_ascii=False)
-            return True
-        except Exception as e:
-            print(f"❌ Error saving song library: {e}")
-            return False
-
-    def _save_playlists(self):
-        """Save playlists to JSON file"""
-        try:
-            with open(self.playlists_file, 'w', encoding='utf-8') as f:
-                json.dump(self.playlists, f, indent=2, ensure_ascii=False)
-            return True
-        except Exception as e:
-            print(f"❌ Error saving playlists: {e}")
-            return False
+        self.lyrics_list = None
+        self.play_button = None
+        self.speed_text = None
+        self.broadcast_button = None
+        self.broadcast_status_text = None
+
+    @property
+    def song_library(self):
+        """Songs of the current shared library snapshot (id -> Song, read-only)"""
+        return self.library.snapshot().songs
+
+    @property
+    def playlists(self):
+        """Playlists of the current shared library snapshot (name -> song ids, read-only)"""
+        return self.library.snapshot().playlists
 
     def format_lyrics(self, lyrics_text):
         """Format lyrics for mobile display with better spacing"""
@@ -119,19 +115,22 @@ class BetterLyricsMobile:
 
     def paste_from_clipboard(self, e):
         """Paste text from clipboard (mobile-friendly)"""
-        try:
-            clipboard_text = pyclip.paste()
+        def done(result):
+            clipboard_text = result.text
             if clipboard_text:
                 self.original_lyrics = clipboard_text
                 self.lyrics_input.value = clipboard_text
                 self.page.update()
                 
                 # Show a brief success message
-                self.show_snackbar("📋 Lyrics pasted!", ft.Colors.GREEN)
+                if result.truncated:
+                    self.show_snackbar(f"✂️ Pasted the first {len(clipboard_text):,} characters", ft.Colors.AMBER)
+                else:
+                    self.show_snackbar("📋 Lyrics pasted!", ft.Colors.GREEN)
             else:
                 self.show_snackbar("📋 Clipboard is empty", ft.Colors.AMBER)
-        except Exception as ex:
-            self.show_snackbar(f"❌ Paste failed: {str(ex)}", ft.Colors.RED)
+
+        self.clipboard.paste(done, lambda error: self.show_snackbar(describe_error(error), ft.Colors.RED))
 
     def show_snackbar(self, message, color=ft.Colors.BLUE):
         """Show a mobile-friendly snackbar message"""
@@ -153,11 +152,12 @@ class BetterLyricsMobile:
             return
         
         self.original_lyrics = lyrics_text
-        self.formatted_lyrics = self.format_lyrics(lyrics_text)
+        self.formatted_lyrics = self.format_lyrics(get_junk_filter(self.songs_directory).clean(lyrics_text))
         
         # Update the display
         self.lyrics_display.value = self.formatted_lyrics
         self.is_preview_mode = True
+        self._on_song_changed()
         
         # Switch to preview view
         self.switch_to_preview_mode()
@@ -184,6 +184,171 @@ class BetterLyricsMobile:
         theme_text = "🌙 Dark" if self.is_dark_mode else "☀️ Light"
         self.show_snackbar(f"Theme: {theme_text}", ft.Colors.BLUE)
 
+    # --- Auto-scroll ---
+
+    def _scroll_pixels_per_second(self):
+        """Converts the speed multiplier to pixels per second (same scale as the desktop app)"""
+        return max(0.5, self.scroll_speed * 0.8) / ScrollEngine.FRAME_INTERVAL
+
+    def _lyrics_layout(self):
+        """Predicted layout of the preview lyrics on this device (one Text in a 20 px padded container)"""
+        width = (self.page.width if self.page and self.page.width else None) or 400
+        return estimate_layout(self.formatted_lyrics or "", self.font_size_mobile, width,
+                               DEFAULT_LINE_HEIGHT, 0, True, 1_000_000, 0, 20)
+
+    def _send_scroll(self, offset, duration_ms):
+        """Sends one scroll command from the scroll engine to the lyrics ListView"""
+        lyrics_list = self.lyrics_list
+        if not lyrics_list or not lyrics_list.page:
+            return
+        if duration_ms:
+            lyrics_list.scroll_to(offset=offset, duration=duration_ms, curve=ft.AnimationCurve.LINEAR)
+        else:
+            lyrics_list.scroll_to(offset=offset, duration=0)
+
+    def toggle_play_pause(self, e):
+        """Start/stop auto-scroll (followers are driven by the leader)"""
+        if self.broadcast_role == "follower":
+            self.show_snackbar("👀 Following the leader's scrolling", ft.Colors.BLUE)
+            return
+        self.is_playing = not self.is_playing
+        if self.is_playing:
+            self.scroll_engine.set_speed(self._scroll_pixels_per_second())
+            self.scroll_engine.play()
+        else:
+            self.scroll_engine.pause()
+        self._refresh_playback_controls()
+
+    def change_speed(self, step):
+        """Adjust the speed multiplier"""
+        if self.broadcast_role == "follower":
+            return
+        self.scroll_speed = max(0.25, min(5.0, round(self.scroll_speed + step, 2)))
+        self.scroll_engine.set_speed(self._scroll_pixels_per_second())
+        self._refresh_playback_controls()
+
+    def restart_scroll(self, e):
+        """Back to the top of the song"""
+        if self.broadcast_role == "follower":
+            return
+        self.scroll_engine.seek(0)
+
+    def _on_song_changed(self):
+        """A new song is on screen: start at the top and tell followers"""
+        self.is_playing = False
+        self.scroll_engine.reset()
+        if self.broadcast_role == "leader":
+            self._broadcast_song()
+
+    def _refresh_playback_controls(self):
+        if self.play_button is not None:
+            self.play_button.text = "⏸ Pause" if self.is_playing else "▶ Play"
+        if self.speed_text is not None:
+            self.speed_text.value = f"{self.scroll_speed:.2f}x"
+        if self.broadcast_button is not None:
+            self.broadcast_button.text = {"leader": "📡 Leading", "follower": "👀 Following"}.get(self.broadcast_role, "📡 Broadcast")
+        if self.broadcast_status_text is not None:
+            self.broadcast_status_text.value = self._broadcast_status()
+        try:
+            if self.page:
+                self.page.update()
+        except Exception as e:
+            print(f"❌ Error updating playback controls: {e}")
+
+    # --- Broadcast Teleprompter ---
+
+    def cycle_broadcast_role(self, e):
+        """Off -> lead -> follow -> off"""
+        self.broadcast_role = {None: "leader", "leader": "follower", "follower": None}[self.broadcast_role]
+        self.following = None
+        self._last_state_seq = 0
+        self._heartbeat_generation += 1
+        self.follow_latency_ms.clear()
+        self.follow_drift_lines.clear()
+        if self.broadcast_role == "leader":
+            self._broadcast_song()
+            threading.Thread(target=self._run_broadcast_heartbeat, args=(self._heartbeat_generation,), daemon=True).start()
+        elif self.broadcast_role == "follower":
+            self.is_playing = False
+            self.scroll_engine.pause()
+            # Ask a running leader for its song and position
+            self._send_teleprompter("hello")
+        self._refresh_playback_controls()
+
+    def _broadcast_status(self):
+        if self.broadcast_role == "leader":
+            return "Leading: other devices follow this scroll"
+        if self.broadcast_role == "follower":
+            if not self.follow_latency_ms:
+                return "Waiting for a leader..."
+            latency = sum(self.follow_latency_ms) / len(self.follow_latency_ms)
+            drift = sum(self.follow_drift_lines) / len(self.follow_drift_lines)
+            return f"Following · {latency:.0f} ms · {drift:.2f} lines off"
+        return ""
+
+    def _send_teleprompter(self, kind, **payload):
+        if self.page:
+            message = dict(payload, kind=kind, sender=self.session_id)
+            self.page.pubsub.send_others_on_topic(TELEPROMPTER_TOPIC, message)
+
+    def _broadcast_song(self):
+        title = self.current_song['title'] if self.current_song else ""
+        self._send_teleprompter("song", title=title, lyrics=self.formatted_lyrics)
+        self._broadcast_scroll_state(self.scroll_engine.state())
+
+    def _broadcast_scroll_state(self, state):
+        """ScrollEngine.on_state hook: fan the leader's timeline out to followers, in lyric lines"""
+        if self.broadcast_role != "leader":
+            return
+        self._broadcast_seq += 1
+        self._send_teleprompter("state", seq=self._broadcast_seq, state=to_line_state(state, self._lyrics_layout()))
+
+    def _run_broadcast_heartbeat(self, generation):
+        """Leader: re-send the state while playing, so followers re-aim where their lines wrap differently"""
+        while True:
+            time.sleep(LINE_SYNC_INTERVAL)
+            if generation != self._heartbeat_generation or self.broadcast_role != "leader":
+                return
+            if self.scroll_engine.playing:
+                self._broadcast_scroll_state(self.scroll_engine.state())
+
+    def _on_teleprompter_message(self, topic, message):
+        kind = message["kind"]
+        if kind == "hello":
+            if self.broadcast_role == "leader":
+                self._broadcast_song()
+            return
+        if self.broadcast_role != "follower":
+            return
+        if self.following not in (None, message["sender"]):
+            return  # Stick with the first leader heard
+
+        if kind == "song":
+            self.following = message["sender"]
+            self._last_state_seq = 0
+            self.current_song = None
+            self.formatted_lyrics = message["lyrics"]
+            self.is_preview_mode = True
+            self.is_library_view = False
+            self.build_ui(self.page)
+        elif kind == "state" and self.following == message["sender"]:
+            if message["seq"] <= self._last_state_seq:
+                return  # Out of order
+            self._last_state_seq = message["seq"]
+            # Sessions share the server process, so the engine clock is common to leader and followers
+            now = self.scroll_engine.clock()
+            layout = self._lyrics_layout()
+            state = from_line_state(message["state"], layout)
+            self.follow_latency_ms.append((now - state.stamp) * 1000)
+            # How far this device's scroll was from the leader's when the state arrived
+            target = state.offset + (state.speed * (now - state.stamp) if state.playing else 0.0)
+            followed_line, followed_fraction = line_position(layout, self.scroll_engine.position(now))
+            target_line, target_fraction = line_position(layout, target)
+            self.follow_drift_lines.append(abs((followed_line + followed_fraction) - (target_line + target_fraction)))
+            self.scroll_engine.apply_state(state)
+            self.is_playing = state.playing
+            self._refresh_playback_controls()
+
     def save_current_song(self, e):
         """Save current lyrics as a song (mobile optimized)"""
         if not self.formatted_lyrics or self.formatted_lyrics == "No lyrics to display":
@@ -204,24 +369,14 @@ class BetterLyricsMobile:
                 return
             
             # Create song entry
-            song_id = str(uuid.uuid4())
-            song_data = {
-                'id': song_id,
-                'title': title,
-                'artist': artist,
-                'lyrics': self.formatted_lyrics,
-                'original_lyrics': self.original_lyrics,
-                'date_added': datetime.now().isoformat(),
-                'play_count': 0,
-                'is_favorite': False
-            }
+            song_data = Song(title, artist, self.formatted_lyrics, self.original_lyrics)
             
-            # Save to library
-            self.song_library[song_id] = song_data
-            if self._save_song_library():
+            # Save to the shared library (publishes a new snapshot for every session)
+            try:
+                self._publish_library_delta(self.library.add_song(song_data))
                 self.show_snackbar(f"💾 '{title}' saved!", ft.Colors.GREEN)
                 close_dialog(e)
-            else:
+            except Exception:
                 self.show_snackbar("❌ Failed to save song", ft.Colors.RED)
 
         # Mobile-friendly dialog
@@ -262,17 +417,78 @@ class BetterLyricsMobile:
 
     def show_library(self, e):
         """Show the song library (mobile optimized)"""
-        self.show_library = True
+        # Changes written by the desktop app or another server process
+        self._publish_library_delta(self.library.refresh())
+        self.is_library_view = True
         self.build_ui(self.page)
 
     def back_to_main(self, e):
         """Go back to main app from library"""
-        self.show_library = False
+        self.is_library_view = False
+        self.library_list = None
+        self._song_tiles = {}
         self.build_ui(self.page)
 
+    def _publish_library_delta(self, delta):
+        """Broadcast a library change to every open session (this one included)"""
+        if delta and self.page:
+            self.page.pubsub.send_all_on_topic(LIBRARY_TOPIC, delta)
+
+    def _on_library_delta(self, topic, delta):
+        """Patch the open library view with a LibraryDelta instead of rebuilding it"""
+        if not self.is_library_view or delta.version <= self._library_version:
+            return
+        self._library_version = delta.version
+        if self.library_list is None:
+            # Empty-library placeholder: build the real list once
+            self.build_ui(self.page)
+            return
+
+        for song_id, song in delta.songs.items():
+            tile = self._song_tiles.get(song_id)
+            if song is None:
+                if tile is not None:
+                    self.library_list.controls.remove(tile)
+                    del self._song_tiles[song_id]
+            elif tile is None:
+                tile = self._song_tiles[song_id] = self._build_song_tile(song)
+                self.library_list.controls.append(tile)
+            else:
+                tile.title.value = song['title']
+                tile.subtitle.value = f"by {song['artist']}"
+                tile.on_click = self._load_song_handler(song)
+        try:
+            self.library_list.update()
+        except Exception as e:
+            print(f"❌ Error applying library update: {e}")
+
+    def _load_song_handler(self, song_data):
+        def _load(e):
+            self.current_song = song_data
+            self.formatted_lyrics = song_data['lyrics']
+            self.original_lyrics = song_data.get('original_lyrics', song_data['lyrics'])
+            self.lyrics_display.value = self.formatted_lyrics
+            self.is_preview_mode = True
+            self._on_song_changed()
+            self.back_to_main(e)
+        return _load
+
+    def _build_song_tile(self, song):
+        return ft.ListTile(
+            leading=ft.Icon(ft.Icons.MUSIC_NOTE),
+            title=ft.Text(song['title'], weight=ft.FontWeight.BOLD),
+            subtitle=ft.Text(f"by {song['artist']}", color=ft.Colors.GREY),
+            on_click=self._load_song_handler(song),
+            content_padding=ft.padding.all(15)
+        )
+
     def build_library_view(self):
         """Build mobile-optimized library view"""
-        if not self.song_library:
+        snapshot = self.library.snapshot()
+        self._library_version = snapshot.version
+        self.library_list = None
+        self._song_tiles = {}
+        if not snapshot.songs:
             return ft.Container(
                 content=ft.Column([
                     ft.Container(height=50),
@@ -290,27 +506,12 @@ class BetterLyricsMobile:
                 expand=True
             )
 
-        # Create song list
-        song_items = []
-        for song_id, song in self.song_library.items():
-            def load_song(song_data):
-                def _load(e):
-                    self.current_song = song_data
-                    self.formatted_lyrics = song_data['lyrics']
-                    self.original_lyrics = song_data.get('original_lyrics', song_data['lyrics'])
-                    self.lyrics_display.value = self.formatted_lyrics
-                    self.is_preview_mode = True
-                    self.back_to_main(e)
-                return _load
-
-            song_tile = ft.ListTile(
-                leading=ft.Icon(ft.Icons.MUSIC_NOTE),
-                title=ft.Text(song['title'], weight=ft.FontWeight.BOLD),
-                subtitle=ft.Text(f"by {song['artist']}", color=ft.Colors.GREY),
-                on_click=load_song(song),
-                content_padding=ft.padding.all(15)
-            )
-            song_items.append(song_tile)
+        # Create song list (tiles are kept by id so library deltas can patch them)
+        self._song_tiles = {song_id: self._build_song_tile(song) for song_id, song in snapshot.songs.items()}
+        self.library_list = ft.ListView(
+            controls=list(self._song_tiles.values()),
+            spacing=5
+        )
 
         return ft.Column([
             # Header
@@ -328,10 +529,7 @@ class BetterLyricsMobile:
             
             # Song list
             ft.Container(
-                content=ft.ListView(
-                    controls=song_items,
-                    spacing=5
-                ),
+                content=self.library_list,
                 expand=True
             )
         ])
@@ -346,7 +544,7 @@ class BetterLyricsMobile:
         # Clear existing controls
         page.controls.clear()
         
-        if self.show_library:
+        if self.is_library_view:
             page.add(self.build_library_view())
             return
 
@@ -357,6 +555,24 @@ class BetterLyricsMobile:
                 size=self.font_size_mobile,
                 selectable=True
             )
+            self.lyrics_list = ft.ListView([
+                ft.Container(
+                    content=self.lyrics_display,
+                    padding=ft.padding.all(20)
+                )
+            ])
+            self.play_button = ft.FilledButton(
+                "⏸ Pause" if self.is_playing else "▶ Play",
+                on_click=self.toggle_play_pause,
+                height=self.button_height
+            )
+            self.speed_text = ft.Text(f"{self.scroll_speed:.2f}x", size=14)
+            self.broadcast_button = ft.FilledTonalButton(
+                {"leader": "📡 Leading", "follower": "👀 Following"}.get(self.broadcast_role, "📡 Broadcast"),
+                on_click=self.cycle_broadcast_role,
+                height=40
+            )
+            self.broadcast_status_text = ft.Text(self._broadcast_status(), size=12, color=ft.Colors.GREY)
             
             content = ft.Column([
                 # Header with back button
@@ -382,15 +598,29 @@ class BetterLyricsMobile:
                 
                 # Lyrics display
                 ft.Container(
-                    content=ft.ListView([
-                        ft.Container(
-                            content=self.lyrics_display,
-                            padding=ft.padding.all(20)
-                        )
-                    ]),
+                    content=self.lyrics_list,
                     expand=True
                 ),
                 
+                # Playback and broadcast controls
+                ft.Container(
+                    content=ft.Column([
+                        ft.Row([
+                            self.play_button,
+                            ft.IconButton(ft.Icons.REMOVE, on_click=lambda e: self.change_speed(-0.25), tooltip="Slower"),
+                            self.speed_text,
+                            ft.IconButton(ft.Icons.ADD, on_click=lambda e: self.change_speed(0.25), tooltip="Faster"),
+                            ft.IconButton(ft.Icons.REPLAY, on_click=self.restart_scroll, tooltip="Restart"),
+                        ], alignment=ft.MainAxisAlignment.SPACE_EVENLY),
+                        ft.Row([
+                            self.broadcast_button,
+                            self.broadcast_status_text,
+                        ], alignment=ft.MainAxisAlignment.CENTER),
+                    ], tight=True),
+                    padding=ft.padding.symmetric(horizontal=15, vertical=5),
+                    bgcolor=ft.Colors.SURFACE
+                ),
+                
                 # Bottom controls
                 ft.Container(
                     content=ft.Row([
@@ -480,6 +710,9 @@ class BetterLyricsMobile:
             ])
 
         page.add(content)
+        # A rebuilt lyrics ListView starts at the top; put it back where the scroll is
+        if self.is_preview_mode and self.scroll_engine.position() > 0:
+            self.scroll_engine.resync()
 
 
 def main(page: ft.Page):
@@ -491,6 +724,9 @@ def main(page: ft.Page):
     page.scroll = ft.ScrollMode.AUTO
     
     app = BetterLyricsMobile()
+    # Library changes made in other sessions arrive as deltas
+    page.pubsub.subscribe_topic(LIBRARY_TOPIC, app._on_library_delta)
+    page.pubsub.subscribe_topic(TELEPROMPTER_TOPIC, app._on_teleprompter_message)
     app.build_ui(page)
 
 
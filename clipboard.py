@@ -0,0 +1,124 @@
+import threading
+import time
+from collections import namedtuple
+
+PasteResult = namedtuple("PasteResult", ["text", "truncated", "original_length"])
+
+
+class ClipboardError(Exception):
+    """A clipboard operation failed, timed out or was refused."""
+
+
+class ClipboardTimeout(ClipboardError):
+    pass
+
+
+class ClipboardBusy(ClipboardError):
+    pass
+
+
+class ClipboardTooLarge(ClipboardError):
+    pass
+
+
+class Clipboard:
+    """
+    Clipboard access that never blocks the caller. On Linux pyperclip shells
+    out to xclip/xsel, which can hang when no clipboard owner answers, so
+    every call runs on a worker thread and reports back through callbacks:
+    the result, or a ClipboardTimeout after `timeout` seconds. A call that
+    is still stuck keeps the clipboard busy (later calls fail fast with
+    ClipboardBusy) instead of piling up threads. The backend is detected
+    once per process, on the first call, and shared by every instance.
+    """
+    TIMEOUT = 2.0                   # seconds before giving up on a call
+    MAX_PASTE_CHARS = 2_000_000     # longer pastes are truncated
+    MAX_COPY_CHARS = 2_000_000      # longer copies are refused
+
+    _backend = None                 # (copy, paste) functions, shared
+    backend_name = None
+    _backend_lock = threading.Lock()
+
+    def __init__(self, timeout=None, max_paste_chars=None, max_copy_chars=None, on_timing=None):
+        self.timeout = timeout or self.TIMEOUT
+        self.max_paste_chars = max_paste_chars or self.MAX_PASTE_CHARS
+        self.max_copy_chars = max_copy_chars or self.MAX_COPY_CHARS
+        self.on_timing = on_timing  # on_timing(name, elapsed_ms), e.g. profiler.record
+        self._busy = threading.Lock()
+
+    @classmethod
+    def _get_backend(cls):
+        """Detect the clipboard mechanism once (runs on the worker thread)."""
+        with cls._backend_lock:
+            if cls._backend is None:
+                import pyperclip  # type: ignore
+                copy, paste = pyperclip.determine_clipboard()
+                cls._backend = (copy, paste)
+                cls.backend_name = getattr(copy, "__qualname__", type(copy).__name__).split(".")[0]
+            return cls._backend
+
+    def paste(self, on_done, on_error):
+        """Read the clipboard; on_done(PasteResult) or on_error(exception) is called later."""
+        def job():
+            text = self._get_backend()[1]() or ""
+            if len(text) > self.max_paste_chars:
+                return PasteResult(text[:self.max_paste_chars], True, len(text))
+            return PasteResult(text, False, len(text))
+        self._run("clipboard.paste", job, on_done, on_error)
+
+    def copy(self, text, on_done=None, on_error=None):
+        """Write text to the clipboard; on_done(None) or on_error(exception) is called later."""
+        if len(text) > self.max_copy_chars:
+            if on_error:
+                on_error(ClipboardTooLarge(f"{len(text):,} characters is more than the {self.max_copy_chars:,} limit"))
+            return
+        self._run("clipboard.copy", lambda: self._get_backend()[0](text), on_done, on_error)
+
+    def _run(self, name, job, on_done, on_error):
+        if not self._busy.acquire(blocking=False):
+            if on_error:
+                on_error(ClipboardBusy("Still waiting for the previous clipboard call"))
+            return
+
+        delivered = threading.Lock()
+
+        def deliver(callback, value):
+            # Exactly one of result / error / timeout reaches the caller
+            if callback and delivered.acquire(blocking=False):
+                try:
+                    callback(value)
+                except Exception as ex:
+                    print(f"❌ Clipboard callback error: {ex}")
+
+        timer = threading.Timer(self.timeout, lambda: deliver(
+            on_error, ClipboardTimeout(f"Clipboard did not respond within {self.timeout:g} s")))
+        timer.daemon = True
+
+        def worker():
+            started = time.perf_counter()
+            try:
+                value = job()
+            except Exception as ex:
+                timer.cancel()
+                deliver(on_error, ex)
+            else:
+                timer.cancel()
+                deliver(on_done, value)
+            finally:
+                self._busy.release()
+                if self.on_timing:
+                    self.on_timing(name, (time.perf_counter() - started) * 1000)
+
+        timer.start()
+        threading.Thread(target=worker, daemon=True).start()
+
+
+def describe_error(error):
+    """Short user-facing text for a clipboard failure."""
+    if isinstance(error, ClipboardTimeout):
+        return "⏳ The clipboard did not respond - try Ctrl+V"
+    if isinstance(error, ClipboardBusy):
+        return "⏳ Still waiting for the clipboard..."
+    if isinstance(error, ClipboardTooLarge):
+        return f"❌ Too large for the clipboard ({error})"
+    return f"❌ Clipboard error: {error}"
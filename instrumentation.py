@@ -0,0 +1,204 @@
+import atexit
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+
+class _NullTimer:
+    """Shared no-op context manager handed out while profiling is disabled."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    __slots__ = ("profiler", "name", "started")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.started = 0.0
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, (time.perf_counter() - self.started) * 1000)
+        return False
+
+
+class Profiler:
+    """
+    Hot-path timers and counters for rebuilds, saves, loads, scroll frames,
+    clipboard calls and page.update() round-trips. While disabled every call
+    returns immediately (timer() hands back a shared no-op), so instrumented
+    code pays only an attribute check.
+    """
+    RECENT_SAMPLES = 256  # samples kept per timer for percentiles
+    RATE_WINDOW = 5.0     # seconds of event timestamps kept for per-second rates
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.session_started = datetime.now()
+        self._lock = threading.Lock()
+        self._timers = {}    # name -> {"count", "total_ms", "max_ms", "last_ms", "recent"}
+        self._counters = {}  # name -> count
+        self._events = {}    # name -> deque of perf_counter timestamps
+        self._local = threading.local()  # .paused is set while untracked() runs on a thread
+
+    def timer(self, name):
+        """Context manager timing a block under `name`."""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name)
+
+    @contextlib.contextmanager
+    def untracked(self):
+        """Leave page updates made inside the block (on this thread) out of the profile."""
+        paused = getattr(self._local, "paused", False)
+        self._local.paused = True
+        try:
+            yield
+        finally:
+            self._local.paused = paused
+
+    def timed(self, name):
+        """Decorator timing every call of a function under `name`."""
+        def decorator(function):
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return function(*args, **kwargs)
+                with _Timer(self, name):
+                    return function(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def record(self, name, elapsed_ms):
+        """Record one timing sample in milliseconds."""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        with self._lock:
+            stats = self._timers.get(name)
+            if stats is None:
+                stats = self._timers[name] = {
+                    "count": 0, "total_ms": 0.0, "max_ms": 0.0, "last_ms": 0.0,
+                    "recent": deque(maxlen=self.RECENT_SAMPLES),
+                }
+            stats["count"] += 1
+            stats["total_ms"] += elapsed_ms
+            stats["last_ms"] = elapsed_ms
+            stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+            stats["recent"].append(elapsed_ms)
+            self._mark(name, now)
+
+    def count(self, name, amount=1):
+        """Increment a counter."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+            self._mark(name, time.perf_counter())
+
+    def _mark(self, name, now):
+        events = self._events.get(name)
+        if events is None:
+            events = self._events[name] = deque()
+        events.append(now)
+        while events and now - events[0] > self.RATE_WINDOW:
+            events.popleft()
+
+    def rate(self, name):
+        """Events per second for a timer or counter over the recent window."""
+        with self._lock:
+            events = self._events.get(name)
+            if not events:
+                return 0.0
+            now = time.perf_counter()
+            recent = sum(1 for stamp in events if now - stamp <= 1.0)
+        return float(recent)
+
+    def last_ms(self, name):
+        """Most recent sample of a timer, or None."""
+        stats = self._timers.get(name)
+        return stats["last_ms"] if stats else None
+
+    def instrument_page(self, page):
+        """Wrap page.update() so every round-trip is timed and counted."""
+        if not self.enabled or getattr(page, "_profiled_update", None):
+            return
+        original_update = page.update
+
+        def timed_update(*controls):
+            if getattr(self._local, "paused", False):
+                return original_update(*controls)
+            with self.timer("page.update"):
+                return original_update(*controls)
+
+        page.update = timed_update
+        page._profiled_update = True
+
+    def snapshot(self):
+        """Return all timers and counters as plain data."""
+        with self._lock:
+            timers = {}
+            for name, stats in self._timers.items():
+                recent = sorted(stats["recent"])
+                timers[name] = {
+                    "count": stats["count"],
+                    "total_ms": round(stats["total_ms"], 3),
+                    "mean_ms": round(stats["total_ms"] / stats["count"], 3),
+                    "max_ms": round(stats["max_ms"], 3),
+                    "last_ms": round(stats["last_ms"], 3),
+                    "p95_ms": round(recent[int(len(recent) * 0.95) - 1 if len(recent) > 1 else 0], 3),
+                }
+            return {
+                "session_started": self.session_started.isoformat(),
+                "captured_at": datetime.now().isoformat(),
+                "timers": timers,
+                "counters": dict(self._counters),
+            }
+
+    def overlay_text(self):
+        """One-line summary for the on-screen debug overlay."""
+        frame = self.last_ms("scroll.frame")
+        save = self.last_ms("library.save")
+        rebuild = self.last_ms("ui.rebuild")
+        return (
+            f"frame {frame:.1f} ms" if frame is not None else "frame -"
+        ) + f" | updates/s {self.rate('page.update'):.0f}" + (
+            f" | last save {save:.1f} ms" if save is not None else " | last save -"
+        ) + (
+            f" | rebuild {rebuild:.0f} ms" if rebuild is not None else ""
+        )
+
+    def dump(self, path=None):
+        """Write the session profile as JSON and return its path."""
+        if path is None:
+            directory = os.environ.get("BETTER_LYRICS_PROFILE_DIR", "profiles")
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, f"session_{self.session_started:%Y%m%d_%H%M%S}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f, indent=2)
+        return path
+
+
+# Process-wide profiler, enabled with BETTER_LYRICS_PROFILE=1
+profiler = Profiler(enabled=os.environ.get("BETTER_LYRICS_PROFILE") == "1")
+
+if profiler.enabled:
+    atexit.register(profiler.dump)
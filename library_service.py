@@ -0,0 +1,162 @@
+import atexit
+import os
+import threading
+from collections import namedtuple
+from types import MappingProxyType
+
+from library_store import LibraryStore, apply_ops, apply_playlist_ops
+from song_library import PlaylistIndex
+
+# Topic the server sessions exchange LibraryDelta messages on (page.pubsub)
+LIBRARY_TOPIC = "library"
+
+# What one library change touched: songs maps id -> new Song (None when deleted),
+# playlists is the set of playlist names whose membership changed
+LibraryDelta = namedtuple("LibraryDelta", ["version", "songs", "playlists"])
+
+
+class LibrarySnapshot:
+    """
+    Read-only view of the library at one version. Sessions keep a reference
+    and read it without locking; writers never change a published snapshot,
+    they publish a new one (copy-on-write). Song records reachable from a
+    snapshot must be treated as frozen - use Song.copy() to change one.
+    """
+    __slots__ = ("version", "songs", "playlists")
+
+    def __init__(self, version, songs, playlists):
+        self.version = version
+        self.songs = MappingProxyType(songs)          # id -> Song
+        self.playlists = MappingProxyType(playlists)  # name -> tuple of song ids
+
+    def get(self, song_id):
+        return self.songs.get(song_id)
+
+    def __len__(self):
+        return len(self.songs)
+
+
+class LibraryService:
+    """
+    Process-wide song library shared by every session of the server
+    (main.py). The files are read and parsed once per process; sessions read
+    the current snapshot, and mutations copy the top-level containers, swap
+    in a new snapshot and sync it through the LibraryStore journal (which
+    also merges changes from other processes, e.g. the desktop app).
+    """
+
+    def __init__(self, directory="saved_songs"):
+        self.directory = directory
+        self.store = LibraryStore(directory)
+        self._write_lock = threading.Lock()
+        songs, playlists = self.store.load()
+        self._snapshot = LibrarySnapshot(
+            self.store.version,
+            {song.id: song for song in songs},
+            {name: tuple(ids) for name, ids in playlists.items()},
+        )
+        print(f"✅ Library service loaded {len(self._snapshot)} songs from {self.store.songs_file}")
+        atexit.register(self.store.compact)
+
+    # --- Reads ---
+
+    def snapshot(self):
+        """Current immutable snapshot (a plain attribute read, no lock)."""
+        return self._snapshot
+
+    def refresh(self):
+        """Merge changes other processes appended to the journal; returns their LibraryDelta or None."""
+        with self._write_lock:
+            remote_ops = self.store.poll()
+            if not remote_ops:
+                return None
+            snapshot = self._snapshot
+            return self._publish_merged(dict(snapshot.songs), dict(snapshot.playlists), remote_ops, {}, set())
+
+    # --- Writes ---
+    # Every write returns the LibraryDelta to broadcast to the other sessions
+
+    def add_song(self, song):
+        """Publish a new song and persist the library."""
+        return self._commit_song(song.id, song)
+
+    def update_song(self, song_id, **changes):
+        """Replace a song with a modified copy (None if the song is gone)."""
+        with self._write_lock:
+            current = self._snapshot.songs.get(song_id)
+            if current is None:
+                return None
+            return self._commit_song_locked(song_id, current.copy(**changes))
+
+    def remove_song(self, song_id):
+        """Drop a song from the library and from every playlist."""
+        return self._commit_song(song_id, None)
+
+    def set_playlist(self, name, song_ids):
+        """Create or replace a playlist (song_ids=None deletes it)."""
+        with self._write_lock:
+            snapshot = self._snapshot
+            playlists = dict(snapshot.playlists)
+            if song_ids is None:
+                playlists.pop(name, None)
+            else:
+                playlists[name] = tuple(dict.fromkeys(song_ids))
+            return self._publish(dict(snapshot.songs), playlists, {}, {name})
+
+    def _commit_song(self, song_id, song):
+        with self._write_lock:
+            return self._commit_song_locked(song_id, song)
+
+    def _commit_song_locked(self, song_id, song):
+        snapshot = self._snapshot
+        songs = dict(snapshot.songs)
+        playlists = snapshot.playlists
+        changed_playlists = set()
+        if song is None:
+            if songs.pop(song_id, None) is None:
+                return None
+            changed_playlists = {name for name, ids in playlists.items() if song_id in ids}
+            if changed_playlists:
+                playlists = {name: tuple(i for i in ids if i != song_id) for name, ids in playlists.items()}
+        else:
+            songs[song_id] = song
+        return self._publish(songs, dict(playlists), {song_id: song}, changed_playlists)
+
+    def _publish(self, songs, playlists, changed_songs, changed_playlists):
+        # Every write names the songs it changed, so only those are diffed
+        remote_ops = self.store.commit(songs.values(), playlists, dirty=changed_songs)
+        return self._publish_merged(songs, playlists, remote_ops, changed_songs, changed_playlists)
+
+    def _publish_merged(self, songs, playlists, remote_ops, changed_songs, changed_playlists):
+        changed_songs = dict(changed_songs)
+        changed_playlists = set(changed_playlists)
+        if remote_ops:
+            # Songs may still be shared with older snapshots: copy before changing
+            changed, playlist_ops = apply_ops(remote_ops, songs, copy_on_write=True)
+            changed_songs.update(changed)
+            if playlist_ops or any(song is None for song in changed.values()):
+                index = PlaylistIndex(playlists)
+                for song_id, song in changed.items():
+                    if song is None:
+                        changed_playlists.update(index.remove_song(song_id))
+                apply_playlist_ops(index, playlist_ops)
+                changed_playlists.update(op["name"] for op in playlist_ops)
+                playlists = {name: tuple(ids) for name, ids in index.items()}
+        self._snapshot = LibrarySnapshot(self.store.version, songs, playlists)
+        return LibraryDelta(self.store.version, changed_songs, frozenset(changed_playlists))
+
+
+_services = {}
+_services_lock = threading.Lock()
+
+
+def get_library_service(directory="saved_songs"):
+    """Return the process-wide LibraryService for a directory, loading it on first use."""
+    key = os.path.abspath(directory)
+    service = _services.get(key)
+    if service is None:
+        with _services_lock:
+            service = _services.get(key)
+            if service is None:
+                service = _services[key] = LibraryService(directory)
+    return service
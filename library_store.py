@@ -0,0 +1,426 @@
+import json
+import os
+import sys
+import threading
+import uuid
+from contextlib import contextmanager
+
+from song_library import Song, apply_sort_keys
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Song fields that are written to the journal (sort keys are derived from title/artist)
+SYNC_FIELDS = tuple(field for field in Song.FIELDS + ("extra",) if field not in ("sort_title", "sort_artist"))
+# Fields merged as increments, so concurrent plays on two clients both count
+COUNTER_FIELDS = ("play_count",)
+
+
+@contextmanager
+def file_lock(path):
+    """Exclusive lock on `path` shared by every process (and session) using the same saved_songs folder."""
+    with open(path, "a+b") as handle:
+        if fcntl is not None:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        else:
+            while True:
+                try:
+                    handle.seek(0)
+                    msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue  # LK_LOCK gives up after ~10 seconds; keep waiting
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+            else:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _song_values(song):
+    values = [getattr(song, field) for field in SYNC_FIELDS]
+    extra = SYNC_FIELDS.index("extra")
+    values[extra] = dict(values[extra]) if values[extra] else None
+    return tuple(values)
+
+
+def _song_from_values(values):
+    song = Song.__new__(Song)
+    for field, value in zip(SYNC_FIELDS, values):
+        setattr(song, field, value)
+    song.extra = dict(song.extra) if song.extra else None
+    apply_sort_keys(song)
+    return song
+
+
+def _journal_song(song):
+    """Full song entry for an "add" op; timestamps stay epoch floats so they round-trip exactly."""
+    entry = song.to_dict()
+    entry["created_at"] = song.created_at
+    entry["last_played"] = song.last_played
+    return entry
+
+
+def _set_fields(song, fields):
+    for field, value in fields.items():
+        setattr(song, field, sys.intern(value) if field == "artist" else value)
+    if "title" in fields or "artist" in fields:
+        apply_sort_keys(song)
+
+
+def apply_ops(ops, songs, copy_on_write=False):
+    """
+    Apply journal operations to an id -> Song dict. With copy_on_write, changed
+    songs are replaced by copies instead of being modified in place (for
+    published snapshots). Returns ({song_id: Song or None if deleted}, playlist ops).
+    """
+    changed = {}
+    playlist_ops = []
+    for op in ops:
+        kind = op["op"]
+        if kind == "add":
+            song = Song.from_dict(op["song"])
+            songs[song.id] = changed[song.id] = song
+        elif kind == "update":
+            song = songs.get(op["id"])
+            if song is None:
+                continue  # Deleted by another writer first
+            fields = dict(op.get("set", {}))
+            for field, amount in op.get("inc", {}).items():
+                fields[field] = (getattr(song, field) or 0) + amount
+            if copy_on_write:
+                song = song.copy()
+            _set_fields(song, fields)
+            songs[song.id] = changed[song.id] = song
+        elif kind == "delete":
+            if songs.pop(op["id"], None) is not None:
+                changed[op["id"]] = None
+        else:
+            playlist_ops.append(op)
+    return changed, playlist_ops
+
+
+def apply_playlist_ops(playlists, ops):
+    """Apply playlist operations to a PlaylistIndex."""
+    for op in ops:
+        kind = op["op"]
+        if kind == "playlist_create":
+            playlists.create(op["name"])
+        elif kind == "playlist_delete":
+            playlists.delete(op["name"])
+        elif kind == "playlist_add":
+            playlists.add(op["name"], op["id"])
+        elif kind == "playlist_remove":
+            playlists.remove(op["name"], op["id"])
+
+
+class LibraryStore:
+    """
+    Coordinates writes to saved_songs/ between sessions and processes.
+
+    songs_library.json / playlists.json are a checkpoint at the version in
+    library_version.json; every later change is one line appended to
+    library_journal.jsonl under a file lock: {"seq", "writer", "base", "ops"}.
+    A writer diffs its state against the last version it synced (base),
+    appends only the changed fields and picks up whatever other writers
+    appended meanwhile, which the caller merges into its own state. Counters
+    merge as increments; for the same field of the same song the later
+    journal entry wins. Every COMPACT_AFTER entries the journal is folded back
+    into the JSON files.
+    """
+    JOURNAL_NAME = "library_journal.jsonl"
+    VERSION_NAME = "library_version.json"
+    LOCK_NAME = ".library.lock"
+    COMPACT_AFTER = 500
+
+    def __init__(self, directory="saved_songs"):
+        self.directory = directory
+        self.songs_file = os.path.join(directory, "songs_library.json")
+        self.playlists_file = os.path.join(directory, "playlists.json")
+        self.journal_file = os.path.join(directory, self.JOURNAL_NAME)
+        self.version_file = os.path.join(directory, self.VERSION_NAME)
+        self.lock_file = os.path.join(directory, self.LOCK_NAME)
+        self.writer = uuid.uuid4().hex[:12]
+        self.version = 0            # last journal seq merged into base
+        self.checkpoint_version = 0
+        self._offset = 0            # bytes of the journal already read
+        self._songs = {}            # id -> field values as last synced
+        self._playlists = {}        # name -> tuple of song ids as last synced
+        self._lock = threading.RLock()
+        self.stats = {"commits": 0, "remote_entries": 0, "conflicts": 0, "compactions": 0}
+        os.makedirs(directory, exist_ok=True)
+
+    # --- Loading ---
+
+    def load(self):
+        """Read checkpoint + journal. Returns (list of Song, {name: [song ids]})."""
+        with self._lock, file_lock(self.lock_file):
+            self._load_checkpoint()
+            self._read_journal()
+        songs = [_song_from_values(values) for values in self._songs.values()]
+        return songs, {name: list(ids) for name, ids in self._playlists.items()}
+
+    def _load_checkpoint(self):
+        self._songs = {}
+        self._playlists = {"Favorites": ()}
+        self.checkpoint_version = self._read_version()
+        self.version = self.checkpoint_version
+        self._offset = 0
+        if os.path.exists(self.songs_file):
+            with open(self.songs_file, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+            # Older mobile builds wrote a dict keyed by id instead of the shared list
+            if isinstance(entries, dict):
+                entries = list(entries.values())
+            for entry in entries:
+                song = Song.from_dict(entry)
+                self._songs[song.id] = _song_values(song)
+        if os.path.exists(self.playlists_file):
+            with open(self.playlists_file, 'r', encoding='utf-8') as f:
+                self._playlists = {name: tuple(ids) for name, ids in json.load(f).items()}
+
+    def _read_version(self):
+        try:
+            with open(self.version_file, 'r', encoding='utf-8') as f:
+                return json.load(f).get("version", 0)
+        except (OSError, ValueError):
+            return 0
+
+    def _read_journal(self):
+        """Apply journal entries newer than self.version to base; returns them."""
+        if not os.path.exists(self.journal_file):
+            self._offset = 0
+            return []
+        with open(self.journal_file, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() < self._offset:
+                self._offset = 0  # Rewritten by a compaction; seq numbers tell what is new
+            f.seek(self._offset)
+            data = f.read()
+        end = data.rfind(b"\n") + 1  # Ignore a partially written last line
+        self._offset += end
+        entries = []
+        for line in data[:end].splitlines():
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            if entry["seq"] <= self.version:
+                continue
+            self._apply_to_base(entry["ops"])
+            self.version = entry["seq"]
+            entries.append(entry)
+        return entries
+
+    # --- Syncing ---
+
+    def poll(self):
+        """Pick up changes made by other writers. Returns their ops (oldest first)."""
+        with self._lock, file_lock(self.lock_file):
+            entries = self._catch_up()
+        return [op for entry in entries for op in entry["ops"]]
+
+    def commit(self, songs, playlists, dirty=None):
+        """
+        Write local changes and merge concurrent ones. `songs` is an iterable of
+        Song, `playlists` a {name: song ids} mapping, both the caller's current
+        state. When the caller knows which songs changed, `dirty` maps their ids
+        to the current Song (None once deleted) and only those are diffed;
+        `songs` is then not read. Returns the other writers' ops the caller
+        still has to apply.
+        """
+        with self._lock:
+            local_ops = self._diff(songs, playlists, dirty)
+            with file_lock(self.lock_file):
+                base = self.version
+                entries = self._catch_up()
+                remote_ops = [op for entry in entries for op in entry["ops"]]
+                if local_ops:
+                    remote_ops = self._drop_overwritten(remote_ops, local_ops)
+                    self._append(local_ops, base=base)
+            compact = self.version - self.checkpoint_version >= self.COMPACT_AFTER
+        if compact:
+            self.compact()
+        return remote_ops
+
+    def _catch_up(self):
+        checkpoint = self._read_version()
+        if checkpoint != self.checkpoint_version and checkpoint <= self.version:
+            # Compacted by another writer at a version we already have: only the
+            # journal's byte layout changed, re-read it from the start
+            self.checkpoint_version = checkpoint
+            self._offset = 0
+        if checkpoint > self.version:
+            # A compaction folded entries we never saw into the checkpoint:
+            # reload it and hand back the difference as ops
+            old_songs, old_playlists = self._songs, self._playlists
+            self._load_checkpoint()
+            self._read_journal()
+            ops = self._diff_values(old_songs, old_playlists)
+            self.stats["remote_entries"] += 1
+            return [{"seq": self.version, "writer": None, "ops": ops}]
+        entries = self._read_journal()
+        self.stats["remote_entries"] += len(entries)
+        return entries
+
+    def _append(self, ops, base):
+        self.version += 1
+        entry = {"seq": self.version, "writer": self.writer, "base": base, "ops": ops}
+        line = (json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8")
+        with open(self.journal_file, 'ab') as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+            self._offset = f.tell()
+        self._apply_to_base(ops)
+        self.stats["commits"] += 1
+
+    def _drop_overwritten(self, remote_ops, local_ops):
+        """Our entry lands after theirs, so our set fields win; drop theirs for the caller."""
+        local_fields = {}
+        for op in local_ops:
+            if op["op"] == "update" and "set" in op:
+                local_fields.setdefault(op["id"], set()).update(op["set"])
+        merged = []
+        for op in remote_ops:
+            overwritten = local_fields.get(op.get("id")) if op["op"] == "update" else None
+            if overwritten and "set" in op and overwritten & op["set"].keys():
+                self.stats["conflicts"] += 1
+                print(f"⚠️ Concurrent edit of song {op['id']} ({', '.join(sorted(overwritten & op['set'].keys()))}) - keeping this one")
+                op = dict(op, set={k: v for k, v in op["set"].items() if k not in overwritten})
+            merged.append(op)
+        return merged
+
+    # --- Diffing ---
+
+    def _diff(self, songs, playlists, dirty=None):
+        current_playlists = {name: tuple(ids) for name, ids in playlists.items()}
+        if dirty is None:
+            current = {song.id: _song_values(song) for song in songs}
+            return self._diff_values(self._songs, self._playlists, current, current_playlists)
+        # Only the dirty songs: unchanged ones are never unpacked or compared
+        current = {song_id: _song_values(song) for song_id, song in dirty.items() if song is not None}
+        synced = {song_id: self._songs[song_id] for song_id in dirty if song_id in self._songs}
+        return self._diff_values(synced, self._playlists, current, current_playlists)
+
+    def _diff_values(self, old_songs, old_playlists, new_songs=None, new_playlists=None):
+        """Ops turning (old_songs, old_playlists) into the new state (default: base)."""
+        new_songs = self._songs if new_songs is None else new_songs
+        new_playlists = self._playlists if new_playlists is None else new_playlists
+        ops = []
+        for song_id, values in new_songs.items():
+            old = old_songs.get(song_id)
+            if old is None:
+                ops.append({"op": "add", "song": _journal_song(_song_from_values(values))})
+            elif old != values:
+                op = {"op": "update", "id": song_id}
+                for field, before, after in zip(SYNC_FIELDS, old, values):
+                    if before == after:
+                        continue
+                    if field in COUNTER_FIELDS:
+                        op.setdefault("inc", {})[field] = (after or 0) - (before or 0)
+                    else:
+                        op.setdefault("set", {})[field] = after
+                ops.append(op)
+        for song_id in old_songs.keys() - new_songs.keys():
+            ops.append({"op": "delete", "id": song_id})
+
+        for name, ids in new_playlists.items():
+            old_ids = old_playlists.get(name)
+            if old_ids is None:
+                ops.append({"op": "playlist_create", "name": name})
+                old_ids = ()
+            if old_ids == ids:
+                continue
+            old_set, new_set = set(old_ids), set(ids)
+            ops.extend({"op": "playlist_remove", "name": name, "id": i} for i in old_ids if i not in new_set)
+            ops.extend({"op": "playlist_add", "name": name, "id": i} for i in ids if i not in old_set)
+        for name in old_playlists.keys() - new_playlists.keys():
+            ops.append({"op": "playlist_delete", "name": name})
+        return ops
+
+    def _apply_to_base(self, ops):
+        for op in ops:
+            kind = op["op"]
+            if kind == "add":
+                song = Song.from_dict(op["song"])
+                self._songs[song.id] = _song_values(song)
+            elif kind == "update":
+                old = self._songs.get(op["id"])
+                if old is None:
+                    continue
+                values = list(old)
+                for field, value in op.get("set", {}).items():
+                    values[SYNC_FIELDS.index(field)] = value
+                for field, amount in op.get("inc", {}).items():
+                    index = SYNC_FIELDS.index(field)
+                    values[index] = (values[index] or 0) + amount
+                self._songs[op["id"]] = tuple(values)
+            elif kind == "delete":
+                self._songs.pop(op["id"], None)
+            elif kind == "playlist_create":
+                self._playlists.setdefault(op["name"], ())
+            elif kind == "playlist_delete":
+                self._playlists.pop(op["name"], None)
+            elif kind == "playlist_add":
+                ids = self._playlists.get(op["name"], ())
+                if op["id"] not in ids:
+                    self._playlists[op["name"]] = ids + (op["id"],)
+            elif kind == "playlist_remove":
+                ids = self._playlists.get(op["name"])
+                if ids and op["id"] in ids:
+                    self._playlists[op["name"]] = tuple(i for i in ids if i != op["id"])
+
+    # --- Compaction ---
+
+    def compact(self, force=False):
+        """Fold the journal into songs_library.json / playlists.json."""
+        with self._lock:
+            if self.version == self.checkpoint_version and not force:
+                return False
+            version = self.version
+            # The slow part (serializing every song) happens outside the file lock
+            songs_tmp = self.songs_file + f".{self.writer}.tmp"
+            playlists_tmp = self.playlists_file + f".{self.writer}.tmp"
+            try:
+                with open(songs_tmp, 'w', encoding='utf-8') as f:
+                    json.dump([_song_from_values(values).to_dict() for values in self._songs.values()],
+                              f, indent=2, ensure_ascii=False)
+                with open(playlists_tmp, 'w', encoding='utf-8') as f:
+                    json.dump({name: list(ids) for name, ids in self._playlists.items()}, f, indent=2, ensure_ascii=False)
+
+                with file_lock(self.lock_file):
+                    if self._read_version() >= version:
+                        return False  # Someone else already wrote a newer checkpoint
+                    os.replace(songs_tmp, self.songs_file)
+                    os.replace(playlists_tmp, self.playlists_file)
+                    with open(self.version_file, 'w', encoding='utf-8') as f:
+                        json.dump({"version": version}, f)
+                    self._truncate_journal(version)
+                self.checkpoint_version = version
+                self.stats["compactions"] += 1
+                print(f"✅ Compacted library journal at version {version}")
+                return True
+            except Exception as e:
+                print(f"❌ Error compacting library journal: {e}")
+                return False
+            finally:
+                for path in (songs_tmp, playlists_tmp):
+                    if os.path.exists(path):
+                        os.remove(path)
+
+    def _truncate_journal(self, version):
+        """Keep only entries newer than the checkpoint (appended while it was written)."""
+        if not os.path.exists(self.journal_file):
+            return
+        with open(self.journal_file, 'rb') as f:
+            lines = f.read().splitlines(keepends=True)
+        kept = [line for line in lines if line.strip() and json.loads(line)["seq"] > version]
+        with open(self.journal_file, 'wb') as f:
+            f.writelines(kept)
+        self._offset = 0
@@ -0,0 +1,168 @@
+import os
+import re
+import threading
+
+# Whole lines that lyric sites put around the lyrics. Matched case-insensitively,
+# ignoring surrounding whitespace and treating any run of spaces as one space.
+DEFAULT_JUNK_PHRASES = (
+    "Embed",
+    "You might also like",
+    "Translations",
+    "Read More",
+    "See upcoming pop shows",
+    "See upcoming rock shows",
+    "See upcoming rap shows",
+    "Advertisement",
+    "Advertisements",
+    "Sponsored",
+    "Submit Corrections",
+    "Report a problem",
+    "Report a correction",
+    "Click to rate this song",
+    "Thanks for the lyrics",
+    "Lyrics powered by www.musixmatch.com",
+    "Powered by Musixmatch",
+    "Lyrics provided by Musixmatch",
+    "Lyrics licensed and provided by LyricFind",
+    "Lyrics terms of use",
+    "Share this song",
+    "Copy lyrics",
+    "Print lyrics",
+)
+
+# Regular expressions for junk lines that vary (counts, prices, names). Each must
+# match a whole line; they are case-sensitive unless they say otherwise.
+DEFAULT_JUNK_PATTERNS = (
+    r"\d+\s*Contributors?.*",                    # "68 ContributorsTranslations...Song Lyrics"
+    r"\d+\s*Embed",
+    r"See .{1,80} Live(?:Get tickets as low as \$\d+)?",
+    r"Get tickets as low as \$\d+.*",
+    r"(?i:writer\(s\):.*)",
+    r"(?i:songwriters?:.*)",
+    r"(?i:lyrics (?:licensed|provided) (?:and|&) (?:provided|licensed) by .*)",
+)
+
+# Junk glued onto a real lyric line; only the matched part is removed
+DEFAULT_INLINE_PATTERNS = (
+    r"(?<![\s\d])\d*Embed(?=[^\S\n]*$)",         # "...last line42Embed"
+    r"^You might also like(?=\S)",               # "You might also likeNext line"
+)
+
+# Optional user rules in the songs directory, one per line: a phrase, or "re:" + a
+# whole-line regular expression. Blank lines and lines starting with "#" are ignored.
+JUNK_RULES_FILE = "junk_phrases.txt"
+
+
+def _phrase_key(phrase):
+    return " ".join(phrase.lower().split())
+
+
+def _trie_regex(phrases):
+    """
+    One regular expression matching any of the phrases, built from a prefix
+    trie so phrases share their common prefixes: the engine walks the trie
+    character by character instead of trying every phrase in turn, which
+    keeps matching linear in the text with thousands of phrases.
+    """
+    trie = {}
+    for phrase in phrases:
+        node = trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[""] = {}  # End of a phrase
+    return _node_regex(trie)
+
+
+def _node_regex(node):
+    branches = []
+    for char in sorted(node):
+        if char:
+            branches.append(("[^\\S\\n]+" if char == " " else re.escape(char)) + _node_regex(node[char]))
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    if "" in node:
+        # A phrase ends here and longer ones continue
+        return "(?:" + body + ")?" if len(branches) == 1 else body + "?"
+    return body
+
+
+class JunkFilter:
+    """
+    Strips lines lyric sites add to copied lyrics ("Embed", "You might also
+    like", contributor counts, ads) in one pass. All rules - literal phrases,
+    whole-line patterns and inline patterns - are compiled into a single
+    regular expression, so the text is scanned once however many rules there
+    are.
+    """
+
+    def __init__(self, phrases=DEFAULT_JUNK_PHRASES, patterns=DEFAULT_JUNK_PATTERNS,
+                 inline_patterns=DEFAULT_INLINE_PATTERNS):
+        self.phrases = sorted({_phrase_key(phrase) for phrase in phrases if phrase.strip()})
+        self.patterns = tuple(patterns)
+        self.inline_patterns = tuple(inline_patterns)
+
+        line_rules = list(self.patterns)
+        if self.phrases:
+            line_rules.insert(0, "(?i:" + _trie_regex(self.phrases) + ")")
+        alternatives = []
+        if line_rules:
+            # A junk line goes together with its line break
+            alternatives.append(r"^[^\S\n]*(?:" + "|".join(line_rules) + r")[^\S\n]*(?:\n|\Z)")
+        alternatives.extend(self.inline_patterns)
+        self.pattern = re.compile("|".join(alternatives) or r"(?!)", re.MULTILINE)
+
+    def __len__(self):
+        return len(self.phrases) + len(self.patterns) + len(self.inline_patterns)
+
+    def clean(self, text):
+        """Return text without junk lines and inline junk."""
+        return self.pattern.sub("", text) if text else text
+
+    def clean_count(self, text):
+        """Like clean(), also returning how many pieces of junk were removed."""
+        return self.pattern.subn("", text) if text else (text, 0)
+
+    @classmethod
+    def from_file(cls, path):
+        """Default rules plus the rules in a junk phrases file (if it exists)."""
+        phrases = list(DEFAULT_JUNK_PHRASES)
+        patterns = list(DEFAULT_JUNK_PATTERNS)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    rule = line.strip()
+                    if not rule or rule.startswith("#"):
+                        continue
+                    if rule.startswith("re:"):
+                        try:
+                            re.compile(rule[3:])
+                            patterns.append(rule[3:])
+                        except re.error as ex:
+                            print(f"⚠️ Skipping invalid junk pattern {rule!r}: {ex}")
+                    else:
+                        phrases.append(rule)
+        except FileNotFoundError:
+            pass
+        except Exception as ex:
+            print(f"❌ Error reading junk phrases from {path}: {ex}")
+        return cls(phrases, patterns)
+
+
+_filters = {}  # path -> (mtime, JunkFilter)
+_filters_lock = threading.Lock()
+
+
+def get_junk_filter(directory="saved_songs"):
+    """JunkFilter for a songs directory, recompiled only when its rules file changes."""
+    path = os.path.join(directory, JUNK_RULES_FILE)
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        mtime = None
+    with _filters_lock:
+        cached = _filters.get(path)
+        if cached is None or cached[0] != mtime:
+            cached = _filters[path] = (mtime, JunkFilter.from_file(path))
+            print(f"🧹 Junk filter ready with {len(cached[1])} rules")
+        return cached[1]
@@ -0,0 +1,53 @@
+import functools
+import re
+from collections import namedtuple
+
+# One tagged part of the lyrics: lines [start, end) of the formatted lyrics, the tag
+# line included. occurrence counts repeats of the same label (the second "Chorus" is 2).
+Section = namedtuple("Section", ["label", "kind", "start", "end", "occurrence"])
+
+# "[Verse 1]", "[Chorus]", "[Verse 2: Artist]" on a line of their own
+_SECTION_TAG = re.compile(r"^[^\S\n]*\[([^\[\]\n]{1,60})\][^\S\n]*$", re.MULTILINE)
+_KIND_WORD = re.compile(r"[a-z]+(?:-[a-z]+)?")
+
+SECTION_KINDS = {
+    "verse": "verse", "chorus": "chorus", "refrain": "chorus", "hook": "chorus",
+    "pre-chorus": "pre-chorus", "prechorus": "pre-chorus", "post-chorus": "post-chorus",
+    "bridge": "bridge", "intro": "intro", "outro": "outro", "interlude": "interlude",
+    "instrumental": "interlude", "solo": "interlude", "breakdown": "bridge",
+}
+
+
+@functools.lru_cache(maxsize=64)
+def parse_sections(lyrics):
+    """
+    Split lyrics into their tagged sections in one pass over the text.
+    Returns a tuple of Sections in order; lines before the first tag (or
+    lyrics without tags) belong to no section.
+    """
+    sections = []
+    seen = {}
+    line = 0
+    position = 0
+    for match in _SECTION_TAG.finditer(lyrics or ""):
+        line += lyrics.count("\n", position, match.start())
+        position = match.start()
+        label = match.group(1).split(":", 1)[0].strip() or match.group(1).strip()
+        kind_word = _KIND_WORD.match(label.lower())
+        kind = SECTION_KINDS.get(kind_word.group(0), "other") if kind_word else "other"
+        seen[label.casefold()] = occurrence = seen.get(label.casefold(), 0) + 1
+        if sections:
+            sections[-1] = sections[-1]._replace(end=line)
+        sections.append(Section(label, kind, line, None, occurrence))
+    if sections:
+        total_lines = line + lyrics.count("\n", position) + 1
+        sections[-1] = sections[-1]._replace(end=total_lines)
+    return tuple(sections)
+
+
+def section_at_line(sections, line_index):
+    """The section holding a lyric line, or None."""
+    for section in sections:
+        if section.start <= line_index < section.end:
+            return section
+    return None
@@ -0,0 +1,106 @@
+import functools
+import sys
+from collections import namedtuple
+
+# Lines of a repeated stanza shown in collapsed mode
+REPEAT_MARKER = "↻"
+
+_STR_OVERHEAD = sys.getsizeof("")
+_TUPLE_SLOT = 8
+
+
+def pack_lyrics(text, shared=None):
+    """
+    Compact in-memory form of a lyrics text. Stanzas (blocks between blank
+    lines) that occur more than once - choruses - are kept as one string and
+    referenced from a tuple; `shared` is another packed text (e.g. the
+    formatted lyrics when packing the original paste) whose stanzas are
+    reused too. Text that would not get smaller is returned unchanged.
+    """
+    if not text or "\n\n" not in text:
+        return text
+    pool = {}
+    if isinstance(shared, tuple):
+        for stanza in shared:
+            pool.setdefault(stanza, stanza)
+    known = len(pool)
+    stanzas = text.split("\n\n")
+    packed = tuple(pool.setdefault(stanza, stanza) for stanza in stanzas)
+    new_stanzas = list(pool)[known:]
+    packed_size = _TUPLE_SLOT * (len(packed) + 3) + sum(len(stanza) + _STR_OVERHEAD for stanza in new_stanzas)
+    if packed_size >= len(text) + _STR_OVERHEAD:
+        return text
+    return packed
+
+
+@functools.lru_cache(maxsize=64)
+def _join_stanzas(packed):
+    return "\n\n".join(packed)
+
+
+def unpack_lyrics(packed):
+    """Full text of a packed lyrics value. Recently used texts are cached, so
+    asking twice returns the same string object."""
+    if packed is None or isinstance(packed, str):
+        return packed
+    return _join_stanzas(packed)
+
+
+# Collapsed-repeats view of some lyrics: the display text plus line maps both ways
+# (to_display[source line] -> display line, to_source[display line] -> source line)
+CollapsedLyrics = namedtuple("CollapsedLyrics", ["text", "to_display", "to_source", "collapsed"])
+
+
+def _stanza_key(lines):
+    """Normalized identity of a stanza: its lyric lines without the section tag."""
+    body = lines[1:] if lines and lines[0].startswith("[") and lines[0].rstrip().endswith("]") else lines
+    return tuple(" ".join(line.casefold().split()) for line in body if line.strip())
+
+
+@functools.lru_cache(maxsize=32)
+def collapse_repeats(lyrics):
+    """
+    Display text where every repeat of an earlier stanza (same lyric lines,
+    ignoring case, spacing and the section tag) is shrunk to its tag line
+    plus one reference line. Single-line stanzas are never collapsed.
+    """
+    source_lines = lyrics.split("\n") if lyrics else [""]
+    display_lines = []
+    to_display = []
+    to_source = []
+    seen = set()
+    collapsed = 0
+
+    start = 0
+    while start < len(source_lines):
+        end = start
+        while end < len(source_lines) and source_lines[end].strip():
+            end += 1
+        stanza = source_lines[start:end]
+        key = _stanza_key(stanza)
+        if len(key) > 1 and key in seen:
+            collapsed += 1
+            has_tag = len(stanza) > len(key)
+            first_lyric = next(line for line in stanza[1 if has_tag else 0:] if line.strip())
+            if has_tag:
+                to_source.append(start)
+                display_lines.append(stanza[0])
+            reference_line = len(display_lines)
+            to_source.append(start + (1 if has_tag else 0))
+            display_lines.append(f"{REPEAT_MARKER} {first_lyric.strip()} …")
+            for offset in range(len(stanza)):
+                to_display.append(reference_line - 1 if has_tag and offset == 0 else reference_line)
+        else:
+            seen.add(key)
+            for index in range(start, end):
+                to_display.append(len(display_lines))
+                to_source.append(index)
+                display_lines.append(source_lines[index])
+        if end < len(source_lines):
+            # The blank line after the stanza
+            to_display.append(len(display_lines))
+            to_source.append(end)
+            display_lines.append(source_lines[end])
+        start = end + 1
+
+    return CollapsedLyrics("\n".join(display_lines), tuple(to_display), tuple(to_source), collapsed)
@@ -4,11 +4,14 @@ Main entry point for Better Lyrics Mobile Android App
 """
 import flet as ft
 from better_lyrics_mobile import main
+from library_service import get_library_service
 
 def app_main(page: ft.Page):
     """Main app function that calls the mobile implementation"""
     return main(page)
 
 if __name__ == "__main__":
+    # Load the shared library once, before the first session connects
+    get_library_service("saved_songs")
     # Run the mobile app
     ft.app(target=app_main, port=8080, host="0.0.0.0")
@@ -0,0 +1,243 @@
+import json
+import os
+import threading
+import time
+from collections import Counter
+from datetime import date, timedelta
+
+from library_store import file_lock
+
+
+class PlayStats:
+    """
+    Rollups of the play log - plays per song, artist, day and month plus the
+    daily streak - updated one event at a time, so reading them never scans
+    the history.
+    """
+
+    def __init__(self):
+        self.total = 0
+        self.by_song = Counter()
+        self.by_artist = Counter()
+        self.by_day = Counter()     # "YYYY-MM-DD" -> plays
+        self.by_month = {}          # "YYYY-MM" -> Counter(song id -> plays)
+        self.longest_streak = 0
+        self._streak_end = None     # date ordinal of the last day of the latest run
+        self._streak_length = 0
+
+    def add(self, song_id, artist, timestamp):
+        """Count one play."""
+        day = date.fromtimestamp(timestamp)
+        key = day.isoformat()
+        self.total += 1
+        self.by_song[song_id] += 1
+        if artist:
+            self.by_artist[artist] += 1
+        new_day = key not in self.by_day
+        self.by_day[key] += 1
+        month = self.by_month.get(key[:7])
+        if month is None:
+            month = self.by_month[key[:7]] = Counter()
+        month[song_id] += 1
+        if new_day:
+            self._add_day(day.toordinal())
+
+    def _add_day(self, ordinal):
+        if self._streak_end is None or ordinal > self._streak_end + 1:
+            self._streak_length = 1
+        elif ordinal == self._streak_end + 1:
+            self._streak_length += 1
+        else:
+            # An older day logged late by another device: recount from the days
+            self._recount_streaks()
+            return
+        self._streak_end = ordinal
+        self.longest_streak = max(self.longest_streak, self._streak_length)
+
+    def _recount_streaks(self):
+        self.longest_streak = 0
+        self._streak_end = None
+        self._streak_length = 0
+        for ordinal in sorted(date.fromisoformat(key).toordinal() for key in self.by_day):
+            self._add_day(ordinal)
+
+    def current_streak(self, today=None):
+        """Days in a row with at least one play, ending today or yesterday."""
+        today = (today or date.today()).toordinal()
+        if self._streak_end is not None and today - 1 <= self._streak_end <= today:
+            return self._streak_length
+        return 0
+
+    def most_played(self, month=None, limit=10):
+        """[(song id, plays)] of a month ("YYYY-MM", default this month), most played first."""
+        month = month or date.today().isoformat()[:7]
+        return self.by_month.get(month, Counter()).most_common(limit)
+
+    def top_artists(self, limit=10):
+        """[(artist, plays)], most played first."""
+        return self.by_artist.most_common(limit)
+
+    def recent_days(self, days=14, today=None):
+        """[(date, plays)] for the last `days` days, oldest first."""
+        today = today or date.today()
+        return [(day, self.by_day.get(day.isoformat(), 0))
+                for day in (today - timedelta(days=offset) for offset in range(days - 1, -1, -1))]
+
+    # --- Snapshot form ---
+
+    def to_dict(self):
+        return {
+            "total": self.total,
+            "by_song": self.by_song,
+            "by_artist": self.by_artist,
+            "by_day": self.by_day,
+            "by_month": self.by_month,
+            "longest_streak": self.longest_streak,
+            "streak_end": self._streak_end,
+            "streak_length": self._streak_length,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls()
+        stats.total = data["total"]
+        stats.by_song = Counter(data["by_song"])
+        stats.by_artist = Counter(data["by_artist"])
+        stats.by_day = Counter(data["by_day"])
+        stats.by_month = {month: Counter(songs) for month, songs in data["by_month"].items()}
+        stats.longest_streak = data["longest_streak"]
+        stats._streak_end = data["streak_end"]
+        stats._streak_length = data["streak_length"]
+        return stats
+
+
+class PlayHistory:
+    """
+    Append-only play log in saved_songs/play_history.jsonl, one
+    {"t", "song", "artist"} line per play, with PlayStats kept in memory.
+
+    record() counts a play at once and queues its line; flush() appends the
+    queued lines under a file lock after reading whatever other writers
+    appended. play_stats.json snapshots the rollups together with the log
+    offset they cover, so loading replays only the lines written after it.
+    """
+    LOG_NAME = "play_history.jsonl"
+    SNAPSHOT_NAME = "play_stats.json"
+    LOCK_NAME = ".play_history.lock"
+
+    def __init__(self, directory="saved_songs"):
+        self.directory = directory
+        self.log_file = os.path.join(directory, self.LOG_NAME)
+        self.snapshot_file = os.path.join(directory, self.SNAPSHOT_NAME)
+        self.lock_file = os.path.join(directory, self.LOCK_NAME)
+        self.stats = PlayStats()
+        self._offset = 0        # bytes of the log covered by self.stats
+        self._snapshot_offset = 0
+        self._pending = []      # events counted but not yet written
+        self._lock = threading.RLock()
+        os.makedirs(directory, exist_ok=True)
+
+    def load(self):
+        """Read the snapshot and replay the log lines after it (the whole log if there is no usable snapshot)."""
+        with self._lock, file_lock(self.lock_file):
+            self.stats, self._offset = self._read_snapshot()
+            self._snapshot_offset = self._offset
+            replayed = self._read_log()
+        print(f"📊 Loaded {self.stats.total} plays ({replayed} replayed from {self.log_file})")
+
+    def _read_snapshot(self):
+        try:
+            with open(self.snapshot_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            offset = data["offset"]
+            if offset <= os.path.getsize(self.log_file):
+                return PlayStats.from_dict(data["stats"]), offset
+            print("⚠️ Play history is shorter than its snapshot - recounting")
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"❌ Error reading play stats snapshot: {e}")
+        return PlayStats(), 0
+
+    def _read_log(self):
+        """Apply log lines after self._offset to the stats; returns how many."""
+        if not os.path.exists(self.log_file):
+            self._offset = 0
+            return 0
+        with open(self.log_file, 'rb') as f:
+            f.seek(self._offset)
+            data = f.read()
+        end = data.rfind(b"\n") + 1  # Ignore a partially written last line
+        self._offset += end
+        count = 0
+        for line in data[:end].splitlines():
+            if not line.strip():
+                continue
+            try:
+                event = json.loads(line)
+                self.stats.add(event["song"], event.get("artist"), event["t"])
+                count += 1
+            except (ValueError, KeyError, TypeError, OverflowError) as e:
+                print(f"⚠️ Skipping bad play history line: {e}")
+        return count
+
+    def record(self, song_id, artist=None, timestamp=None):
+        """Count a play now; its log line is written by the next flush()."""
+        timestamp = time.time() if timestamp is None else timestamp
+        with self._lock:
+            self.stats.add(song_id, artist, timestamp)
+            self._pending.append({"t": round(timestamp, 3), "song": song_id, "artist": artist})
+
+    def refresh(self):
+        """Pick up plays other writers logged (the stats already hold our own)."""
+        with self._lock, file_lock(self.lock_file):
+            count = self._read_log()
+            self._append(self._pending)
+            self._pending = []
+        return count
+
+    def flush(self):
+        """Write queued plays to the log."""
+        with self._lock:
+            if self._pending:
+                self.refresh()
+
+    def _append(self, events):
+        if not events:
+            return
+        data = "".join(json.dumps(event, ensure_ascii=False) + "\n" for event in events).encode("utf-8")
+        with open(self.log_file, 'ab') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+            self._offset = f.tell()
+
+    def summary(self, limit=10):
+        """Everything the stats view shows, read from the rollups under the lock."""
+        with self._lock:
+            stats = self.stats
+            return {
+                "total": stats.total,
+                "songs_played": len(stats.by_song),
+                "current_streak": stats.current_streak(),
+                "longest_streak": stats.longest_streak,
+                "month": stats.most_played(limit=limit),
+                "all_time": stats.by_song.most_common(limit),
+                "artists": stats.top_artists(limit),
+                "recent_days": stats.recent_days(),
+            }
+
+    def save_snapshot(self):
+        """Write the rollups with the log offset they cover (skipped when nothing changed since the last one)."""
+        with self._lock:
+            self.flush()
+            if self._offset == self._snapshot_offset:
+                return
+            tmp_file = f"{self.snapshot_file}.{os.getpid()}.tmp"
+            try:
+                with open(tmp_file, 'w', encoding='utf-8') as f:
+                    json.dump({"offset": self._offset, "stats": self.stats.to_dict()}, f, ensure_ascii=False)
+                os.replace(tmp_file, self.snapshot_file)
+                self._snapshot_offset = self._offset
+            except Exception as e:
+                print(f"❌ Error saving play stats snapshot: {e}")
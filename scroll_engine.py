@@ -0,0 +1,296 @@
+import json
+import threading
+import time
+from collections import namedtuple
+
+from text_layout import line_position, offset_of_line
+
+# Compact description of a scroll timeline: the offset at `stamp` (engine clock)
+# plus the speed is enough to extrapolate
+ScrollState = namedtuple("ScrollState", ["playing", "offset", "speed", "stamp"])
+
+# A ScrollState in lyric lines instead of pixels, for devices with other widths and
+# font sizes: where the scroll is at `stamp` and where it will be `ahead` seconds later
+LineState = namedtuple("LineState", ["playing", "line", "fraction", "ahead_line", "ahead_fraction", "ahead", "stamp"])
+
+# Seconds between the line positions of a LineState (and between a leader's re-broadcasts)
+LINE_SYNC_INTERVAL = 1.0
+
+
+def to_line_state(state, layout, ahead=LINE_SYNC_INTERVAL):
+    """Describe a ScrollState by the lyric lines it passes in `layout` (the sender's layout)."""
+    line, fraction = line_position(layout, state.offset)
+    later = state.offset + state.speed * ahead if state.playing else state.offset
+    ahead_line, ahead_fraction = line_position(layout, later)
+    return LineState(state.playing, line, round(fraction, 4), ahead_line, round(ahead_fraction, 4), ahead, state.stamp)
+
+
+def from_line_state(line_state, layout):
+    """
+    ScrollState in `layout` (the receiver's layout) that is at the same lines
+    as the sender at `stamp` and again `ahead` seconds later. Line heights
+    differ between layouts, so the speed is only right for that window; the
+    sender re-broadcasts every LINE_SYNC_INTERVAL while playing.
+    """
+    offset = offset_of_line(layout, line_state.line, line_state.fraction)
+    speed = 0.0
+    if line_state.playing and line_state.ahead > 0:
+        later = offset_of_line(layout, line_state.ahead_line, line_state.ahead_fraction)
+        speed = max(0.0, (later - offset) / line_state.ahead)
+    return ScrollState(line_state.playing, offset, speed, line_state.stamp)
+
+
+class ScrollEngine:
+    """
+    Time-based auto-scroll driver. The scroll position is a function of time
+    (anchor offset + speed * elapsed), so it can be paused, sought, re-timed
+    and extrapolated without tracking per-frame state.
+
+    Two ways of getting the position to the client:
+    - "frame": send scroll_to(duration=0) every frame (40 fps) - one websocket
+      message per frame per viewer.
+    - "keyframe": send one scroll_to(duration=K, curve=linear) every K seconds
+      aimed at where the scroll should be at the end of the interval. The
+      client animates locally and each keyframe re-syncs any drift.
+    """
+    FRAME_INTERVAL = 0.025    # 40 fps
+    KEYFRAME_INTERVAL = 3.0   # seconds between keyframes
+
+    def __init__(self, on_scroll, mode="keyframe", clock=time.monotonic, wait=None):
+        """
+        on_scroll(offset, duration_ms) sends one scroll command to the client.
+        clock/wait can be replaced to run the engine on a virtual timeline.
+        """
+        self.on_scroll = on_scroll
+        self.mode = mode
+        self.clock = clock
+        self._wake = threading.Event()
+        self.wait = wait or self._wait_for_wake
+        self._lock = threading.RLock()
+
+        self.playing = False
+        self.speed = 0.0            # pixels per second
+        self.max_offset = None      # clamp when the content height is known
+        self._anchor_offset = 0.0
+        self._anchor_time = clock()
+        self._generation = 0
+        self._needs_jump = False
+        self._elapsed_before = 0.0  # playing time accumulated before the current play()
+        self._play_started = None
+
+        self.stats = {"messages": 0, "bytes": 0}
+        self.on_state = None  # on_state(ScrollState) after every play/pause/seek/speed change
+
+    # --- Position ---
+
+    def position(self, now=None):
+        """Current (or extrapolated) scroll offset in pixels."""
+        with self._lock:
+            if not self.playing:
+                return self._clamp(self._anchor_offset)
+            now = self.clock() if now is None else now
+            return self._clamp(self._anchor_offset + self.speed * (now - self._anchor_time))
+
+    def elapsed(self):
+        """Seconds spent playing since the last reset (pauses excluded)."""
+        with self._lock:
+            if self.playing and self._play_started is not None:
+                return self._elapsed_before + (self.clock() - self._play_started)
+            return self._elapsed_before
+
+    def set_elapsed(self, seconds):
+        """Restore the elapsed playing time (e.g. when resuming a song)."""
+        with self._lock:
+            self._elapsed_before = max(0.0, seconds)
+            if self.playing:
+                self._play_started = self.clock()
+
+    def _clamp(self, offset):
+        offset = max(0.0, offset)
+        if self.max_offset is not None:
+            offset = min(offset, self.max_offset)
+        return offset
+
+    def state(self):
+        """Current timeline as a ScrollState."""
+        with self._lock:
+            now = self.clock()
+            return ScrollState(self.playing, round(self.position(now), 2), self.speed, now)
+
+    def _notify_state(self):
+        if self.on_state is not None:
+            try:
+                self.on_state(self.state())
+            except Exception as ex:
+                print(f"Scroll state error: {ex}")
+
+    def _reanchor(self, offset=None):
+        now = self.clock()
+        self._anchor_offset = self.position(now) if offset is None else self._clamp(offset)
+        self._anchor_time = now
+
+    # --- Controls ---
+
+    def play(self, start_thread=True):
+        """Start scrolling from the current position."""
+        with self._lock:
+            if self.playing:
+                return
+            self._reanchor()
+            self.playing = True
+            self._play_started = self._anchor_time
+            self._needs_jump = True
+            self._generation += 1
+            generation = self._generation
+            self._wake.clear()
+        self._notify_state()
+        if start_thread:
+            threading.Thread(target=self.run, args=(generation,), daemon=True).start()
+        return generation
+
+    def pause(self):
+        """Stop scrolling and pin the client to the current position."""
+        with self._lock:
+            if not self.playing:
+                return
+            self._reanchor()
+            self.playing = False
+            self._elapsed_before += self._anchor_time - self._play_started
+            self._play_started = None
+            self._generation += 1
+            offset = self._anchor_offset
+        self._wake.set()
+        if self.mode == "keyframe":
+            # Cancel the client-side animation where it currently is
+            self._send(offset, 0)
+        self._notify_state()
+
+    def seek(self, offset):
+        """Jump to an offset, keeping the play state."""
+        with self._lock:
+            self._reanchor(offset)
+            playing = self.playing
+            self._needs_jump = True
+            offset = self._anchor_offset
+        if playing:
+            self._wake.set()
+        else:
+            self._send(offset, 0)
+        self._notify_state()
+
+    def set_speed(self, pixels_per_second):
+        """Change speed without a jump; keyframes are re-aimed immediately."""
+        with self._lock:
+            self._reanchor()
+            self.speed = max(0.0, pixels_per_second)
+        self._wake.set()
+        self._notify_state()
+
+    def resync(self):
+        """Re-send the current position (e.g. after the scroll control was rebuilt)."""
+        with self._lock:
+            self._needs_jump = True
+            playing = self.playing
+            offset = self.position()
+        if playing:
+            self._wake.set()
+        else:
+            self._send(offset, 0)
+
+    def reset(self):
+        """Stop and return to the top."""
+        self.pause()
+        with self._lock:
+            self._anchor_offset = 0.0
+            self._anchor_time = self.clock()
+            self._elapsed_before = 0.0
+        self._notify_state()
+
+    def apply_state(self, state, start_thread=True):
+        """
+        Follow another engine: extrapolate its ScrollState to now and match
+        position, speed and play state in one step (no on_state callback, so
+        followers never re-broadcast). Returns the run generation if a scroll
+        loop has to be started.
+        """
+        with self._lock:
+            now = self.clock()
+            offset = state.offset
+            if state.playing:
+                offset += state.speed * max(0.0, now - state.stamp)
+            self.speed = max(0.0, state.speed)
+            self._anchor_offset = self._clamp(offset)
+            self._anchor_time = now
+            self._needs_jump = True
+            generation = None
+            if state.playing and not self.playing:
+                self.playing = True
+                self._play_started = now
+                self._generation += 1
+                generation = self._generation
+                self._wake.clear()
+            elif not state.playing and self.playing:
+                self.playing = False
+                self._elapsed_before += now - self._play_started
+                self._play_started = None
+                self._generation += 1
+            playing = self.playing
+            anchor = self._anchor_offset
+        if not playing:
+            self._wake.set()
+            self._send(anchor, 0)
+        elif generation is None:
+            self._wake.set()  # Loop already running: re-aim the next keyframe
+        elif start_thread:
+            threading.Thread(target=self.run, args=(generation,), daemon=True).start()
+        return generation
+
+    # --- Loop ---
+
+    def _wait_for_wake(self, timeout):
+        woken = self._wake.wait(timeout)
+        self._wake.clear()
+        return woken
+
+    def run(self, generation=None):
+        """Scroll loop; exits when paused or superseded by a newer play()."""
+        generation = self._generation if generation is None else generation
+        while True:
+            with self._lock:
+                if not self.playing or generation != self._generation:
+                    return
+                now = self.clock()
+                jump = self._needs_jump
+                self._needs_jump = False
+                current = self.position(now)
+                target = self.position(now + self.KEYFRAME_INTERVAL)
+
+            if self.mode == "frame":
+                self._send(current, 0)
+                self.wait(self.FRAME_INTERVAL)
+                continue
+
+            if jump:
+                self._send(current, 0)
+            self._send(target, int(self.KEYFRAME_INTERVAL * 1000))
+            self.wait(self.KEYFRAME_INTERVAL)
+
+    def _send(self, offset, duration_ms):
+        """Send one scroll command and account for its traffic."""
+        self.stats["messages"] += 1
+        self.stats["bytes"] += self.estimate_message_bytes(offset, duration_ms)
+        try:
+            self.on_scroll(offset, duration_ms)
+        except Exception as ex:
+            print(f"Scroll error: {ex}")
+
+    @staticmethod
+    def estimate_message_bytes(offset, duration_ms):
+        """Approximate size of the Flet invokeMethod message carrying a scroll_to."""
+        arguments = {"offset": str(offset), "duration": str(duration_ms)}
+        if duration_ms:
+            arguments["curve"] = "linear"
+        return len(json.dumps({
+            "action": "invokeMethod",
+            "payload": {"controlId": "_000", "methodId": "0" * 32, "methodName": "scroll_to", "arguments": arguments},
+        }))
@@ -0,0 +1,333 @@
+import bisect
+import heapq
+import json
+import os
+import time
+
+from song_library import collation_group, collation_key
+
+SMART_PLAYLISTS_FILE = "smart_playlists.json"
+
+
+class SmartPlaylist:
+    """
+    A rule-based playlist kept as a materialized view of the song index: the
+    index calls add / remove / update on every library change and the view
+    re-positions only that song (a bisect into its sorted members), so
+    reading it never filters or sorts the library.
+
+    Subclasses define key(song): the song's sort key in the view, or None
+    when the rule leaves it out. Members are read in ascending key order,
+    or descending when `newest_first` is set.
+    """
+    rule = None
+    newest_first = False
+
+    def __init__(self, name):
+        self.name = name
+        self._keys = {}      # song_id -> key of the members
+        self._members = []   # sorted (key, song_id)
+
+    def __len__(self):
+        return len(self._members)
+
+    def __contains__(self, song_id):
+        return song_id in self._keys
+
+    def key(self, song):
+        raise NotImplementedError
+
+    def rebuild(self, songs):
+        """Recompute the view from scratch (when it is created and on library reloads)."""
+        self._keys = {}
+        for song in songs:
+            key = self.key(song)
+            if key is not None:
+                self._keys[song["id"]] = key
+        self._members = sorted((key, song_id) for song_id, key in self._keys.items())
+
+    def add(self, song):
+        key = self.key(song)
+        if key is not None:
+            self._keys[song["id"]] = key
+            bisect.insort(self._members, (key, song["id"]))
+
+    def remove(self, song_id):
+        key = self._keys.pop(song_id, None)
+        if key is None:
+            return
+        position = bisect.bisect_left(self._members, (key, song_id))
+        if position < len(self._members) and self._members[position][1] == song_id:
+            del self._members[position]
+
+    def update(self, song):
+        if self._keys.get(song["id"]) != self.key(song):
+            self.remove(song["id"])
+            self.add(song)
+
+    def song_ids(self):
+        """Member ids in playlist order."""
+        entries = reversed(self._members) if self.newest_first else self._members
+        return [song_id for _, song_id in entries]
+
+    def describe(self):
+        """One-line description of the rule for the library view."""
+        raise NotImplementedError
+
+    def to_dict(self):
+        return {"name": self.name, "rule": self.rule}
+
+
+class ArtistPlaylist(SmartPlaylist):
+    """Every song by one artist (accent- and case-insensitive), by title."""
+    rule = "artist"
+
+    def __init__(self, name, artist):
+        super().__init__(name)
+        self.artist = artist
+        self._group = collation_group(collation_key(artist))
+
+    def key(self, song):
+        if collation_group(song["sort_artist"]) != self._group:
+            return None
+        return song["sort_title"]
+
+    def describe(self):
+        return f"Songs by {self.artist}"
+
+    def to_dict(self):
+        return dict(super().to_dict(), artist=self.artist)
+
+
+class NeverPlayedPlaylist(SmartPlaylist):
+    """Songs that were never played, newest first."""
+    rule = "never_played"
+    newest_first = True
+
+    def key(self, song):
+        if song.get("play_count"):
+            return None
+        return song.get("created_at") or 0.0
+
+    def describe(self):
+        return "Songs you have never played"
+
+
+class RecentlyAddedPlaylist(SmartPlaylist):
+    """
+    Songs added in the last `days` days, newest first. Members are sorted by
+    creation time, so the ones that age out are a prefix of the list and are
+    dropped with one bisect when the view is read.
+    """
+    rule = "recently_added"
+    newest_first = True
+
+    def __init__(self, name, days=30):
+        super().__init__(name)
+        self.days = days
+
+    def _cutoff(self):
+        return time.time() - self.days * 86400
+
+    def key(self, song):
+        created_at = song.get("created_at") or 0.0
+        return created_at if created_at >= self._cutoff() else None
+
+    def update(self, song):
+        # Creation time never changes; only songs still inside the window are members
+        if song["id"] not in self._keys and self.key(song) is not None:
+            self.add(song)
+
+    def song_ids(self):
+        expired = bisect.bisect_left(self._members, (self._cutoff(),))
+        if expired:
+            for _, song_id in self._members[:expired]:
+                del self._keys[song_id]
+            del self._members[:expired]
+        return super().song_ids()
+
+    def describe(self):
+        return f"Songs added in the last {self.days} days"
+
+    def to_dict(self):
+        return dict(super().to_dict(), days=self.days)
+
+
+class MostPlayedPlaylist(SmartPlaylist):
+    """
+    The `limit` most played songs. The top songs sit in a min-heap and the
+    other played songs in a max-heap, so a play, a new song or a deletion
+    moves at most one song between them in O(log n) instead of sorting the
+    library. Heap entries are not removed when a song changes; they go stale
+    (their key no longer matches) and are skipped when they reach the top.
+    """
+    rule = "most_played"
+
+    def __init__(self, name, limit=25):
+        super().__init__(name)
+        self.limit = limit
+        self._all = {}          # song_id -> key of every played song
+        self._top = []          # min-heap of (key, song_id) for members
+        self._rest = []         # max-heap of (negated key, song_id) for the other played songs
+
+    def key(self, song):
+        play_count = song.get("play_count") or 0
+        if not play_count:
+            return None
+        return (play_count, song.get("last_played") or 0.0)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def rebuild(self, songs):
+        self._all = {}
+        for song in songs:
+            key = self.key(song)
+            if key is not None:
+                self._all[song["id"]] = key
+        best = heapq.nlargest(self.limit, ((key, song_id) for song_id, key in self._all.items()))
+        self._keys = {song_id: key for key, song_id in best}
+        self._top = best[::-1]  # Ascending order is a valid min-heap
+        self._rest = [((-key[0], -key[1]), song_id) for song_id, key in self._all.items() if song_id not in self._keys]
+        heapq.heapify(self._rest)
+
+    def add(self, song):
+        key = self.key(song)
+        if key is None:
+            return
+        self._all[song["id"]] = key
+        heapq.heappush(self._rest, ((-key[0], -key[1]), song["id"]))
+        self._rebalance()
+
+    def remove(self, song_id):
+        if self._all.pop(song_id, None) is None:
+            return
+        self._keys.pop(song_id, None)
+        self._rebalance()
+
+    def update(self, song):
+        song_id = song["id"]
+        key = self.key(song)
+        if key == self._all.get(song_id):
+            return
+        if key is None:
+            self.remove(song_id)
+            return
+        self._all[song_id] = key
+        if song_id in self._keys:
+            self._keys[song_id] = key
+            heapq.heappush(self._top, (key, song_id))
+        else:
+            heapq.heappush(self._rest, ((-key[0], -key[1]), song_id))
+        self._rebalance()
+
+    def _top_min(self):
+        """Smallest live member entry (stale entries are dropped on the way)."""
+        while self._top:
+            key, song_id = self._top[0]
+            if self._keys.get(song_id) == key:
+                return key, song_id
+            heapq.heappop(self._top)
+        return None
+
+    def _rest_max(self):
+        """Largest live non-member entry (stale entries are dropped on the way)."""
+        while self._rest:
+            negated, song_id = self._rest[0]
+            key = (-negated[0], -negated[1])
+            if song_id not in self._keys and self._all.get(song_id) == key:
+                return key, song_id
+            heapq.heappop(self._rest)
+        return None
+
+    def _rebalance(self):
+        # Fill free places, then swap while a non-member beats the weakest member
+        while True:
+            best = self._rest_max()
+            if best is None:
+                break
+            if len(self._keys) < self.limit:
+                heapq.heappop(self._rest)
+                self._keys[best[1]] = best[0]
+                heapq.heappush(self._top, best)
+                continue
+            weakest = self._top_min()
+            if weakest is None or best <= weakest:
+                break
+            heapq.heapreplace(self._top, best)
+            del self._keys[weakest[1]]
+            self._keys[best[1]] = best[0]
+            heapq.heapreplace(self._rest, ((-weakest[0][0], -weakest[0][1]), weakest[1]))
+        while len(self._keys) > self.limit:
+            weakest = self._top_min()
+            heapq.heappop(self._top)
+            del self._keys[weakest[1]]
+            heapq.heappush(self._rest, ((-weakest[0][0], -weakest[0][1]), weakest[1]))
+        # Stale entries pile up with every play; compact once they outnumber live ones
+        if len(self._top) > 2 * self.limit + 64:
+            self._top = [(key, song_id) for song_id, key in self._keys.items()]
+            heapq.heapify(self._top)
+        if len(self._rest) > 2 * len(self._all) + 64:
+            self._rest = [((-key[0], -key[1]), song_id) for song_id, key in self._all.items() if song_id not in self._keys]
+            heapq.heapify(self._rest)
+
+    def song_ids(self):
+        # Only the `limit` members are sorted, never the library
+        return [song_id for key, song_id in sorted(((key, song_id) for song_id, key in self._keys.items()), reverse=True)]
+
+    def describe(self):
+        return f"Your {self.limit} most played songs"
+
+    def to_dict(self):
+        return dict(super().to_dict(), limit=self.limit)
+
+
+SMART_RULES = {
+    "most_played": MostPlayedPlaylist,
+    "recently_added": RecentlyAddedPlaylist,
+    "artist": ArtistPlaylist,
+    "never_played": NeverPlayedPlaylist,
+}
+
+DEFAULT_SMART_PLAYLISTS = (
+    {"name": "🔥 Most Played", "rule": "most_played", "limit": 25},
+    {"name": "🆕 Recently Added", "rule": "recently_added", "days": 30},
+    {"name": "💤 Never Played", "rule": "never_played"},
+)
+
+
+def smart_playlist_from_dict(data):
+    """Build a smart playlist from its saved definition ({"name", "rule", ...rule options})."""
+    options = {key: value for key, value in data.items() if key not in ("name", "rule")}
+    return SMART_RULES[data["rule"]](data["name"], **options)
+
+
+def load_smart_playlists(directory="saved_songs"):
+    """Smart playlist definitions from the songs directory (the defaults when there is no file)."""
+    path = os.path.join(directory, SMART_PLAYLISTS_FILE)
+    definitions = DEFAULT_SMART_PLAYLISTS
+    if os.path.exists(path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                definitions = json.load(f)
+        except Exception as e:
+            print(f"❌ Error loading smart playlists from {path}: {e}")
+    playlists = []
+    for data in definitions:
+        try:
+            playlists.append(smart_playlist_from_dict(data))
+        except Exception as e:
+            print(f"⚠️ Skipping smart playlist {data!r}: {e}")
+    return playlists
+
+
+def save_smart_playlists(playlists, directory="saved_songs"):
+    """Write smart playlist definitions (the rules, not the members) to the songs directory."""
+    path = os.path.join(directory, SMART_PLAYLISTS_FILE)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump([playlist.to_dict() for playlist in playlists], f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        print(f"❌ Error saving smart playlists: {e}")
@@ -0,0 +1,573 @@
+import bisect
+import re
+import sys
+import time
+import unicodedata
+import uuid
+from datetime import datetime
+
+from lyrics_sections import parse_sections
+from lyrics_stanzas import pack_lyrics, unpack_lyrics
+
+
+_ARTICLE_PREFIX = "the "
+
+
+def collation_key(text, strip_article=True):
+    """
+    Build a Unicode-aware sort key: NFKC + casefold, with a leading "The "
+    ignored. Accents are dropped from the primary part of the key and only
+    used to break ties, so "Beyoncé" sorts next to "Beyonce".
+    """
+    folded = " ".join(unicodedata.normalize("NFKC", text or "").casefold().split())
+    if strip_article and folded.startswith(_ARTICLE_PREFIX) and len(folded) > len(_ARTICLE_PREFIX):
+        folded = folded[len(_ARTICLE_PREFIX):]
+    primary = "".join(ch for ch in unicodedata.normalize("NFKD", folded) if not unicodedata.combining(ch))
+    return f"{primary}\x00{folded}"
+
+
+def collation_group(key):
+    """Return the accent-insensitive part of a collation key (used to merge spelling variants)."""
+    return key.split("\x00", 1)[0]
+
+
+def iso_to_epoch(value):
+    """Convert an ISO timestamp from the library file to epoch seconds (None stays None)."""
+    if value is None or isinstance(value, (int, float)):
+        return value
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+    except ValueError:
+        return None
+
+
+def epoch_to_iso(value):
+    """Convert epoch seconds back to the ISO timestamp written to the library file."""
+    if value is None:
+        return None
+    return datetime.fromtimestamp(value).isoformat()
+
+
+class Song:
+    """
+    Compact record for one library song. Uses __slots__ instead of a per-song
+    dict, interns artist names (many songs share one artist) and keeps
+    timestamps as epoch seconds. Item access (song["title"], song.get(...))
+    is supported so views can treat it like the on-disk mapping; to_dict /
+    from_dict convert to and from the songs_library.json format, accepting
+    both the desktop and the older mobile entry shapes. Lyrics are held
+    packed (see lyrics_stanzas) so a chorus sung four times is stored once;
+    the lyrics / original_lyrics properties hand out the full text.
+    """
+    __slots__ = (
+        "id", "title", "artist", "_lyrics", "_original_lyrics",
+        "created_at", "last_played", "play_count", "is_favorite",
+        "sort_title", "sort_artist",
+        "resume_line", "resume_fraction", "resume_elapsed",
+        "display",  # per-song display profile (font size, speed...), replaced as a whole, never edited in place
+        "extra",  # unknown keys from newer files, kept so they survive a save
+        "_sections",  # (packed lyrics, parsed sections) cache, never saved
+    )
+    FIELDS = (
+        "id", "title", "artist", "lyrics", "original_lyrics",
+        "created_at", "last_played", "play_count", "is_favorite",
+        "sort_title", "sort_artist",
+        "resume_line", "resume_fraction", "resume_elapsed", "display",
+    )
+    TIMESTAMP_FIELDS = ("created_at", "last_played")
+
+    def __init__(self, title, artist, lyrics, original_lyrics=None, id=None, created_at=None,
+                 last_played=None, play_count=0, is_favorite=False, sort_title=None, sort_artist=None,
+                 resume_line=0, resume_fraction=0.0, resume_elapsed=0.0, display=None, extra=None):
+        self.id = id or str(uuid.uuid4())
+        self.title = title
+        self.artist = sys.intern(artist)
+        self.lyrics = lyrics
+        self.original_lyrics = original_lyrics or lyrics
+        self.created_at = time.time() if created_at is None else created_at
+        self.last_played = last_played
+        self.play_count = play_count
+        self.is_favorite = is_favorite
+        self.resume_line = resume_line
+        self.resume_fraction = resume_fraction
+        self.resume_elapsed = resume_elapsed
+        self.display = display or None
+        self.extra = extra or None
+        if sort_title is None or sort_artist is None:
+            apply_sort_keys(self)
+        else:
+            self.sort_title = sort_title
+            self.sort_artist = sort_artist
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a Song from a songs_library.json entry (desktop or mobile shape)."""
+        known = {}
+        extra = {}
+        for key, value in data.items():
+            if key in cls.FIELDS:
+                known[key] = value
+            elif key == "date_added":  # mobile app name for created_at
+                known.setdefault("created_at", value)
+            else:
+                extra[key] = value
+        for key in cls.TIMESTAMP_FIELDS:
+            if key in known:
+                known[key] = iso_to_epoch(known[key])
+        known.setdefault("title", "")
+        known.setdefault("artist", "")
+        known.setdefault("lyrics", "")
+        return cls(extra=extra, **known)
+
+    def to_dict(self):
+        """Return the songs_library.json representation."""
+        data = {
+            "id": self.id,
+            "title": self.title,
+            "artist": self.artist,
+            "lyrics": self.lyrics,
+            "original_lyrics": self.original_lyrics,
+            "created_at": epoch_to_iso(self.created_at),
+            "last_played": epoch_to_iso(self.last_played),
+            "play_count": self.play_count,
+            "is_favorite": self.is_favorite,
+            "sort_title": self.sort_title,
+            "sort_artist": self.sort_artist,
+        }
+        if self.resume_line or self.resume_fraction or self.resume_elapsed:
+            data["resume_line"] = self.resume_line
+            data["resume_fraction"] = self.resume_fraction
+            data["resume_elapsed"] = self.resume_elapsed
+        if self.display:
+            data["display"] = self.display
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    @property
+    def lyrics(self):
+        return unpack_lyrics(self._lyrics)
+
+    @lyrics.setter
+    def lyrics(self, text):
+        self._lyrics = pack_lyrics(text)
+
+    @property
+    def original_lyrics(self):
+        return unpack_lyrics(self._original_lyrics)
+
+    @original_lyrics.setter
+    def original_lyrics(self, text):
+        lyrics = getattr(self, "_lyrics", None)
+        if isinstance(lyrics, str) and text == lyrics:
+            self._original_lyrics = lyrics
+            return
+        # The original paste usually differs only in its header and junk lines,
+        # so most of its stanzas are the formatted lyrics' ones
+        packed = pack_lyrics(text, shared=lyrics)
+        self._original_lyrics = lyrics if packed == lyrics else packed
+
+    def copy(self, **changes):
+        """Return a new Song with some fields replaced (sort keys follow title/artist)."""
+        song = Song.__new__(Song)
+        for field in self.__slots__[:-1]:
+            setattr(song, field, getattr(self, field))
+        if song.extra:
+            song.extra = dict(song.extra)
+        for key, value in changes.items():
+            song[key] = value
+        if "title" in changes or "artist" in changes:
+            apply_sort_keys(song)
+        return song
+
+    def sections(self):
+        """Section structure of the lyrics ([Verse 1], [Chorus]...), parsed once per lyrics text."""
+        cached = getattr(self, "_sections", None)
+        if cached is None or cached[0] is not self._lyrics:
+            cached = self._sections = (self._lyrics, parse_sections(self.lyrics))
+        return cached[1]
+
+    # --- Mapping-style access ---
+
+    def __getitem__(self, key):
+        if key in self.FIELDS:
+            return getattr(self, key)
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key == "artist":
+            value = sys.intern(value)
+        if key in self.FIELDS:
+            setattr(self, key, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __contains__(self, key):
+        return key in self.FIELDS or bool(self.extra and key in self.extra)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __repr__(self):
+        return f"Song({self.title!r}, {self.artist!r}, id={self.id!r})"
+
+
+def apply_sort_keys(song):
+    """Compute and store the cached sort keys of a song (on save and on load of older files)."""
+    song["sort_title"] = collation_key(song.get("title", ""))
+    song["sort_artist"] = collation_key(song.get("artist", ""))
+    return song
+
+
+_ARTIST_TOKEN = re.compile(r"\w+|[&,+/]")
+_PLACEHOLDER_ARTISTS = frozenset({"", "unknown", "unknown artist"})
+# Words that may follow a main artist ("Drake feat. Rihanna", "Simon & Garfunkel")
+ARTIST_JOINERS = frozenset({"feat", "ft", "featuring", "with", "x", "and", "vs", "&", ",", "+", "/"})
+
+
+def artist_key(name):
+    """Normalized artist key, the same accent-insensitive key the artist sort order uses."""
+    if name.isascii():
+        # Same result as the Unicode path without the normalization passes
+        folded = " ".join(name.lower().split())
+        if folded.startswith(_ARTICLE_PREFIX) and len(folded) > len(_ARTICLE_PREFIX):
+            folded = folded[len(_ARTICLE_PREFIX):]
+        return folded
+    return collation_group(collation_key(name))
+
+
+class ArtistDirectory:
+    """
+    Known artist names as a hash of their normalized keys plus a word trie,
+    with reference counts so songs can be added and removed in any order.
+    match() answers "is this an artist?" with one dict lookup, falling back
+    to one walk down the trie, which also recognizes spelling variants of
+    the separators ("Jay Z" / "Jay-Z") and a known artist followed by
+    featured artists.
+    """
+
+    def __init__(self, names=()):
+        self._keys = {}  # artist_key -> reference count
+        self._root = {}  # token -> child node; "" -> reference count at the end of a name
+        self._names = 0
+        for name in names:
+            self.add(name)
+
+    def __len__(self):
+        return self._names
+
+    def __contains__(self, name):
+        return self.match(name) == 2
+
+    def add(self, name):
+        """Count one more use of an artist name."""
+        self.add_key(artist_key(name))
+
+    def discard(self, name):
+        """Count one less use of an artist name, forgetting it at zero."""
+        self.discard_key(artist_key(name))
+
+    def add_key(self, key):
+        """add() with a precomputed artist_key."""
+        if key in _PLACEHOLDER_ARTISTS:
+            return
+        self._keys[key] = self._keys.get(key, 0) + 1
+        node = self._root
+        for token in _ARTIST_TOKEN.findall(key):
+            node = node.setdefault(token, {})
+        if not node.get(""):
+            self._names += 1
+        node[""] = node.get("", 0) + 1
+
+    def discard_key(self, key):
+        """discard() with a precomputed artist_key."""
+        count = self._keys.get(key)
+        if not count:
+            return
+        if count > 1:
+            self._keys[key] = count - 1
+        else:
+            del self._keys[key]
+        path = [self._root]
+        for token in _ARTIST_TOKEN.findall(key):
+            node = path[-1].get(token)
+            if node is None:
+                return
+            path.append(node)
+        node = path[-1]
+        if not node.get(""):
+            return
+        node[""] -= 1
+        if node[""]:
+            return
+        del node[""]
+        self._names -= 1
+        # Prune the branch that no longer leads to any name
+        tokens = _ARTIST_TOKEN.findall(key)
+        for depth in range(len(tokens), 0, -1):
+            if path[depth]:
+                break
+            del path[depth - 1][tokens[depth - 1]]
+
+    def match(self, text):
+        """2 when text is a known artist, 1 when it starts with one followed by a joiner, else 0."""
+        key = artist_key(text)
+        if key in self._keys:
+            return 2
+        tokens = _ARTIST_TOKEN.findall(key)
+        node = self._root
+        best = 0
+        for position, token in enumerate(tokens):
+            node = node.get(token)
+            if node is None:
+                return best
+            if node.get("") and position + 1 < len(tokens) and tokens[position + 1] in ARTIST_JOINERS:
+                best = 1
+        return 2 if tokens and node.get("") else best
+
+
+class SongIndex:
+    """
+    Keeps pre-sorted orderings of the song library (title, artist and recently
+    played) so library views can be built as slices of an existing order
+    instead of re-sorting every song on each render. Smart playlists attached
+    with add_view() are told about every change the same way.
+    """
+    SORT_ORDERS = ("title", "artist", "recent")
+
+    def __init__(self, songs=()):
+        self._songs = {}  # song_id -> song
+        self._keys = {}   # song_id -> {order name: sort key}
+        self._orders = {name: [] for name in self.SORT_ORDERS}
+        self.artists = ArtistDirectory()  # Artists of the indexed songs (title/artist detection)
+        self.views = {}   # name -> smart playlist kept up to date with the library
+        self.rebuild(songs)
+
+    def __len__(self):
+        return len(self._songs)
+
+    def __contains__(self, song_id):
+        return song_id in self._songs
+
+    def _sort_keys(self, song):
+        """Compute the sort key of a song for every ordering from its cached collation keys."""
+        if "sort_title" not in song or "sort_artist" not in song:
+            apply_sort_keys(song)
+        title = song["sort_title"]
+        artist = collation_group(song["sort_artist"])
+        return {
+            "title": title,
+            "artist": (artist, title, song["sort_artist"]),
+            # Stored ascending, read back in reverse for most-recent-first
+            "recent": song.get("last_played") or 0.0,
+        }
+
+    def rebuild(self, songs):
+        """Rebuild every ordering from scratch (used on load and clear)."""
+        self._songs = {song["id"]: song for song in songs}
+        self._keys = {song_id: self._sort_keys(song) for song_id, song in self._songs.items()}
+        for name in self.SORT_ORDERS:
+            self._orders[name] = sorted((keys[name], song_id) for song_id, keys in self._keys.items())
+        self.artists = ArtistDirectory()
+        for keys in self._keys.values():
+            self.artists.add_key(keys["artist"][0])
+        for view in self.views.values():
+            view.rebuild(self._songs.values())
+
+    def add_view(self, view):
+        """Attach a smart playlist; it is filled once, then maintained on every change."""
+        view.rebuild(self._songs.values())
+        self.views[view.name] = view
+
+    def remove_view(self, name):
+        """Detach a smart playlist."""
+        return self.views.pop(name, None)
+
+    def view_songs(self, name):
+        """Songs of a smart playlist, in its order."""
+        view = self.views.get(name)
+        if view is None:
+            return []
+        return [self._songs[song_id] for song_id in view.song_ids() if song_id in self._songs]
+
+    def get(self, song_id):
+        """Get a song by its ID."""
+        return self._songs.get(song_id)
+
+    def add(self, song):
+        """Insert a song into every ordering."""
+        song_id = song["id"]
+        if song_id in self._songs:
+            self.update(song)
+            return
+        keys = self._sort_keys(song)
+        self._songs[song_id] = song
+        self._keys[song_id] = keys
+        for name in self.SORT_ORDERS:
+            bisect.insort(self._orders[name], (keys[name], song_id))
+        self.artists.add_key(keys["artist"][0])
+        for view in self.views.values():
+            view.add(song)
+
+    def remove(self, song_id):
+        """Remove a song from every ordering."""
+        keys = self._keys.pop(song_id, None)
+        if keys is None:
+            return
+        self._songs.pop(song_id, None)
+        for name in self.SORT_ORDERS:
+            order = self._orders[name]
+            position = bisect.bisect_left(order, (keys[name], song_id))
+            if position < len(order) and order[position][1] == song_id:
+                del order[position]
+        self.artists.discard_key(keys["artist"][0])
+        for view in self.views.values():
+            view.remove(song_id)
+
+    def update(self, song):
+        """Re-position a song after its title, artist, play statistics or other fields changed."""
+        song_id = song["id"]
+        old_keys = self._keys.get(song_id)
+        if old_keys is None:
+            self.add(song)
+            return
+        new_keys = self._sort_keys(song)
+        self._songs[song_id] = song
+        self._keys[song_id] = new_keys
+        if old_keys["artist"][0] != new_keys["artist"][0]:
+            self.artists.discard_key(old_keys["artist"][0])
+            self.artists.add_key(new_keys["artist"][0])
+        for name in self.SORT_ORDERS:
+            if old_keys[name] == new_keys[name]:
+                continue
+            order = self._orders[name]
+            position = bisect.bisect_left(order, (old_keys[name], song_id))
+            if position < len(order) and order[position][1] == song_id:
+                del order[position]
+            bisect.insort(order, (new_keys[name], song_id))
+        for view in self.views.values():
+            view.update(song)
+
+    def ordered(self, sort_by="title", song_ids=None):
+        """
+        Return songs in the requested order. When song_ids is given, only those
+        songs are returned (e.g. the members of a playlist).
+        """
+        order = self._orders.get(sort_by, self._orders["title"])
+        entries = reversed(order) if sort_by == "recent" else order
+
+        if song_ids is None:
+            return [self._songs[song_id] for _, song_id in entries]
+
+        if not isinstance(song_ids, (set, frozenset, dict)):
+            song_ids = set(song_ids)
+        # Small subsets are cheaper to sort by their cached keys than to walk the whole order
+        if len(song_ids) * 8 < len(order):
+            name = sort_by if sort_by in self._orders else "title"
+            present = [song_id for song_id in song_ids if song_id in self._keys]
+            present.sort(key=lambda song_id: (self._keys[song_id][name], song_id), reverse=(name == "recent"))
+            return [self._songs[song_id] for song_id in present]
+        return [self._songs[song_id] for _, song_id in entries if song_id in song_ids]
+
+
+class PlaylistIndex:
+    """
+    Playlists backed by ordered sets (insertion-ordered dicts) plus a
+    song -> playlists reverse index, so membership tests, add/remove and
+    deletion cascades only touch the playlists that actually hold a song.
+    Read access mirrors the {name: [song ids]} mapping stored on disk.
+    """
+
+    def __init__(self, playlists=None):
+        self._playlists = {}       # name -> {song_id: None} (ordered set)
+        self._song_playlists = {}  # song_id -> set of playlist names
+        for name, song_ids in (playlists or {}).items():
+            self.create(name)
+            for song_id in song_ids:
+                self.add(name, song_id)
+
+    def __contains__(self, name):
+        return name in self._playlists
+
+    def __iter__(self):
+        return iter(self._playlists)
+
+    def __len__(self):
+        return len(self._playlists)
+
+    def __getitem__(self, name):
+        return self._playlists[name]
+
+    def get(self, name, default=None):
+        return self._playlists.get(name, default)
+
+    def keys(self):
+        return self._playlists.keys()
+
+    def items(self):
+        return self._playlists.items()
+
+    def to_dict(self):
+        """Return the on-disk {name: [song ids]} representation."""
+        return {name: list(song_ids) for name, song_ids in self._playlists.items()}
+
+    def create(self, name):
+        """Create an empty playlist if it does not exist yet."""
+        self._playlists.setdefault(name, {})
+
+    def delete(self, name):
+        """Delete a playlist (the songs themselves are kept)."""
+        song_ids = self._playlists.pop(name, None)
+        if song_ids is None:
+            return False
+        for song_id in song_ids:
+            self._unlink(song_id, name)
+        return True
+
+    def contains(self, name, song_id):
+        """Check whether a playlist holds a song."""
+        return song_id in self._playlists.get(name, ())
+
+    def add(self, name, song_id):
+        """Append a song to a playlist. Returns False if it was already there."""
+        self.create(name)
+        song_ids = self._playlists[name]
+        if song_id in song_ids:
+            return False
+        song_ids[song_id] = None
+        self._song_playlists.setdefault(song_id, set()).add(name)
+        return True
+
+    def remove(self, name, song_id):
+        """Remove a song from a playlist. Returns False if it was not there."""
+        song_ids = self._playlists.get(name)
+        if song_ids is None or song_id not in song_ids:
+            return False
+        del song_ids[song_id]
+        self._unlink(song_id, name)
+        return True
+
+    def playlists_for(self, song_id):
+        """Names of the playlists containing a song."""
+        return frozenset(self._song_playlists.get(song_id, ()))
+
+    def remove_song(self, song_id):
+        """Remove a song from every playlist holding it. Returns the playlists touched."""
+        names = self._song_playlists.pop(song_id, set())
+        for name in names:
+            self._playlists[name].pop(song_id, None)
+        return names
+
+    def _unlink(self, song_id, name):
+        names = self._song_playlists.get(song_id)
+        if names is not None:
+            names.discard(name)
+            if not names:
+                del self._song_playlists[song_id]
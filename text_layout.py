@@ -0,0 +1,176 @@
+import bisect
+import functools
+import unicodedata
+from collections import namedtuple
+
+# Advance widths in em units for the default bold UI font (Roboto / Segoe UI
+# Bold class metrics). Characters missing from a table fall back to a width
+# derived from their Unicode category and are then cached in the table.
+GLYPH_WIDTHS = {
+    "default-bold": {
+        " ": 0.25, "!": 0.27, '"': 0.30, "#": 0.57, "$": 0.56, "%": 0.73, "&": 0.63, "'": 0.17,
+        "(": 0.34, ")": 0.34, "*": 0.43, "+": 0.56, ",": 0.22, "-": 0.35, ".": 0.22, "/": 0.40,
+        ":": 0.24, ";": 0.24, "<": 0.51, "=": 0.56, ">": 0.51, "?": 0.48, "@": 0.90,
+        "[": 0.27, "\\": 0.41, "]": 0.27, "^": 0.42, "_": 0.45, "`": 0.31, "{": 0.34, "|": 0.25,
+        "}": 0.34, "~": 0.68,
+        "0": 0.56, "1": 0.56, "2": 0.56, "3": 0.56, "4": 0.56, "5": 0.56, "6": 0.56, "7": 0.56,
+        "8": 0.56, "9": 0.56,
+        "A": 0.66, "B": 0.63, "C": 0.65, "D": 0.65, "E": 0.56, "F": 0.55, "G": 0.68, "H": 0.71,
+        "I": 0.29, "J": 0.55, "K": 0.63, "L": 0.54, "M": 0.87, "N": 0.71, "O": 0.69, "P": 0.63,
+        "Q": 0.69, "R": 0.62, "S": 0.60, "T": 0.61, "U": 0.65, "V": 0.65, "W": 0.88, "X": 0.63,
+        "Y": 0.61, "Z": 0.60,
+        "a": 0.54, "b": 0.56, "c": 0.52, "d": 0.56, "e": 0.53, "f": 0.35, "g": 0.56, "h": 0.55,
+        "i": 0.25, "j": 0.25, "k": 0.51, "l": 0.25, "m": 0.87, "n": 0.55, "o": 0.57, "p": 0.56,
+        "q": 0.57, "r": 0.35, "s": 0.51, "t": 0.33, "u": 0.55, "v": 0.49, "w": 0.75, "x": 0.50,
+        "y": 0.49, "z": 0.49,
+    },
+}
+
+# Natural line height (as a multiple of the font size) when no explicit height is set
+DEFAULT_LINE_HEIGHT = 1.17
+
+LayoutEstimate = namedtuple("LayoutEstimate", ["total_height", "line_offsets", "line_heights"])
+
+
+@functools.lru_cache(maxsize=None)
+def glyph_width_table(font="default-bold"):
+    """Return the (growable) width table of a font."""
+    return dict(GLYPH_WIDTHS.get(font, GLYPH_WIDTHS["default-bold"]))
+
+
+def _fallback_width(char):
+    if unicodedata.combining(char):
+        return 0.0
+    if unicodedata.east_asian_width(char) in ("W", "F"):
+        return 1.0
+    category = unicodedata.category(char)
+    if category == "Lu":
+        return 0.66
+    if category.startswith("L"):
+        return 0.55
+    if category.startswith("Z"):
+        return 0.25
+    return 0.45
+
+
+def text_width(text, font_size, font="default-bold"):
+    """Width of a single unwrapped run of text in pixels."""
+    table = glyph_width_table(font)
+    total = 0.0
+    for char in text:
+        width = table.get(char)
+        if width is None:
+            width = table[char] = _fallback_width(char)
+        total += width
+    return total * font_size
+
+
+def wrapped_line_count(text, font_size, max_width, font="default-bold"):
+    """Number of visual rows a line occupies when word-wrapped to max_width."""
+    if not text.strip() or max_width <= 0:
+        return 1
+    if text_width(text, font_size, font) <= max_width:
+        return 1
+
+    space = text_width(" ", font_size, font)
+    rows = 1
+    row_width = 0.0
+    for word in text.split():
+        word_width = text_width(word, font_size, font)
+        if word_width > max_width:
+            # Words wider than the line are broken across rows
+            if row_width:
+                rows += 1
+            full_rows, remainder = divmod(word_width, max_width)
+            rows += int(full_rows) - (1 if not remainder else 0)
+            row_width = remainder
+            continue
+        needed = word_width if not row_width else row_width + space + word_width
+        if needed > max_width:
+            rows += 1
+            row_width = word_width
+        else:
+            row_width = needed
+    return rows
+
+
+@functools.lru_cache(maxsize=128)
+def estimate_layout(lyrics, font_size, width, line_spacing=1.2, buffer_lines=0, chunked=True,
+                    max_lines_per_block=24, control_spacing=5, padding=15, font="default-bold"):
+    """
+    Predict the laid-out height of the preview ListView for some lyrics.
+
+    Mirrors how the preview renders: in chunked mode each stanza is one Text
+    with `line_spacing` line height and `control_spacing` between blocks; in
+    per-line mode every line is its own Text at natural line height. Returns
+    the total content height plus the top offset and height of every lyric
+    line (buffer lines excluded). Memoized per (lyrics, font size, width, ...).
+    """
+    lines = lyrics.split("\n") if lyrics else [""]
+    text_width_available = max(1.0, width - 2 * padding)
+    row_height = font_size * (line_spacing if chunked else DEFAULT_LINE_HEIGHT)
+
+    offsets = []
+    heights = []
+    y = float(padding)
+    controls = 0
+
+    if buffer_lines:
+        if chunked:
+            y += buffer_lines * row_height
+            controls += 1
+        else:
+            for _ in range(buffer_lines):
+                if controls:
+                    y += control_spacing
+                y += row_height
+                controls += 1
+
+    block_size = 0
+    for line in lines:
+        starts_control = not chunked or block_size == 0
+        if starts_control and controls:
+            y += control_spacing
+        if starts_control:
+            controls += 1
+
+        height = wrapped_line_count(line, font_size, text_width_available, font) * row_height
+        offsets.append(y)
+        heights.append(height)
+        y += height
+
+        if chunked:
+            block_size += 1
+            if not line.strip() or block_size >= max_lines_per_block:
+                block_size = 0
+
+    total_height = y + padding
+    return LayoutEstimate(total_height, tuple(offsets), tuple(heights))
+
+
+def line_at_offset(layout, offset):
+    """Index of the lyric line at a scroll offset (binary search over line offsets)."""
+    if not layout.line_offsets:
+        return 0
+    return max(0, bisect.bisect_right(layout.line_offsets, offset) - 1)
+
+
+def line_position(layout, offset):
+    """
+    A scroll offset as (line index, fraction of that line's height), which
+    means the same place under another width or font size. The fraction is
+    negative above the first line and past 1 below the last one, so
+    offset_of_line() gives back the exact offset.
+    """
+    if not layout.line_offsets:
+        return 0, 0.0
+    line = line_at_offset(layout, offset)
+    return line, (offset - layout.line_offsets[line]) / (layout.line_heights[line] or 1)
+
+
+def offset_of_line(layout, line, fraction=0.0):
+    """Scroll offset of a (line index, fraction) position in this layout."""
+    if not layout.line_offsets:
+        return 0.0
+    line = max(0, min(line, len(layout.line_offsets) - 1))
+    return max(0.0, layout.line_offsets[line] + fraction * layout.line_heights[line])
@@ -0,0 +1,93 @@
+import os
+import re
+import threading
+
+from song_library import ArtistDirectory
+
+# Header line formats, tried in order: (compiled pattern, kind). Spaced dashes come
+# before the bare one so "Jay-Z - Empire State" splits at the spaced dash.
+_HEADER_PATTERNS = (
+    (re.compile(r"^(.+?)\s+[-–—]\s+(.+)$"), "dash"),           # "Artist - Title" or "Title - Artist"
+    (re.compile(r"^(.+?)\s+by\s+(.+)$", re.IGNORECASE), "by"),  # "Title by Artist"
+    (re.compile(r"^(.+?)\s*\|\s*(.+)$"), "pipe"),               # "Title | Artist"
+    (re.compile(r"^\[(.+?)\]\s*(.+)$"), "bracket"),             # "[Artist] Title"
+    (re.compile(r"^(.+?)\s*-\s*(.+)$"), "dash"),                # "Artist-Title"
+)
+_FEATURED = re.compile(r"\b(?:feat|featuring|and)\b|\bft\.|&", re.IGNORECASE)
+_FEATURED_ONLY = re.compile(r"\b(?:feat|featuring)\b|\bft\.", re.IGNORECASE)
+_TITLE_WORDS = frozenset({"love", "you", "me", "my", "the", "a", "an", "is", "are", "was", "were"})
+
+# Optional user list of artist names in the songs directory, one per line
+KNOWN_ARTISTS_FILE = "known_artists.txt"
+
+
+def parse_title_artist(text, artists=()):
+    """
+    Guess (title, artist) from the first line of pasted text. artists is a
+    sequence of ArtistDirectory objects (the library's artists, user lists):
+    when exactly one half of the header is a known artist, that settles it;
+    otherwise the header format and word heuristics decide.
+    """
+    first_line = text.strip().split("\n", 1)[0].strip()
+    for pattern, kind in _HEADER_PATTERNS:
+        match = pattern.match(first_line)
+        if not match:
+            continue
+        part1, part2 = match.group(1).strip(), match.group(2).strip()
+        if not part1 or not part2:
+            continue
+
+        known1 = max((directory.match(part1) for directory in artists), default=0)
+        known2 = max((directory.match(part2) for directory in artists), default=0)
+        if known1 != known2:
+            return (part2, part1) if known1 > known2 else (part1, part2)  # title, artist
+
+        if kind == "by":
+            return part1, part2
+        if kind == "bracket":
+            return part2, part1
+        if _FEATURED.search(part1):
+            # First part looks like it has featured artists
+            return part2, part1
+        if _FEATURED_ONLY.search(part2):
+            # Second part has featured info, so first is likely title
+            return part1, part2
+        # Check if one part looks more like a title (has common title words)
+        part1_has_title_words = not _TITLE_WORDS.isdisjoint(part1.lower().split())
+        part2_has_title_words = not _TITLE_WORDS.isdisjoint(part2.lower().split())
+        if part1_has_title_words and not part2_has_title_words:
+            return part1, part2
+        # Default to "Artist - Title" format (most common)
+        return part2, part1
+
+    # If no pattern matches, return first line as title, empty artist
+    return first_line, ""
+
+
+_user_artists = {}  # path -> (mtime, ArtistDirectory)
+_user_artists_lock = threading.Lock()
+
+
+def get_user_artists(directory="saved_songs"):
+    """ArtistDirectory of the names in a songs directory's known artists file (reloaded when it changes)."""
+    path = os.path.join(directory, KNOWN_ARTISTS_FILE)
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        mtime = None
+    with _user_artists_lock:
+        cached = _user_artists.get(path)
+        if cached is None or cached[0] != mtime:
+            artists = ArtistDirectory()
+            if mtime is not None:
+                try:
+                    with open(path, "r", encoding="utf-8") as f:
+                        for line in f:
+                            name = line.strip()
+                            if name and not name.startswith("#"):
+                                artists.add(name)
+                    print(f"🎤 Loaded {len(artists)} known artists from {path}")
+                except Exception as ex:
+                    print(f"❌ Error reading known artists from {path}: {ex}")
+            cached = _user_artists[path] = (mtime, artists)
+        return cached[1]